@@ -0,0 +1 @@
+"""Performance benchmarks for Pokemon Battle Station."""
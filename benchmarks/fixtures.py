@@ -0,0 +1,110 @@
+"""
+Synthetic, seeded catalog databases for benchmarks.
+
+Builds a database with the real schema and plausible random species, moves
+and competitive sets, so benchmarks run without network ingestion.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+from core.type_chart import TYPE_CHART, TYPES
+from data_prep.schema import apply_schema
+
+NATURES = ["adamant", "modest", "jolly", "timid", "bold", "calm", "hardy"]
+
+
+def build_fixture_db(
+    db_path: str, species: int = 1000, moves: int = 900, seed: int = 0
+) -> str:
+    """
+    Create (or overwrite) a synthetic catalog database.
+
+    Args:
+        db_path: Where to write the database
+        species: Number of pokemon_fact rows, each with a smogon_sets row
+        moves: Number of moves_dim rows
+        seed: Random seed; the same arguments always give the same database
+
+    Returns:
+        db_path
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    apply_schema(conn)
+
+    move_rows = []
+    for i in range(moves):
+        damage_class = rng.choices(["physical", "special", "status"], [4, 4, 2])[0]
+        power = None if damage_class == "status" else rng.choice([40, 60, 75, 80, 90, 100, 120])
+        accuracy = rng.choice([None, 70, 80, 85, 90, 95, 100, 100, 100])
+        move_rows.append(
+            (f"move-{i}", power, accuracy, rng.choice([5, 10, 15, 20]), rng.choice(TYPES), damage_class, 0)
+        )
+    conn.executemany("INSERT INTO moves_dim VALUES (?, ?, ?, ?, ?, ?, ?)", move_rows)
+
+    pokemon_rows = []
+    set_rows = []
+    for i in range(1, species + 1):
+        name = f"pokemon-{i}"
+        type1 = rng.choice(TYPES)
+        type2 = rng.choice([None, rng.choice(TYPES)])
+        stats = [rng.randint(20, 160) for _ in range(6)]
+        pokemon_rows.append((i, name, *stats, type1, type2 if type2 != type1 else None, None))
+
+        physical = stats[1] > stats[3]
+        evs = (0, 252, 4, 0, 0, 252) if physical else (0, 0, 4, 252, 0, 252)
+        move_names = [row[0] for row in rng.sample(move_rows, 4)]
+        set_rows.append(
+            (
+                name,
+                "ability",
+                "life-orb",
+                rng.choice(NATURES),
+                *move_names,
+                *evs,
+                0.0,
+                rng.choice(["OU", "UU", "RU", "NU"]),
+            )
+        )
+    conn.executemany(
+        "INSERT INTO pokemon_fact VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", pokemon_rows
+    )
+    conn.executemany(
+        """INSERT INTO smogon_sets (
+               pokemon_name, ability, item, nature, move1, move2, move3, move4,
+               ev_hp, ev_attack, ev_defense, ev_special_attack, ev_special_defense, ev_speed,
+               usage_percent, tier
+           ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        set_rows,
+    )
+    conn.executemany(
+        "INSERT INTO type_effectiveness VALUES (?, ?, ?)",
+        [
+            (attacking, defending, multiplier)
+            for attacking, row in TYPE_CHART.items()
+            for defending, multiplier in row.items()
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a synthetic catalog database.")
+    parser.add_argument("db_path")
+    parser.add_argument("--species", type=int, default=1000)
+    parser.add_argument("--moves", type=int, default=900)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    build_fixture_db(args.db_path, args.species, args.moves, args.seed)
+    print(f"Wrote {args.species} species and {args.moves} moves to {args.db_path}")
+
+
+if __name__ == "__main__":
+    main()
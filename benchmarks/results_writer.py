@@ -0,0 +1,109 @@
+"""
+Benchmark sustained battle_results insert throughput.
+
+Usage:
+    python -m benchmarks.results_writer --rows 5000000
+    python -m benchmarks.results_writer --rows 5000000 --live-index
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from data_prep.schema import apply_schema
+from tournament.results_writer import ResultWriter
+
+
+def synthetic_rows(count: int, names: list[str], rng: random.Random):
+    """Generate plausible battle_results rows, config hashes included."""
+    hashes = {name: hashlib.sha1(name.encode()).hexdigest() for name in names}
+    rows = []
+    for _ in range(count):
+        name1, name2 = rng.sample(names, 2)
+        winner = rng.choice((name1, name2, None))
+        rows.append(
+            (
+                name1,
+                name2,
+                winner,
+                rng.randint(1, 100),
+                rng.randint(0, 400) if winner != name2 else 0,
+                rng.randint(0, 400) if winner != name1 else 0,
+                hashes[name1],
+                hashes[name2],
+            )
+        )
+    return rows
+
+
+def run(rows: int, chunk: int, batch_size: int, db_path: str, defer_index: bool = True) -> dict:
+    """
+    Feed `rows` rows to a ResultWriter in chunks and time it end to end,
+    including the pair index build when it is deferred.
+    """
+    conn = sqlite3.connect(db_path)
+    apply_schema(conn)
+    conn.close()
+
+    rng = random.Random(0)
+    names = [f"pokemon-{i}" for i in range(1300)]
+    # Pre-generate one chunk pool so row generation isn't what's measured
+    pool = [synthetic_rows(chunk, names, rng) for _ in range(8)]
+
+    start = time.perf_counter()
+    producer_blocked = 0.0
+    with ResultWriter(db_path, batch_size=batch_size, defer_index=defer_index) as writer:
+        sent = 0
+        i = 0
+        while sent < rows:
+            block = pool[i % len(pool)][: rows - sent]
+            put_start = time.perf_counter()
+            writer.write(block)
+            producer_blocked += time.perf_counter() - put_start
+            sent += len(block)
+            i += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rows": writer.rows_written,
+        "transactions": writer.transactions,
+        "seconds": elapsed,
+        "rows_per_second": writer.rows_written / elapsed,
+        "producer_blocked_seconds": producer_blocked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the battle_results writer.")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk", type=int, default=2000, help="Rows per write() call")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--db", default=None, help="Database file (default: temporary)")
+    parser.add_argument(
+        "--live-index",
+        action="store_true",
+        help="Maintain the pair index on every insert instead of building it at the end",
+    )
+    args = parser.parse_args()
+    defer_index = not args.live_index
+
+    if args.db:
+        stats = run(args.rows, args.chunk, args.batch_size, args.db, defer_index)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = run(
+                args.rows, args.chunk, args.batch_size, os.path.join(tmp, "bench.db"), defer_index
+            )
+
+    print(f"Rows written:     {stats['rows']:,}")
+    print(f"Transactions:     {stats['transactions']:,}")
+    print(f"Elapsed:          {stats['seconds']:.2f}s")
+    print(f"Sustained rate:   {stats['rows_per_second']:,.0f} rows/sec")
+    print(f"Producer blocked: {stats['producer_blocked_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
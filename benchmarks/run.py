@@ -0,0 +1,230 @@
+"""
+Hot-path benchmark suite with a regression baseline.
+
+Builds a synthetic fixture database, times the engine's hot paths and
+writes the results as JSON. With --baseline, each result is compared to the
+stored one and the run fails if anything is slower than the tolerance allows.
+
+Baselines are machine-specific and not committed: the first --baseline run
+on a machine records one, and a baseline taken with a different CPU count
+or workload is refused rather than compared.
+
+Usage:
+    python -m benchmarks.run --species 1000 --output bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable
+from benchmarks.fixtures import build_fixture_db
+from core.battle import Battle
+from core.catalog import Catalog
+from core.pokemon import Pokemon
+from core.type_chart import TYPES, get_type_effectiveness
+from tournament.round_robin import load_roster, run_tournament
+
+
+def measure(func: Callable[[], int], repeats: int = 5, min_time: float = 0.3) -> float:
+    """
+    Best-of-`repeats` throughput of func, in operations per second.
+
+    func runs one batch and returns how many operations it did; batches are
+    repeated until at least min_time has passed.
+    """
+    best = 0.0
+    for _ in range(repeats):
+        ops = 0
+        start = time.perf_counter()
+        while True:
+            ops += func()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, ops / elapsed)
+    return best
+
+
+def bench_pokemon_from_db(db_path: str, names: list[str]) -> float:
+    sample = names[:50]
+
+    def batch():
+        for name in sample:
+            Pokemon(name, db_path)
+        return len(sample)
+
+    return measure(batch)
+
+
+def bench_pokemon_from_catalog(db_path: str, names: list[str]) -> float:
+    catalog = Catalog(db_path)
+    sample = names[:500]
+
+    def batch():
+        for name in sample:
+            catalog.pokemon(name)
+        return len(sample)
+
+    return measure(batch)
+
+
+def bench_catalog_load(db_path: str) -> float:
+    def batch():
+        Catalog(db_path)
+        return 1
+
+    return measure(batch, min_time=0.5)
+
+
+def bench_type_effectiveness() -> float:
+    pairs = [(a, [d1, d2]) for a in TYPES for d1 in TYPES for d2 in TYPES[:4]]
+
+    def batch():
+        for attacking, defending in pairs:
+            get_type_effectiveness(attacking, defending)
+        return len(pairs)
+
+    return measure(batch)
+
+
+def bench_battle_simulate(db_path: str, names: list[str]) -> float:
+    catalog = Catalog(db_path)
+    battles = [
+        Battle(catalog.pokemon(names[i]), catalog.pokemon(names[i + 1]), headless=True)
+        for i in range(0, 100, 2)
+    ]
+
+    def batch():
+        for battle in battles:
+            battle.reset()
+            battle.simulate()
+        return len(battles)
+
+    return measure(batch)
+
+
+def bench_tournament(db_path: str, roster: list[str], workers: int) -> float:
+    result = run_tournament(db_path, workers=workers, roster=roster, chunk_size=500)
+    return result.battles / result.elapsed
+
+
+def run_suite(species: int, tournament_roster: int, max_workers: int, seed: int = 0) -> dict:
+    """Build the fixture and run every benchmark; returns the JSON-ready report."""
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = build_fixture_db(os.path.join(tmp, "fixture.db"), species=species, seed=seed)
+        names = load_roster(db_path)
+
+        results["catalog_load_per_sec"] = bench_catalog_load(db_path)
+        results["pokemon_from_db_per_sec"] = bench_pokemon_from_db(db_path, names)
+        results["pokemon_from_catalog_per_sec"] = bench_pokemon_from_catalog(db_path, names)
+        results["type_effectiveness_per_sec"] = bench_type_effectiveness()
+        results["battle_simulate_per_sec"] = bench_battle_simulate(db_path, names)
+
+        roster = names[:tournament_roster]
+        for workers in range(1, max_workers + 1):
+            results[f"tournament_battles_per_sec_{workers}w"] = bench_tournament(
+                db_path, roster, workers
+            )
+
+    return {
+        "meta": {
+            "species": species,
+            "tournament_roster": tournament_roster,
+            "max_workers": max_workers,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+# Meta fields that must match for two reports to be comparable
+COMPARABLE_META = ("species", "tournament_roster", "max_workers", "cpus")
+
+
+def mismatched_meta(report: dict, baseline: dict) -> list[str]:
+    """List the meta fields that differ between a report and a baseline."""
+    return [
+        f"{key}: {report['meta'].get(key)} vs baseline {baseline.get('meta', {}).get(key)}"
+        for key in COMPARABLE_META
+        if report["meta"].get(key) != baseline.get("meta", {}).get(key)
+    ]
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    List results that regressed past the tolerance.
+
+    Every metric is a rate, so a regression is falling below
+    baseline * (1 - tolerance). Metrics missing from either side are skipped.
+    """
+    regressions = []
+    for name, base_value in baseline.get("results", {}).items():
+        value = report["results"].get(name)
+        if value is None or base_value <= 0:
+            continue
+        if value < base_value * (1 - tolerance):
+            change = (value / base_value - 1) * 100
+            regressions.append(f"{name}: {value:,.0f} vs baseline {base_value:,.0f} ({change:+.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmarks.")
+    parser.add_argument("--species", type=int, default=1000, help="Fixture size (1k-100k)")
+    parser.add_argument("--tournament-roster", type=int, default=150)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument(
+        "--baseline", help="Baseline JSON to compare against; recorded there if missing"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save-baseline", help="Write the report as the new baseline")
+    args = parser.parse_args()
+
+    report = run_suite(args.species, args.tournament_roster, args.max_workers, args.seed)
+
+    for name, value in report["results"].items():
+        print(f"{name:<40} {value:>14,.0f}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as out:
+                json.dump(report, out, indent=2)
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            with open(args.baseline, "w") as out:
+                json.dump(report, out, indent=2)
+            print(f"\nNo baseline yet; recorded this run as {args.baseline}")
+            return
+        with open(args.baseline) as base_file:
+            baseline = json.load(base_file)
+        mismatched = mismatched_meta(report, baseline)
+        if mismatched:
+            print(f"\n{args.baseline} was recorded under different conditions:")
+            for line in mismatched:
+                print(f"  {line}")
+            print("Record a baseline for this machine with --save-baseline.")
+            sys.exit(2)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared data access and widgets for the Streamlit app."""
@@ -0,0 +1,404 @@
+"""
+Shared, cached data access for the Streamlit app and pages.
+
+Streamlit re-executes a page script on every widget interaction. Pages read
+through the process-wide DataStore instead of opening their own
+connections, so a rerun is served from memory:
+
+    store = get_store()
+    names = store.pokemon_names()
+
+Everything cached is dropped when the database (or its WAL file) gets a new
+mtime, e.g. after a data_prep script or a tournament writes to it, or when
+a watched file such as the win matrix's CURRENT file does. The mtimes are
+checked at most once per check_interval seconds, so most reruns do not
+even stat the files.
+
+Pokedex filtering, sorting and paging run in SQLite (see PokedexFilter and
+DataStore.pokedex_page), so a rerun only loads the rows it shows.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import pandas as pd
+from core.catalog import Catalog
+from data_prep.schema import TOTAL_EXPRESSION, upgrade_schema
+from tournament.matrix import CURRENT_FILE, MATRIX_DIR, WinMatrix, current_generation
+
+DB_PATH = "data_prep/pkmn_battle_station.db"
+
+POKEDEX_COLUMNS = """id, name, type1, type2, hp, attack, defense, special_attack,
+                     special_defense, speed, sprite_url"""
+
+# Columns the Pokedex may sort by; interpolated into SQL, so keep it a whitelist
+SORT_COLUMNS = frozenset(
+    {"id", "name", "total", "hp", "attack", "defense", "special_attack", "special_defense", "speed"}
+)
+
+
+@dataclass(frozen=True)
+class PokedexFilter:
+    """Pokedex filters; hashable, so it doubles as part of a cache key."""
+
+    types: tuple[str, ...] = ()  # Match either type slot; empty for any type
+    min_total: Optional[int] = None
+    max_total: Optional[int] = None
+    search: str = ""  # Case-insensitive name substring
+
+    def where(self, total: str = "total") -> tuple[str, tuple]:
+        """
+        WHERE clause and parameters for these filters.
+
+        Args:
+            total: Column or expression holding the stat total
+        """
+        clauses = []
+        params: list[Any] = []
+        if self.types:
+            marks = ", ".join("?" * len(self.types))
+            clauses.append(f"(type1 IN ({marks}) OR type2 IN ({marks}))")
+            params += [*self.types, *self.types]
+        if self.min_total is not None:
+            clauses.append(f"{total} >= ?")
+            params.append(self.min_total)
+        if self.max_total is not None:
+            clauses.append(f"{total} <= ?")
+            params.append(self.max_total)
+        if self.search:
+            clauses.append("instr(lower(name), ?) > 0")
+            params.append(self.search.lower())
+        sql = "WHERE " + " AND ".join(clauses) if clauses else ""
+        return sql, tuple(params)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class DataStore:
+    """Read-only connection plus an LRU cache, invalidated by DB mtime."""
+
+    def __init__(self, db_path: str = DB_PATH, check_interval: float = 2.0, max_entries: int = 256):
+        """
+        Args:
+            db_path: Path to SQLite database
+            check_interval: Seconds between mtime checks
+            max_entries: Cached results kept before the least recently used is dropped
+        """
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self.max_entries = max_entries
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache: OrderedDict[Any, Any] = OrderedDict()
+        self._version: Optional[tuple] = None
+        self._watched: dict[str, Optional[int]] = {}
+        self._checked_at = float("-inf")
+
+    def _file_version(self) -> Optional[tuple]:
+        """mtimes of the database and its WAL file; None if the DB is missing."""
+        try:
+            version = (os.stat(self.db_path).st_mtime_ns,)
+        except FileNotFoundError:
+            return None
+        try:
+            version += (os.stat(self.db_path + "-wal").st_mtime_ns,)
+        except FileNotFoundError:
+            pass
+        return version
+
+    def _refresh(self):
+        """Drop caches and the connection if the database changed."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = self._file_version()
+        watched = {path: _mtime(path) for path in self._watched}
+        if version != self._version or watched != self._watched:
+            self._version = version
+            self._watched = watched
+            self._cache.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def invalidate(self):
+        """Forget everything cached and re-check the file on next access."""
+        with self._lock:
+            self._checked_at = float("-inf")
+            self._version = None
+            self._refresh()
+
+    def watch(self, path: str):
+        """Also drop everything cached when this file's mtime changes."""
+        with self._lock:
+            if path not in self._watched:
+                self._watched[path] = _mtime(path)
+
+    def exists(self) -> bool:
+        with self._lock:
+            self._refresh()
+            return self._version is not None
+
+    def connection(self) -> sqlite3.Connection:
+        """The shared read-only connection; hold the store's lock while using it."""
+        if self._conn is None:
+            self._upgrade()
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return self._conn
+
+    def _upgrade(self):
+        """
+        Bring an older database's tables up to date before reading it.
+
+        Opens with mode=rw so a missing database is not created. A database
+        that cannot be written (read-only file, or locked by a writer) is
+        read as it is and upgraded on a later connection.
+        """
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=rw"
+        try:
+            conn = sqlite3.connect(uri, uri=True)
+        except sqlite3.OperationalError:
+            return
+        try:
+            with conn:
+                upgrade_schema(conn)
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.close()
+
+    def cached(self, key: Any, loader: Callable[[], Any]) -> Any:
+        """Get a cached value, calling loader() under the lock on a miss."""
+        with self._lock:
+            self._refresh()
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            value = loader()
+            self._cache[key] = value
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return value
+
+    def query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Run a read query once per (sql, params) and cache all its rows."""
+        return self.cached(
+            ("query", sql, params),
+            lambda: self.connection().execute(sql, params).fetchall(),
+        )
+
+    def query_one(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        rows = self.query(sql, params)
+        return rows[0] if rows else None
+
+    def count(self, table: str) -> int:
+        """Row count of a table."""
+        return self.query_one(f"SELECT COUNT(*) FROM {table}")[0]
+
+    def total_column(self) -> str:
+        """pokemon_fact's total column, or the equivalent expression on older databases."""
+        columns = {row[1] for row in self.query("PRAGMA table_xinfo(pokemon_fact)")}
+        return "total" if "total" in columns else f"({TOTAL_EXPRESSION})"
+
+    def pokedex_page(
+        self,
+        filters: PokedexFilter = PokedexFilter(),
+        sort: str = "id",
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Matching pokemon_fact rows with a total column, filtered, sorted and
+        sliced by SQLite.
+
+        Args:
+            filters: Which Pokemon to include
+            sort: Column from SORT_COLUMNS; ties are broken by ID
+            descending: Sort order
+            limit: Rows to return; None for all
+            offset: Matching rows to skip first
+
+        Shared between reruns and sessions; copy before modifying.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort the Pokedex by {sort!r}")
+        total = self.total_column()
+        where, params = filters.where(total)
+        order = "DESC" if descending else "ASC"
+        order_by = f"{total if sort == 'total' else sort} {order}"
+        if sort != "id":
+            order_by += f", id {order}"
+        sql = f"""SELECT {POKEDEX_COLUMNS}, {total} AS total
+                  FROM pokemon_fact {where}
+                  ORDER BY {order_by}
+                  LIMIT ? OFFSET ?"""
+        params += (-1 if limit is None else limit, offset)
+        return self.cached(
+            ("pokedex_page", sql, params),
+            lambda: pd.read_sql_query(sql, self.connection(), params=params),
+        )
+
+    def pokedex_summary(self, filters: PokedexFilter = PokedexFilter()) -> dict[str, Any]:
+        """
+        Aggregates over the Pokemon matching filters, computed by SQLite.
+
+        Returns:
+            count, avg_total, min_total, max_total, and highest/lowest as
+            (name, total) of the first Pokemon by ID with the max/min total;
+            the stats are None when nothing matches
+        """
+        total = self.total_column()
+        where, params = filters.where(total)
+        count, avg_total, min_total, max_total = self.query_one(
+            f"SELECT COUNT(*), AVG({total}), MIN({total}), MAX({total}) FROM pokemon_fact {where}",
+            params,
+        )
+        summary = {
+            "count": count,
+            "avg_total": avg_total,
+            "min_total": min_total,
+            "max_total": max_total,
+            "highest": None,
+            "lowest": None,
+        }
+        if count:
+            for key, order in (("highest", "DESC"), ("lowest", "ASC")):
+                summary[key] = self.query_one(
+                    f"""SELECT name, {total} FROM pokemon_fact {where}
+                        ORDER BY {total} {order}, id LIMIT 1""",
+                    params,
+                )
+        return summary
+
+    def pokemon_types(self) -> list[str]:
+        """Every type appearing in either type slot, alphabetically."""
+        return [
+            row[0]
+            for row in self.query(
+                """SELECT type1 FROM pokemon_fact WHERE type1 IS NOT NULL AND type1 != ''
+                   UNION
+                   SELECT type2 FROM pokemon_fact WHERE type2 IS NOT NULL AND type2 != ''
+                   ORDER BY 1"""
+            )
+        ]
+
+    def pokemon_frame(self) -> pd.DataFrame:
+        """
+        All of pokemon_fact with a total column, ordered by ID.
+
+        Shared between reruns and sessions; copy before modifying.
+        """
+        return self.pokedex_page()
+
+    def pokemon_names(self) -> list[str]:
+        """Every Pokemon name, alphabetically."""
+        return self.cached(
+            "pokemon_names",
+            lambda: [row[0] for row in self.query("SELECT name FROM pokemon_fact ORDER BY name")],
+        )
+
+    def pokemon(self, name: str) -> Optional[tuple]:
+        """pokemon_fact row for one Pokemon, or None."""
+        return self.query_one(
+            """SELECT id, name, hp, attack, defense, special_attack, special_defense, speed,
+                      type1, type2, sprite_url
+               FROM pokemon_fact WHERE name = ?""",
+            (name,),
+        )
+
+    def smogon_set(self, name: str) -> Optional[tuple]:
+        """smogon_sets row for one Pokemon, or None."""
+        return self.query_one(
+            """SELECT ability, item, nature, move1, move2, move3, move4,
+                      ev_hp, ev_attack, ev_defense, ev_special_attack, ev_special_defense, ev_speed,
+                      tier
+               FROM smogon_sets WHERE pokemon_name = ?""",
+            (name,),
+        )
+
+    def has_table(self, table: str) -> bool:
+        return bool(
+            self.query("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        )
+
+    def thumbnails(self) -> dict[int, bytes]:
+        """
+        Stored sprite thumbnails (or full images, where no thumbnail was made)
+        keyed by Pokemon ID, loaded in one query.
+        """
+
+        def load():
+            if not self.has_table("pokemon_sprites"):
+                return {}
+            rows = self.connection().execute(
+                """SELECT s.pokemon_id, COALESCE(b.thumbnail, b.image)
+                   FROM pokemon_sprites s JOIN sprite_blobs b ON b.sha256 = s.sha256"""
+            )
+            return dict(rows.fetchall())
+
+        return self.cached("thumbnails", load)
+
+    def sprite(self, pokemon_id: int) -> Optional[bytes]:
+        """Full-size stored sprite for a Pokemon, or None."""
+        if not self.has_table("pokemon_sprites"):
+            return None
+        row = self.query_one(
+            """SELECT b.image FROM pokemon_sprites s JOIN sprite_blobs b ON b.sha256 = s.sha256
+               WHERE s.pokemon_id = ?""",
+            (pokemon_id,),
+        )
+        return row[0] if row else None
+
+    def catalog(self) -> Catalog:
+        """In-memory Catalog for building battle-ready Pokemon without queries."""
+        return self.cached("catalog", lambda: Catalog(self.db_path))
+
+    def win_matrix(self, directory: str = MATRIX_DIR) -> Optional[WinMatrix]:
+        """
+        Memory-mapped tournament matrices, or None if none were saved.
+
+        Reopened when a new generation is saved; the CURRENT file is only
+        re-read when the store's refresh sees its mtime change.
+        """
+        self.watch(os.path.join(directory, CURRENT_FILE))
+        generation = self.cached(
+            ("matrix_generation", directory), lambda: current_generation(directory)
+        )
+        if generation is None:
+            return None
+        return self.cached(
+            ("win_matrix", directory, generation), lambda: WinMatrix(directory, generation)
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+
+
+_stores: dict[str, DataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path: str = DB_PATH) -> DataStore:
+    """Get the process-wide DataStore for a database path."""
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = _stores[db_path] = DataStore(db_path)
+        return store
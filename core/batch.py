@@ -0,0 +1,203 @@
+"""
+Vectorized Monte Carlo over many replicates of one matchup.
+"""
+
+from typing import Optional
+import numpy as np
+from core.matchup import (
+    AttackPlan,
+    CRIT_CHANCE,
+    CRIT_MULTIPLIER,
+    ROLL_MAX,
+    ROLL_MIN,
+    plan_matchup,
+)
+from core.pokemon import Pokemon
+
+# Winner codes in BatchResult.winner
+DRAW = 0
+POKEMON1 = 1
+POKEMON2 = 2
+
+
+class BatchResult:
+    """Outcomes of N independent replicates of one matchup."""
+
+    def __init__(
+        self,
+        pokemon1: Pokemon,
+        pokemon2: Pokemon,
+        winner: np.ndarray,
+        turns: np.ndarray,
+        hp1: np.ndarray,
+        hp2: np.ndarray,
+        max_turns: int,
+    ):
+        """
+        Args:
+            pokemon1: First Pokemon
+            pokemon2: Second Pokemon
+            winner: Per-replicate winner code (DRAW, POKEMON1 or POKEMON2)
+            turns: Per-replicate turn the battle ended on
+            hp1: Per-replicate HP left for pokemon1
+            hp2: Per-replicate HP left for pokemon2
+            max_turns: Turn limit the replicates ran under
+        """
+        self.pokemon1 = pokemon1
+        self.pokemon2 = pokemon2
+        self.winner = winner
+        self.turns = turns
+        self.hp1 = hp1
+        self.hp2 = hp2
+        self.max_turns = max_turns
+
+    @property
+    def n(self) -> int:
+        return len(self.winner)
+
+    @property
+    def p1_win_rate(self) -> float:
+        return float(np.count_nonzero(self.winner == POKEMON1)) / self.n
+
+    @property
+    def p2_win_rate(self) -> float:
+        return float(np.count_nonzero(self.winner == POKEMON2)) / self.n
+
+    @property
+    def draw_rate(self) -> float:
+        return float(np.count_nonzero(self.winner == DRAW)) / self.n
+
+    def turn_distribution(self) -> np.ndarray:
+        """Probability of the battle ending on each turn, indexed by turn."""
+        return np.bincount(self.turns, minlength=self.max_turns + 1) / self.n
+
+    def hp_distribution(self, which: int = POKEMON1, bins: int = 20):
+        """
+        Histogram of remaining HP as a percentage of max HP.
+
+        Args:
+            which: POKEMON1 or POKEMON2
+            bins: Number of equal-width bins over 0-100%
+
+        Returns:
+            Tuple of (probabilities, bin_edges)
+        """
+        pokemon, hp = (
+            (self.pokemon1, self.hp1) if which == POKEMON1 else (self.pokemon2, self.hp2)
+        )
+        percent = hp * 100.0 / max(pokemon.max_hp, 1)
+        counts, edges = np.histogram(percent, bins=bins, range=(0.0, 100.0))
+        return counts / self.n, edges
+
+    def summary(self) -> dict:
+        """Headline numbers for display."""
+        return {
+            "replicates": self.n,
+            "p1_win_rate": self.p1_win_rate,
+            "p2_win_rate": self.p2_win_rate,
+            "draw_rate": self.draw_rate,
+            "mean_turns": float(self.turns.mean()),
+            "p1_mean_hp": float(self.hp1.mean()),
+            "p2_mean_hp": float(self.hp2.mean()),
+        }
+
+    def __repr__(self):
+        return (
+            f"BatchResult({self.pokemon1.name} vs {self.pokemon2.name}, n={self.n}, "
+            f"{self.p1_win_rate:.3f}/{self.p2_win_rate:.3f}/{self.draw_rate:.3f})"
+        )
+
+
+def _roll_damage(
+    plan: AttackPlan, count: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw accuracy, damage roll and crit for `count` attacks at once."""
+    if plan.base_damage <= 0:
+        return np.zeros(count, dtype=np.int64)
+
+    damage = plan.base_damage * rng.uniform(ROLL_MIN, ROLL_MAX, count)
+    crits = rng.random(count) < CRIT_CHANCE
+    damage[crits] *= CRIT_MULTIPLIER
+    damage = damage.astype(np.int64)
+
+    if plan.accuracy is not None:
+        hits = rng.integers(1, 101, count) <= plan.accuracy
+        damage[~hits] = 0
+
+    return damage
+
+
+def simulate_matchup(
+    pokemon1: Pokemon,
+    pokemon2: Pokemon,
+    n: int,
+    max_turns: int = 100,
+    rng: Optional[np.random.Generator] = None,
+) -> BatchResult:
+    """
+    Run n independent battles between two Pokemon as NumPy arrays.
+
+    Follows the same turn structure as Battle.simulate(), starting from each
+    Pokemon's current HP without modifying it. Every replicate keeps its own
+    HP and an alive mask; each turn draws accuracy, damage rolls and crits
+    for all still-running replicates in one call.
+
+    Args:
+        pokemon1: First Pokemon
+        pokemon2: Second Pokemon
+        n: Number of replicates
+        max_turns: Maximum number of turns before declaring a draw
+        rng: NumPy generator to draw from
+
+    Returns:
+        BatchResult with per-replicate outcomes
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    p1_first, first, second, first_plan, second_plan = plan_matchup(pokemon1, pokemon2)
+    first_code, second_code = (POKEMON1, POKEMON2) if p1_first else (POKEMON2, POKEMON1)
+
+    first_hp = np.full(n, first.current_hp, dtype=np.int64)
+    second_hp = np.full(n, second.current_hp, dtype=np.int64)
+    winner = np.full(n, DRAW, dtype=np.int8)
+    turns = np.full(n, max_turns, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+
+    for turn in range(1, max_turns + 1):
+        # First Pokemon attacks
+        active = np.flatnonzero(alive)
+        if active.size == 0:
+            break
+        if first_plan is None:
+            turns[active] = turn
+            alive[active] = False
+            break
+
+        second_hp[active] = np.maximum(
+            second_hp[active] - _roll_damage(first_plan, active.size, rng), 0
+        )
+        fainted = active[second_hp[active] <= 0]
+        winner[fainted] = first_code
+        turns[fainted] = turn
+        alive[fainted] = False
+
+        # Second Pokemon attacks
+        active = np.flatnonzero(alive)
+        if active.size == 0:
+            break
+        if second_plan is None:
+            turns[active] = turn
+            alive[active] = False
+            break
+
+        first_hp[active] = np.maximum(
+            first_hp[active] - _roll_damage(second_plan, active.size, rng), 0
+        )
+        fainted = active[first_hp[active] <= 0]
+        winner[fainted] = second_code
+        turns[fainted] = turn
+        alive[fainted] = False
+
+    hp1, hp2 = (first_hp, second_hp) if p1_first else (second_hp, first_hp)
+    return BatchResult(pokemon1, pokemon2, winner, turns, hp1, hp2, max_turns)
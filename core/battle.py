@@ -3,30 +3,98 @@ Battle simulator for Pokemon fights.
 """
 
 import random
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from core.batch import BatchResult, simulate_matchup
+from core.matchup import MoveTable, base_damage, turn_order
+from core.battle_log import (
+    BattleLog,
+    CRITICAL,
+    Event,
+    FAINTED,
+    MISSED,
+    NO_MOVE,
+    STATUS_MOVE,
+    effectiveness_flags,
+)
 from core.pokemon import Pokemon
 from core.move import Move
-from core.type_chart import get_type_effectiveness
+from core.solver import MatchupOdds, solve_matchup
+
+# Bump whenever a change to the engine can change battle outcomes; stored
+# results from older versions are then re-simulated
+ENGINE_VERSION = "1"
 
 
 class Battle:
     """Simulates a 1v1 Pokemon battle."""
 
-    def __init__(self, pokemon1: Pokemon, pokemon2: Pokemon):
+    __slots__ = (
+        "pokemon1",
+        "pokemon2",
+        "turn",
+        "headless",
+        "rng",
+        "battle_log",
+        "winner",
+        "_events",
+        "_table1",
+        "_table2",
+    )
+
+    def __init__(
+        self,
+        pokemon1: Pokemon,
+        pokemon2: Pokemon,
+        headless: bool = False,
+        rng: Optional[random.Random] = None,
+    ):
         """
         Initialize a battle between two Pokemon.
 
         Args:
             pokemon1: First Pokemon
             pokemon2: Second Pokemon
+            headless: Record no log at all, for bulk runs that only need
+                      the winner and final state
+            rng: Generator for accuracy, damage roll and crit draws; the
+                 global random module if not given (see core.rng)
         """
         self.pokemon1 = pokemon1
         self.pokemon2 = pokemon2
         self.turn = 0
-        self.battle_log: list[str] = []
+        self.headless = headless
+        self.rng = rng if rng is not None else random
+        self.battle_log = BattleLog(pokemon1, pokemon2)
         self.winner: Optional[Pokemon] = None
 
-    def simulate(self, max_turns: int = 100) -> Tuple[Optional[Pokemon], list[str]]:
+        # None when headless, so recording is a single identity check
+        self._events = None if headless else self.battle_log.events
+
+        # Nothing changes stats mid-battle, so every move's damage inputs
+        # and the AI's choice are fixed for the battle
+        self._table1 = MoveTable(pokemon1, pokemon2)
+        self._table2 = MoveTable(pokemon2, pokemon1)
+
+    def reset(self, rng: Optional[random.Random] = None):
+        """
+        Return both Pokemon and the battle to their starting state.
+
+        Lets the same Battle be simulated repeatedly without rebuilding
+        the Pokemon or the move tables.
+
+        Args:
+            rng: Generator for the next run; keeps the current one if not given
+        """
+        if rng is not None:
+            self.rng = rng
+        self.pokemon1.reset()
+        self.pokemon2.reset()
+        self.turn = 0
+        self.battle_log.clear()
+        self.winner = None
+
+    def simulate(self, max_turns: int = 100) -> Tuple[Optional[Pokemon], BattleLog]:
         """
         Simulate the entire battle.
 
@@ -34,56 +102,129 @@ class Battle:
             max_turns: Maximum number of turns before declaring a draw
 
         Returns:
-            Tuple of (winner, battle_log)
+            Tuple of (winner, battle_log). The log holds event tuples and
+            renders text lines only when iterated; it is empty when headless.
         """
-        self.battle_log.append(
-            f"Battle Start: {self.pokemon1.name} vs {self.pokemon2.name}!"
-        )
-        self.battle_log.append("")
+        if self._events is not None:
+            self.battle_log.start()
 
-        while self.turn < max_turns:
-            self.turn += 1
+        while self.turn < max_turns and self._play_turn():
+            pass
 
-            # Determine turn order (based on speed and move priority)
-            first, second = self._determine_turn_order()
+        # Battle ended
+        if self._events is not None:
+            self.battle_log.finish(self._actor(self.winner) if self.winner else None)
 
-            # First Pokemon attacks
-            if not self._execute_turn(first, second):
-                break
+        return self.winner, self.battle_log
 
-            # Check if second Pokemon fainted
-            if second.is_fainted():
-                self.winner = first
-                break
+    def iter_turns(self, max_turns: int = 100) -> Iterator[list[Event]]:
+        """
+        Simulate the battle one turn at a time, yielding each turn's events.
 
-            # Second Pokemon attacks
-            if not self._execute_turn(second, first):
-                break
+        Events are handed over and not kept, so battle_log ends up with the
+        starting HP and the result but no events, and memory does not grow
+        with the battle's length. Render them with core.battle_log.LogRenderer.
+        Once exhausted, winner and turn are set as after simulate(). Events
+        are recorded even when headless.
 
-            # Check if first Pokemon fainted
-            if first.is_fainted():
-                self.winner = second
-                break
+            renderer = LogRenderer(battle.pokemon1, battle.pokemon2)
+            for events in battle.iter_turns():
+                show(renderer.lines(events))
 
-        # Battle ended
-        if self.winner:
-            self.battle_log.append("")
-            self.battle_log.append(f"🏆 {self.winner.name} wins!")
-        else:
-            self.battle_log.append("")
-            self.battle_log.append("Battle ended in a draw (max turns reached)")
+        Args:
+            max_turns: Maximum number of turns before declaring a draw
 
-        return self.winner, self.battle_log
+        Yields:
+            The events of each turn, in order
+        """
+        self.battle_log.start()
+        try:
+            while self.turn < max_turns:
+                self._events = events = []
+                playing = self._play_turn()
+                yield events
+                if not playing:
+                    break
+        finally:
+            self._events = None if self.headless else self.battle_log.events
+
+        self.battle_log.finish(self._actor(self.winner) if self.winner else None)
+
+    def simulate_many(
+        self,
+        n: int,
+        max_turns: int = 100,
+        rng: Optional[np.random.Generator] = None,
+    ) -> BatchResult:
+        """
+        Simulate n independent replicates of this battle at once.
 
-    def _determine_turn_order(self) -> Tuple[Pokemon, Pokemon]:
+        Runs on NumPy arrays and leaves both Pokemon untouched. Each side
+        uses the move with the best expected damage for the whole battle.
+
+        Args:
+            n: Number of replicates
+            max_turns: Maximum number of turns before declaring a draw
+            rng: NumPy generator to draw from, e.g. core.rng.numpy_stream()
+
+        Returns:
+            BatchResult with win/draw rates, turn and remaining-HP distributions
         """
-        Determine which Pokemon goes first based on speed.
-        In the future, can consider move priority.
+        return simulate_matchup(self.pokemon1, self.pokemon2, n, max_turns, rng)
+
+    def solve(self, max_turns: int = 100) -> MatchupOdds:
         """
-        if self.pokemon1.speed >= self.pokemon2.speed:
-            return self.pokemon1, self.pokemon2
-        else:
-            return self.pokemon2, self.pokemon1
+        Compute exact win/draw/loss probabilities for this battle.
+
+        Uses the same model as simulate_many() with no sampling variance.
+
+        Args:
+            max_turns: Maximum number of turns before declaring a draw
+
+        Returns:
+            MatchupOdds for pokemon1 vs pokemon2
+        """
+        return solve_matchup(self.pokemon1, self.pokemon2, max_turns)
+
+    def _play_turn(self) -> bool:
+        """
+        Play the next turn.
+
+        Returns:
+            False once the battle is over, True otherwise
+        """
+        self.turn += 1
+
+        # Determine turn order (based on speed and move priority)
+        first, second = self._determine_turn_order()
+
+        # First Pokemon attacks
+        if not self._execute_turn(first, second):
+            return False
+
+        # Check if second Pokemon fainted
+        if second.is_fainted():
+            self.winner = first
+            return False
+
+        # Second Pokemon attacks
+        if not self._execute_turn(second, first):
+            return False
+
+        # Check if first Pokemon fainted
+        if first.is_fainted():
+            self.winner = second
+            return False
+
+        return True
+
+    def _determine_turn_order(self) -> Tuple[Pokemon, Pokemon]:
+        """Determine which Pokemon goes first based on speed."""
+        return turn_order(self.pokemon1, self.pokemon2)
+
+    def _actor(self, pokemon: Pokemon) -> int:
+        """Get the event actor number (1 or 2) for a Pokemon."""
+        return 1 if pokemon is self.pokemon1 else 2
 
     def _execute_turn(self, attacker: Pokemon, defender: Pokemon) -> bool:
         """
@@ -98,37 +239,35 @@ class Battle:
         # Select move (for now, use simple AI)
         move = self._select_move(attacker, defender)
 
+        events = self._events
+
         if not move:
-            self.battle_log.append(f"{attacker.name} has no valid moves!")
+            if events is not None:
+                events.append((self.turn, self._actor(attacker), None, 0, NO_MOVE))
             return False
 
-        self.battle_log.append(f"Turn {self.turn}: {attacker.name} used {move.name}!")
-
         # Check if move hits (accuracy check)
         if not self._check_accuracy(move):
-            self.battle_log.append(f"  {attacker.name}'s attack missed!")
+            if events is not None:
+                events.append((self.turn, self._actor(attacker), move.name, 0, MISSED))
             return True
 
         # Calculate and apply damage
         if move.is_damaging():
-            damage = self._calculate_damage(attacker, defender, move)
+            damage, critical = self._calculate_damage(attacker, defender, move)
             defender.take_damage(damage)
 
-            effectiveness = get_type_effectiveness(move.type, defender.get_types())
-            eff_text = self._get_effectiveness_text(effectiveness)
-
-            self.battle_log.append(
-                f"  {defender.name} took {damage} damage! {eff_text}"
-            )
-            self.battle_log.append(
-                f"  {defender.name}: {defender.current_hp}/{defender.max_hp} HP ({defender.hp_percentage():.1f}%)"
-            )
-
-            if defender.is_fainted():
-                self.battle_log.append(f"  {defender.name} fainted!")
+            if events is not None:
+                flags = effectiveness_flags(defender.defense_vector[move.type_id])
+                if critical:
+                    flags |= CRITICAL
+                if defender.is_fainted():
+                    flags |= FAINTED
+                events.append((self.turn, self._actor(attacker), move.name, damage, flags))
         else:
             # Status move (simplified)
-            self.battle_log.append(f"  {move.name} effect applied!")
+            if events is not None:
+                events.append((self.turn, self._actor(attacker), move.name, 0, STATUS_MOVE))
 
         return True
 
@@ -136,89 +275,47 @@ class Battle:
         """
         AI to select best move (simplified).
         Later, this can be replaced with NEAT neural network.
-        """
-        if not attacker.moves:
-            return None
-
-        # Simple AI: Choose move with highest expected damage
-        best_move = None
-        best_score = -1
 
-        for move in attacker.moves:
-            if move.is_damaging():
-                # Calculate expected damage as score
-                damage = self._calculate_damage(attacker, defender, move)
-                effectiveness = get_type_effectiveness(move.type, defender.get_types())
-                accuracy = move.accuracy / 100 if move.accuracy else 1.0
-
-                score = damage * effectiveness * accuracy
-
-                if score > best_score:
-                    best_score = score
-                    best_move = move
-
-        # If no damaging move found, pick first move
-        return best_move or attacker.moves[0]
+        Picks the move with the highest expected damage, looked up from the
+        table built at battle start; draws no random numbers.
+        """
+        table = self._table1 if attacker is self.pokemon1 else self._table2
+        return table.best_move()
 
     def _check_accuracy(self, move: Move) -> bool:
         """Check if move hits based on accuracy."""
         if move.accuracy is None:
             return True  # Moves like Swift never miss
 
-        return random.randint(1, 100) <= move.accuracy
+        return self.rng.randint(1, 100) <= move.accuracy
 
     def _calculate_damage(
         self, attacker: Pokemon, defender: Pokemon, move: Move
-    ) -> int:
+    ) -> Tuple[int, bool]:
         """
         Calculate damage using Pokemon damage formula (simplified).
         Formula: ((2 * Level / 5 + 2) * Power * A/D / 50 + 2) * Modifiers
+
+        Returns:
+            Tuple of (damage, critical hit)
         """
         if not move.is_damaging() or move.power is None:
-            return 0
-
-        level = 100
-        power = move.power
-
-        # Determine attack and defense stats to use
-        if move.damage_class == "physical":
-            attack = attacker.attack
-            defense = defender.defense
-        else:  # special
-            attack = attacker.special_attack
-            defense = defender.special_defense
-
-        # Base damage calculation
-        damage = ((2 * level / 5 + 2) * power * attack / defense / 50) + 2
+            return 0, False
 
-        # STAB (Same Type Attack Bonus)
-        if move.type in attacker.get_types():
-            damage *= 1.5
-
-        # Type effectiveness
-        effectiveness = get_type_effectiveness(move.type, defender.get_types())
-        damage *= effectiveness
+        # Base damage with STAB and type effectiveness, from the table
+        table = self._table1 if attacker is self.pokemon1 else self._table2
+        index = table.index(move) if table.defender is defender else None
+        if index is not None:
+            damage = table.base_damage[index]
+        else:
+            damage = base_damage(attacker, defender, move)
 
         # Random factor (0.85 to 1.0)
-        damage *= random.uniform(0.85, 1.0)
+        damage *= self.rng.uniform(0.85, 1.0)
 
         # Critical hit (6.25% chance for 1.5x damage)
-        if random.random() < 0.0625:
+        critical = self.rng.random() < 0.0625
+        if critical:
             damage *= 1.5
-            self.battle_log.append("  A critical hit!")
-
-        return int(damage)
-
-    def _get_effectiveness_text(self, multiplier: float) -> str:
-        """Get effectiveness message."""
-        if multiplier == 0:
-            return "It had no effect..."
-        elif multiplier < 0.5:
-            return "It's not very effective..."
-        elif multiplier < 1:
-            return "It's not very effective..."
-        elif multiplier == 2:
-            return "It's super effective!"
-        elif multiplier > 2:
-            return "It's super effective!!"
-        return ""
+
+        return int(damage), critical
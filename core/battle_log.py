@@ -0,0 +1,192 @@
+"""
+Structured battle log: compact event tuples, rendered to text on demand.
+"""
+
+from typing import Iterable, Iterator, Optional
+from core.pokemon import Pokemon
+
+# Event flags
+MISSED = 1
+CRITICAL = 2
+FAINTED = 4
+STATUS_MOVE = 8
+NO_MOVE = 16
+NO_EFFECT = 32
+NOT_VERY_EFFECTIVE = 64
+SUPER_EFFECTIVE = 128
+EXTREMELY_EFFECTIVE = 256
+
+EFFECTIVENESS_FLAGS = (
+    NO_EFFECT | NOT_VERY_EFFECTIVE | SUPER_EFFECTIVE | EXTREMELY_EFFECTIVE
+)
+
+_EFFECTIVENESS_TEXT = {
+    0: "",
+    NO_EFFECT: "It had no effect...",
+    NOT_VERY_EFFECTIVE: "It's not very effective...",
+    SUPER_EFFECTIVE: "It's super effective!",
+    EXTREMELY_EFFECTIVE: "It's super effective!!",
+}
+
+# (turn, actor, move name, damage, flags); actor is 1 or 2
+Event = tuple[int, int, Optional[str], int, int]
+
+
+def effectiveness_flags(multiplier: float) -> int:
+    """Get the effectiveness flag for a type multiplier."""
+    if multiplier == 0:
+        return NO_EFFECT
+    elif multiplier < 1:
+        return NOT_VERY_EFFECTIVE
+    elif multiplier == 2:
+        return SUPER_EFFECTIVE
+    elif multiplier > 2:
+        return EXTREMELY_EFFECTIVE
+    return 0
+
+
+class LogRenderer:
+    """
+    Renders events to text lines piece by piece, tracking HP as it goes.
+
+    BattleLog uses it to replay a whole battle; streaming callers such as
+    Battle.iter_turns() consumers feed it one turn at a time and keep no
+    events around.
+    """
+
+    def __init__(
+        self,
+        pokemon1: Pokemon,
+        pokemon2: Pokemon,
+        start_hp: Optional[tuple[int, int]] = None,
+    ):
+        """
+        Args:
+            pokemon1: First Pokemon (actor 1)
+            pokemon2: Second Pokemon (actor 2)
+            start_hp: HP of both sides before the first event; their
+                      current HP if not given
+        """
+        if start_hp is None:
+            start_hp = (pokemon1.current_hp, pokemon2.current_hp)
+        self.names = (None, pokemon1.name, pokemon2.name)
+        self.max_hp = (None, pokemon1.max_hp, pokemon2.max_hp)
+        self.hp = [None, start_hp[0], start_hp[1]]
+
+    def header(self) -> Iterator[str]:
+        yield f"Battle Start: {self.names[1]} vs {self.names[2]}!"
+        yield ""
+
+    def lines(self, events: Iterable[Event]) -> Iterator[str]:
+        """Render events in order, continuing from the HP left by earlier calls."""
+        names = self.names
+        max_hp = self.max_hp
+        hp = self.hp
+
+        for turn, actor, move_name, damage, flags in events:
+            attacker = names[actor]
+            target = 3 - actor
+            defender = names[target]
+
+            if flags & NO_MOVE:
+                yield f"{attacker} has no valid moves!"
+                continue
+
+            yield f"Turn {turn}: {attacker} used {move_name}!"
+
+            if flags & MISSED:
+                yield f"  {attacker}'s attack missed!"
+                continue
+
+            if flags & STATUS_MOVE:
+                yield f"  {move_name} effect applied!"
+                continue
+
+            if flags & CRITICAL:
+                yield "  A critical hit!"
+
+            hp[target] = max(0, hp[target] - damage)
+            percentage = (hp[target] / max_hp[target]) * 100 if max_hp[target] > 0 else 0
+            eff_text = _EFFECTIVENESS_TEXT[flags & EFFECTIVENESS_FLAGS]
+
+            yield f"  {defender} took {damage} damage! {eff_text}"
+            yield f"  {defender}: {hp[target]}/{max_hp[target]} HP ({percentage:.1f}%)"
+
+            if flags & FAINTED:
+                yield f"  {defender} fainted!"
+
+    def result(self, winner: Optional[int]) -> Iterator[str]:
+        """Closing lines for a winner of 1, 2, or None for a draw."""
+        yield ""
+        if winner:
+            yield f"🏆 {self.names[winner]} wins!"
+        else:
+            yield "Battle ended in a draw (max turns reached)"
+
+
+class BattleLog:
+    """
+    Event record of one battle.
+
+    Battle appends one Event per action; no strings are built while the
+    battle runs. Iterating, indexing or calling render() produces the
+    familiar text lines, computed once and cached.
+    """
+
+    def __init__(self, pokemon1: Pokemon, pokemon2: Pokemon):
+        """
+        Args:
+            pokemon1: First Pokemon (actor 1)
+            pokemon2: Second Pokemon (actor 2)
+        """
+        self.pokemon1 = pokemon1
+        self.pokemon2 = pokemon2
+        self.events: list[Event] = []
+        self.start_hp = (pokemon1.current_hp, pokemon2.current_hp)
+        self.winner: Optional[int] = None
+        self.finished = False
+        self._lines: Optional[list[str]] = None
+
+    def start(self):
+        """Record the starting HP of both sides."""
+        self.start_hp = (self.pokemon1.current_hp, self.pokemon2.current_hp)
+        self._lines = None
+
+    def finish(self, winner: Optional[int]):
+        """Record the result: 1, 2, or None for a draw."""
+        self.winner = winner
+        self.finished = True
+        self._lines = None
+
+    def clear(self):
+        """Drop all events so the log can be reused."""
+        self.events.clear()
+        self.winner = None
+        self.finished = False
+        self._lines = None
+
+    def render(self) -> list[str]:
+        """Render the events as text lines."""
+        if self._lines is None:
+            self._lines = list(self.iter_lines())
+        return self._lines
+
+    def iter_lines(self) -> Iterator[str]:
+        """Render events one line at a time, replaying HP from the start."""
+        renderer = LogRenderer(self.pokemon1, self.pokemon2, self.start_hp)
+        yield from renderer.header()
+        yield from renderer.lines(self.events)
+        if self.finished:
+            yield from renderer.result(self.winner)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.render())
+
+    def __len__(self) -> int:
+        return len(self.render())
+
+    def __getitem__(self, index):
+        return self.render()[index]
+
+    def __repr__(self):
+        return f"BattleLog({len(self.events)} events)"
@@ -0,0 +1,156 @@
+"""
+In-memory catalog of species, moves and competitive sets.
+"""
+
+import sqlite3
+from typing import Optional
+import numpy as np
+from core.battle import ENGINE_VERSION
+from core.move import Move
+from core.pokemon import Pokemon, PokemonTemplate
+from core.stats import StatCompiler
+
+
+class Catalog:
+    """
+    Snapshot of pokemon_fact, moves_dim and smogon_sets held in memory.
+
+    The three tables are read once with one bulk query each and indexed by
+    name, so building Pokemon and Move objects no longer opens a connection
+    per lookup. Move objects carry no battle state and are shared between
+    every Pokemon built from the same catalog. Every species' stats are
+    computed in one vectorized pass (set_stats) and each cached
+    PokemonTemplate takes its row from that array.
+    """
+
+    def __init__(self, db_path: str = "data_prep/pkmn_battle_station.db"):
+        """
+        Load the catalog from the database.
+
+        Args:
+            db_path: Path to SQLite database
+        """
+        self.db_path = db_path
+
+        # Rows keyed by name, in the column order the core classes unpack
+        self.species: dict[str, tuple] = {}
+        self.moves: dict[str, tuple] = {}
+        self.sets: dict[str, tuple] = {}
+        self.index: dict[str, int] = {}
+
+        self._move_cache: dict[str, Move] = {}
+        self._template_cache: dict[str, PokemonTemplate] = {}
+        self._stat_compiler: Optional[StatCompiler] = None
+        self._set_stats: Optional[np.ndarray] = None
+
+        self._load()
+
+    def _load(self):
+        """Read all three tables with one query each."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """SELECT name, id, hp, attack, defense, special_attack, special_defense, speed, type1, type2
+               FROM pokemon_fact ORDER BY id"""
+        )
+        self.species = {row[0]: row[1:] for row in cursor.fetchall()}
+        self.index = {name: i for i, name in enumerate(self.species)}
+
+        cursor.execute(
+            "SELECT name, rowid, power, accuracy, pp, type, damage_class, priority FROM moves_dim"
+        )
+        self.moves = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        cursor.execute(
+            """SELECT pokemon_name, ability, item, nature, move1, move2, move3, move4,
+                      ev_hp, ev_attack, ev_defense, ev_special_attack, ev_special_defense, ev_speed
+               FROM smogon_sets"""
+        )
+        self.sets = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        conn.close()
+
+    def get_species(self, name: str) -> Optional[tuple]:
+        """Get the pokemon_fact row for a species, or None."""
+        return self.species.get(name)
+
+    def get_move(self, name: str) -> Optional[tuple]:
+        """Get the moves_dim row for a move, or None."""
+        return self.moves.get(name)
+
+    def get_set(self, name: str) -> Optional[tuple]:
+        """Get the smogon_sets row for a species, or None."""
+        return self.sets.get(name)
+
+    def names(self) -> list[str]:
+        """Get all species names in Pokedex order."""
+        return list(self.species)
+
+    def move(self, name: str) -> Move:
+        """Get the shared Move object for a move name."""
+        move = self._move_cache.get(name)
+        if move is None:
+            move = Move(name, self.db_path, catalog=self)
+            self._move_cache[name] = move
+        return move
+
+    def template(self, name: str) -> PokemonTemplate:
+        """Get the cached template for a species, with its row of set_stats()."""
+        template = self._template_cache.get(name)
+        if template is None:
+            stats = self.set_stats()[self.index[name]] if name in self.index else None
+            template = Pokemon(name, self.db_path, catalog=self, stats=stats).template()
+            self._template_cache[name] = template
+        return template
+
+    def stat_compiler(self) -> StatCompiler:
+        """Get a StatCompiler over every species' base stats, in names() order."""
+        if self._stat_compiler is None:
+            self._stat_compiler = StatCompiler(
+                list(self.species), [row[1:7] for row in self.species.values()]
+            )
+        return self._stat_compiler
+
+    def set_stats(self) -> np.ndarray:
+        """
+        Final stats of every species with its own set, in names() order.
+
+        Computed in one vectorized pass and cached; species without a set
+        use zero EVs and a neutral nature, like Pokemon does.
+
+        Returns:
+            Read-only (species, 6) int32 array in core.stats.STAT_NAMES order
+        """
+        if self._set_stats is None:
+            evs = []
+            natures = []
+            for name in self.species:
+                row = self.sets.get(name)
+                if row is None:
+                    evs.append((0, 0, 0, 0, 0, 0))
+                    natures.append(None)
+                else:
+                    evs.append(tuple(ev or 0 for ev in row[7:13]))
+                    natures.append(row[2])
+            stats = self.stat_compiler().set_stats(evs, natures)
+            stats.flags.writeable = False
+            self._set_stats = stats
+        return self._set_stats
+
+    def config_hash(self, name: str) -> str:
+        """Get the species' battle configuration hash for the current engine."""
+        return self.template(name).config_hash(ENGINE_VERSION)
+
+    def pokemon(self, name: str) -> Pokemon:
+        """Build a fresh Pokemon without touching the database."""
+        return Pokemon.from_template(self.template(name))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.species
+
+    def __len__(self) -> int:
+        return len(self.species)
+
+    def __repr__(self):
+        return f"Catalog({len(self.species)} pokemon, {len(self.moves)} moves, {len(self.sets)} sets)"
@@ -0,0 +1,275 @@
+"""
+Optional hot-path instrumentation for Battle.
+
+Nothing here runs unless a BattleProfiler is active: entering one swaps
+timed wrappers onto the Battle class and leaving restores the original
+methods, so an uninstrumented battle pays no overhead at all.
+
+    with BattleProfiler() as profiler:
+        run_tournament(db_path, workers=1)
+    profiler.dump_json("profile.json")
+    profiler.dump_stats("profile.prof")  # pstats.Stats("profile.prof")
+
+The wrappers are installed on the class, so they see every battle in the
+process (including other threads) while active. Worker processes of a
+tournament run are not covered; profile with workers=1.
+
+Battles run through simulate() and through iter_turns() are both counted.
+An iter_turns() battle is timed only while the generator runs, not while
+its consumer handles the events. It is recorded once the generator is
+exhausted or closed.
+"""
+
+import json
+import marshal
+import sys
+import time
+import tracemalloc
+from functools import wraps
+from typing import Optional
+from core.battle import Battle
+
+# Instrumented methods; _execute_turn calls the other three
+PHASES = ("_select_move", "_check_accuracy", "_calculate_damage", "_execute_turn")
+
+# Entry points that each run one battle and call _execute_turn
+BATTLES = ("simulate", "iter_turns")
+
+
+class BattleProfiler:
+    """Context manager collecting per-phase counters and timers inside Battle."""
+
+    _active: Optional["BattleProfiler"] = None
+
+    def __init__(self, track_allocations: bool = False):
+        """
+        Args:
+            track_allocations: Also record memory allocated per battle with
+                               tracemalloc (noticeably slower)
+        """
+        self.track_allocations = track_allocations
+        self.calls = {phase: 0 for phase in BATTLES + PHASES}
+        self.time_ns = {phase: 0 for phase in BATTLES + PHASES}
+        # _execute_turn calls and time split by the battle entry point running them
+        self.turn_calls = {entry: 0 for entry in BATTLES}
+        self.turn_time_ns = {entry: 0 for entry in BATTLES}
+        self.battles = 0
+        self.turns = 0
+        self.max_turns_seen = 0
+        self.turn_counts: dict[int, int] = {}
+        self.alloc_peak_bytes = 0
+        self.alloc_net_bytes = 0
+        self.alloc_blocks = 0
+        self.wall_time = 0.0
+
+        self._originals: dict[str, object] = {}
+        self._entry: Optional[str] = None
+        self._started_tracemalloc = False
+        self._start = 0.0
+
+    def __enter__(self) -> "BattleProfiler":
+        if BattleProfiler._active is not None:
+            raise RuntimeError("A BattleProfiler is already active")
+        BattleProfiler._active = self
+
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        for phase in PHASES:
+            original = Battle.__dict__[phase]
+            self._originals[phase] = original
+            setattr(Battle, phase, self._timed(phase, original))
+
+        for name, timed in (
+            ("simulate", self._timed_simulate),
+            ("iter_turns", self._timed_iter_turns),
+        ):
+            original = Battle.__dict__[name]
+            self._originals[name] = original
+            setattr(Battle, name, timed(original))
+
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall_time += time.perf_counter() - self._start
+        for name, original in self._originals.items():
+            setattr(Battle, name, original)
+        self._originals.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        BattleProfiler._active = None
+
+    def _timed(self, phase: str, func):
+        calls = self.calls
+        time_ns = self.time_ns
+        clock = time.perf_counter_ns
+        by_entry = phase == "_execute_turn"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                time_ns[phase] += elapsed
+                calls[phase] += 1
+                if by_entry and self._entry is not None:
+                    self.turn_time_ns[self._entry] += elapsed
+                    self.turn_calls[self._entry] += 1
+
+        return wrapper
+
+    def _battle_started(self) -> Optional[tuple[int, int]]:
+        """Allocation baseline for a battle about to run, if tracking."""
+        if not self.track_allocations:
+            return None
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+
+    def _battle_finished(
+        self, battle: Battle, entry: str, elapsed_ns: int, baseline: Optional[tuple[int, int]]
+    ):
+        """Per-battle bookkeeping shared by every battle entry point."""
+        self.time_ns[entry] += elapsed_ns
+        self.calls[entry] += 1
+        self.battles += 1
+        self.turns += battle.turn
+        self.max_turns_seen = max(self.max_turns_seen, battle.turn)
+        self.turn_counts[battle.turn] = self.turn_counts.get(battle.turn, 0) + 1
+        if baseline is not None:
+            before, blocks_before = baseline
+            after, peak = tracemalloc.get_traced_memory()
+            self.alloc_peak_bytes += peak - before
+            self.alloc_net_bytes += after - before
+            self.alloc_blocks += sys.getallocatedblocks() - blocks_before
+
+    def _timed_simulate(self, func):
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(battle, *args, **kwargs):
+            baseline = self._battle_started()
+            outer, self._entry = self._entry, "simulate"
+            start = clock()
+            try:
+                return func(battle, *args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                self._entry = outer
+                self._battle_finished(battle, "simulate", elapsed, baseline)
+
+        return wrapper
+
+    def _timed_iter_turns(self, func):
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(battle, *args, **kwargs):
+            turns = func(battle, *args, **kwargs)
+            baseline = self._battle_started()
+            elapsed = 0
+            try:
+                while True:
+                    outer, self._entry = self._entry, "iter_turns"
+                    start = clock()
+                    try:
+                        events = next(turns)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += clock() - start
+                        self._entry = outer
+                    yield events
+            finally:
+                # Closed early by the consumer: let iter_turns clean up too
+                turns.close()
+                self._battle_finished(battle, "iter_turns", elapsed, baseline)
+
+        return wrapper
+
+    def report(self) -> dict:
+        """Flat, JSON-ready summary."""
+        phases = {}
+        for phase in BATTLES + PHASES:
+            calls = self.calls[phase]
+            total = self.time_ns[phase] / 1e9
+            phases[phase] = {
+                "calls": calls,
+                "total_seconds": total,
+                "mean_us": (total / calls * 1e6) if calls else 0.0,
+                "per_battle": (calls / self.battles) if self.battles else 0.0,
+            }
+
+        report = {
+            "battles": self.battles,
+            "wall_seconds": self.wall_time,
+            "battles_per_second": self.battles / self.wall_time if self.wall_time else 0.0,
+            "turns": {
+                "total": self.turns,
+                "mean_per_battle": self.turns / self.battles if self.battles else 0.0,
+                "max": self.max_turns_seen,
+                "histogram": {str(k): v for k, v in sorted(self.turn_counts.items())},
+            },
+            "phases": phases,
+        }
+        if self.track_allocations:
+            report["allocations"] = {
+                "mean_peak_bytes_per_battle": self.alloc_peak_bytes / self.battles if self.battles else 0.0,
+                "mean_net_bytes_per_battle": self.alloc_net_bytes / self.battles if self.battles else 0.0,
+                "mean_net_blocks_per_battle": self.alloc_blocks / self.battles if self.battles else 0.0,
+            }
+        return report
+
+    def dump_json(self, path: str):
+        """Write report() as JSON."""
+        with open(path, "w") as out:
+            json.dump(self.report(), out, indent=2)
+
+    def dump_stats(self, path: str):
+        """
+        Write the timers in cProfile's on-disk format, for pstats or snakeviz.
+
+        Own time is cumulative time minus the instrumented phases called
+        inside it (simulate/iter_turns > _execute_turn > the other three).
+        _execute_turn lists each battle entry point as a caller with the
+        calls and time spent under it.
+        """
+        seconds = {phase: ns / 1e9 for phase, ns in self.time_ns.items()}
+        turn_seconds = {entry: ns / 1e9 for entry, ns in self.turn_time_ns.items()}
+        turn_phases = ("_select_move", "_check_accuracy", "_calculate_damage")
+
+        keys = {}
+        for name in BATTLES + PHASES:
+            func = getattr(Battle, name)
+            code = getattr(func, "__wrapped__", func).__code__
+            keys[name] = (code.co_filename, code.co_firstlineno, f"Battle.{name}")
+
+        def own_time(name: str) -> float:
+            if name in BATTLES:
+                return max(seconds[name] - turn_seconds[name], 0.0)
+            if name == "_execute_turn":
+                return max(seconds[name] - sum(seconds[kid] for kid in turn_phases), 0.0)
+            return seconds[name]
+
+        stats = {}
+        for name, key in keys.items():
+            cumulative = seconds[name]
+            own = own_time(name)
+            calls = self.calls[name]
+            callers = {}
+            if name == "_execute_turn":
+                for entry in BATTLES:
+                    entry_calls = self.turn_calls[entry]
+                    if entry_calls:
+                        share = turn_seconds[entry] / cumulative if cumulative else 0.0
+                        callers[keys[entry]] = (entry_calls, entry_calls, own * share, turn_seconds[entry])
+            elif name in turn_phases:
+                callers[keys["_execute_turn"]] = (calls, calls, own, cumulative)
+            stats[key] = (calls, calls, own, cumulative, callers)
+
+        with open(path, "wb") as out:
+            marshal.dump(stats, out)
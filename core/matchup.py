@@ -0,0 +1,220 @@
+"""
+Fixed damage inputs for one attacker against one defender.
+
+Nothing in the engine changes stats, types or moves mid-battle, so the move
+an attacker picks and the pre-random part of its damage are the same on every
+turn. Batch and exact solvers compute them once per matchup here.
+"""
+
+from typing import NamedTuple, Optional
+from core.move import Move
+from core.pokemon import Pokemon
+
+LEVEL = 100
+
+# Damage randomness, shared by every simulation path
+ROLL_MIN = 0.85
+ROLL_MAX = 1.0
+CRIT_CHANCE = 0.0625
+CRIT_MULTIPLIER = 1.5
+STAB_MULTIPLIER = 1.5
+
+EXPECTED_ROLL = (ROLL_MIN + ROLL_MAX) / 2
+EXPECTED_CRIT = 1 + CRIT_CHANCE * (CRIT_MULTIPLIER - 1)
+
+
+class AttackPlan:
+    """The move an attacker uses against a defender, with its fixed damage inputs."""
+
+    __slots__ = ("move", "base_damage", "effectiveness", "accuracy", "score")
+
+    def __init__(
+        self,
+        move: Move,
+        base_damage: float,
+        effectiveness: float,
+        accuracy: Optional[int],
+        score: float,
+    ):
+        """
+        Args:
+            move: Move to use
+            base_damage: Damage before the random roll and crit (0 for status moves)
+            effectiveness: Type multiplier against the defender
+            accuracy: Move accuracy out of 100, or None if it never misses
+            score: Expected-damage score the AI ranked the move by
+        """
+        self.move = move
+        self.base_damage = base_damage
+        self.effectiveness = effectiveness
+        self.accuracy = accuracy
+        self.score = score
+
+    def hit_chance(self) -> float:
+        """Probability the move connects."""
+        return 1.0 if self.accuracy is None else min(self.accuracy, 100) / 100
+
+    def __repr__(self):
+        return f"AttackPlan({self.move.name}, base {self.base_damage:.1f}, x{self.effectiveness})"
+
+
+def base_damage(attacker: Pokemon, defender: Pokemon, move: Move) -> float:
+    """
+    Damage before the random roll and critical hit.
+    Formula: ((2 * Level / 5 + 2) * Power * A/D / 50 + 2) * STAB * Effectiveness
+    """
+    if not move.is_damaging() or move.power is None:
+        return 0.0
+
+    if move.damage_class == "physical":
+        attack = attacker.attack
+        defense = defender.defense
+    else:  # special
+        attack = attacker.special_attack
+        defense = defender.special_defense
+
+    damage = ((2 * LEVEL / 5 + 2) * move.power * attack / defense / 50) + 2
+
+    if move.type in attacker.get_types():
+        damage *= STAB_MULTIPLIER
+
+    damage *= defender.defense_vector[move.type_id]
+    return damage
+
+
+class MoveTable:
+    """
+    Every stat-dependent quantity for one attacker's moves against one defender.
+
+    Lists are aligned with attacker.moves. Built once per matchup, after which
+    choosing and scoring a move is a lookup.
+    """
+
+    __slots__ = (
+        "attacker",
+        "defender",
+        "moves",
+        "base_damage",
+        "stab",
+        "effectiveness",
+        "scores",
+        "best",
+        "_index",
+    )
+
+    def __init__(self, attacker: Pokemon, defender: Pokemon):
+        """
+        Args:
+            attacker: Pokemon using the moves
+            defender: Pokemon on the receiving end
+        """
+        self.attacker = attacker
+        self.defender = defender
+        self.moves = list(attacker.moves)
+        self.base_damage: list[float] = []
+        self.stab: list[float] = []
+        self.effectiveness: list[float] = []
+        self.scores: list[float] = []
+        self._index: dict[Move, int] = {}
+
+        attacker_types = attacker.get_types()
+        best_index = None
+
+        for index, move in enumerate(self.moves):
+            self._index.setdefault(move, index)
+            effectiveness = defender.defense_vector[move.type_id]
+            self.effectiveness.append(effectiveness)
+            self.stab.append(STAB_MULTIPLIER if move.type in attacker_types else 1.0)
+
+            if not move.is_damaging():
+                self.base_damage.append(0.0)
+                self.scores.append(-1.0)
+                continue
+
+            damage = base_damage(attacker, defender, move)
+            accuracy = move.accuracy / 100 if move.accuracy else 1.0
+            score = damage * EXPECTED_ROLL * EXPECTED_CRIT * effectiveness * accuracy
+
+            self.base_damage.append(damage)
+            self.scores.append(score)
+
+            # Strictly greater, so the first move wins ties
+            if best_index is None or score > self.scores[best_index]:
+                best_index = index
+
+        # If no damaging move found, fall back to the first move
+        if best_index is None and self.moves:
+            best_index = 0
+
+        self.best: Optional[int] = best_index
+
+    def index(self, move: Move) -> Optional[int]:
+        """Get a move's row in the table, or None if the attacker lacks it."""
+        return self._index.get(move)
+
+    def best_move(self) -> Optional[Move]:
+        """Get the move the AI picks, or None if the attacker has no moves."""
+        return None if self.best is None else self.moves[self.best]
+
+    def plan(self) -> Optional[AttackPlan]:
+        """Get the AttackPlan for the chosen move."""
+        if self.best is None:
+            return None
+        index = self.best
+        move = self.moves[index]
+        return AttackPlan(
+            move,
+            self.base_damage[index],
+            self.effectiveness[index],
+            move.accuracy,
+            max(self.scores[index], 0.0),
+        )
+
+    def __repr__(self):
+        return f"MoveTable({self.attacker.name} -> {self.defender.name}, {len(self.moves)} moves)"
+
+
+def plan_attack(attacker: Pokemon, defender: Pokemon) -> Optional[AttackPlan]:
+    """
+    Pick the attacker's move against this defender.
+
+    Ranks damaging moves by expected damage * effectiveness * accuracy,
+    keeping the first move on ties, and falls back to the first move when
+    none deal damage.
+
+    Returns:
+        AttackPlan, or None if the attacker has no moves
+    """
+    return MoveTable(attacker, defender).plan()
+
+
+def turn_order(pokemon1: Pokemon, pokemon2: Pokemon) -> tuple[Pokemon, Pokemon]:
+    """
+    Get (first, second) for a turn: the faster Pokemon moves first, and
+    pokemon1 wins speed ties. In the future, can consider move priority.
+    """
+    if pokemon1.speed >= pokemon2.speed:
+        return pokemon1, pokemon2
+    return pokemon2, pokemon1
+
+
+class MatchupPlans(NamedTuple):
+    """Turn order of a matchup and the move each side uses throughout."""
+
+    p1_first: bool
+    first: Pokemon
+    second: Pokemon
+    first_plan: Optional[AttackPlan]
+    second_plan: Optional[AttackPlan]
+
+
+def plan_matchup(pokemon1: Pokemon, pokemon2: Pokemon) -> MatchupPlans:
+    """Order a matchup like Battle does and plan both sides' attacks."""
+    first, second = turn_order(pokemon1, pokemon2)
+    return MatchupPlans(
+        first is pokemon1,
+        first,
+        second,
+        plan_attack(first, second),
+        plan_attack(second, first),
+    )
@@ -3,21 +3,44 @@ Move class for Pokemon battles.
 """
 
 import sqlite3
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
+from core.type_chart import type_id
+
+if TYPE_CHECKING:
+    from core.catalog import Catalog
 
 
 class Move:
     """Represents a Pokemon move with its properties."""
 
-    def __init__(self, name: str, db_path: str = "data_prep/pkmn_battle_station.db"):
+    __slots__ = (
+        "name",
+        "id",
+        "power",
+        "accuracy",
+        "pp",
+        "type",
+        "damage_class",
+        "priority",
+        "type_id",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        db_path: str = "data_prep/pkmn_battle_station.db",
+        catalog: Optional["Catalog"] = None,
+    ):
         """
         Initialize a Move from the database.
 
         Args:
             name: Move name (e.g., "thunderbolt")
             db_path: Path to SQLite database
+            catalog: Preloaded catalog to read from instead of the database
         """
         self.name = name
+        self.id: int = 0  # moves_dim rowid
         self.power: Optional[int] = None
         self.accuracy: Optional[int] = None
         self.pp: int = 0
@@ -25,22 +48,27 @@ class Move:
         self.damage_class: str = "status"
         self.priority: int = 0
 
-        self._load_from_db(db_path)
+        self._load_from_db(db_path, catalog)
+        self.type_id: int = type_id(self.type)
 
-    def _load_from_db(self, db_path: str):
-        """Load move data from database."""
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    def _load_from_db(self, db_path: str, catalog: Optional["Catalog"] = None):
+        """Load move data from the catalog, or from the database."""
+        if catalog is not None:
+            result = catalog.get_move(self.name)
+        else:
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT power, accuracy, pp, type, damage_class, priority FROM moves_dim WHERE name = ?",
-            (self.name,),
-        )
-        result = cursor.fetchone()
-        conn.close()
+            cursor.execute(
+                "SELECT rowid, power, accuracy, pp, type, damage_class, priority FROM moves_dim WHERE name = ?",
+                (self.name,),
+            )
+            result = cursor.fetchone()
+            conn.close()
 
         if result:
             (
+                self.id,
                 self.power,
                 self.accuracy,
                 self.pp,
@@ -2,24 +2,178 @@
 Pokemon class for battle simulation.
 """
 
+import hashlib
 import sqlite3
-from typing import Optional
+from array import array
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence, TYPE_CHECKING
 from core.move import Move
+from core.stats import IV, LEVEL, STAT_NAMES, calc_stats
+from core.type_chart import defensive_vector
+
+if TYPE_CHECKING:
+    from core.catalog import Catalog
+
+# Non-volatile status conditions, stored as a small int on Pokemon.status
+STATUS_NONE = 0
+STATUS_BURN = 1
+STATUS_FREEZE = 2
+STATUS_PARALYSIS = 3
+STATUS_POISON = 4
+STATUS_BADLY_POISONED = 5
+STATUS_SLEEP = 6
+STATUS_NAMES = (None, "burn", "freeze", "paralysis", "poison", "badly_poisoned", "sleep")
+
+# Order of the stat stage slots in Pokemon.stat_stages
+STAGE_STATS = (
+    "attack",
+    "defense",
+    "special_attack",
+    "special_defense",
+    "speed",
+    "accuracy",
+    "evasion",
+)
+STAGE_INDEX = {stat: i for i, stat in enumerate(STAGE_STATS)}
+_NO_STAGES = array("b", bytes(len(STAGE_STATS)))
+
+
+@dataclass(frozen=True)
+class PokemonTemplate:
+    """
+    Immutable species and competitive set with final stats already computed.
+
+    A template is built once per species and stamped into any number of
+    Pokemon battle states with Pokemon.from_template(), which copies these
+    fields instead of reloading the set or recalculating stats.
+    """
+
+    name: str
+    id: int
+    type1: str
+    type2: Optional[str]
+    base_hp: int
+    base_attack: int
+    base_defense: int
+    base_special_attack: int
+    base_special_defense: int
+    base_speed: int
+    ability: str
+    item: str
+    nature: str
+    defense_vector: tuple[float, ...]
+    evs: Mapping[str, int]
+    moves: tuple[Move, ...]
+    move_ids: tuple[int, ...]
+    max_hp: int
+    attack: int
+    defense: int
+    special_attack: int
+    special_defense: int
+    speed: int
+
+    def config_hash(self, engine_version: str) -> str:
+        """
+        Fingerprint everything that can change this Pokemon's battle results.
+
+        Covers stats, types, ability, item, nature, EVs and each move's
+        properties, plus the engine version, so results can be reused until
+        either the data or the engine changes.
+        """
+        config = (
+            engine_version,
+            self.name,
+            self.type1,
+            self.type2,
+            (
+                self.base_hp,
+                self.base_attack,
+                self.base_defense,
+                self.base_special_attack,
+                self.base_special_defense,
+                self.base_speed,
+            ),
+            (
+                self.max_hp,
+                self.attack,
+                self.defense,
+                self.special_attack,
+                self.special_defense,
+                self.speed,
+            ),
+            self.ability,
+            self.item,
+            self.nature,
+            tuple(sorted(self.evs.items())),
+            tuple(
+                (m.name, m.power, m.accuracy, m.pp, m.type, m.damage_class, m.priority)
+                for m in self.moves
+            ),
+        )
+        return hashlib.sha1(repr(config).encode()).hexdigest()
 
 
 class Pokemon:
-    """Represents a Pokemon with stats, moves, and battle state."""
+    """
+    Represents a Pokemon with stats, moves, and battle state.
+
+    Slotted, with the mutable battle state kept to plain ints (current HP,
+    status) and one signed-byte array of stat stages; everything else is
+    shared with the species template when built via from_template().
+    """
+
+    __slots__ = (
+        "name",
+        "db_path",
+        "catalog",
+        "id",
+        "base_hp",
+        "base_attack",
+        "base_defense",
+        "base_special_attack",
+        "base_special_defense",
+        "base_speed",
+        "type1",
+        "type2",
+        "defense_vector",
+        "ability",
+        "item",
+        "nature",
+        "evs",
+        "moves",
+        "move_ids",
+        "max_hp",
+        "attack",
+        "defense",
+        "special_attack",
+        "special_defense",
+        "speed",
+        "current_hp",
+        "status",
+        "stat_stages",
+    )
 
-    def __init__(self, name: str, db_path: str = "data_prep/pkmn_battle_station.db"):
+    def __init__(
+        self,
+        name: str,
+        db_path: str = "data_prep/pkmn_battle_station.db",
+        catalog: Optional["Catalog"] = None,
+        stats: Optional[Sequence[int]] = None,
+    ):
         """
         Initialize a Pokemon from the database.
 
         Args:
             name: Pokemon name (e.g., "pikachu")
             db_path: Path to SQLite database
+            catalog: Preloaded catalog to read from instead of the database
+            stats: Precomputed final stats in STAT_NAMES order, e.g. a row of
+                   Catalog.set_stats(); calculated from the set if not given
         """
         self.name = name
         self.db_path = db_path
+        self.catalog = catalog
 
         # Base stats
         self.id: int = 0
@@ -32,6 +186,9 @@ class Pokemon:
         self.type1: str = ""
         self.type2: Optional[str] = None
 
+        # Multiplier taken from each attacking type ID
+        self.defense_vector: tuple[float, ...] = ()
+
         # Competitive set
         self.ability: str = ""
         self.item: str = ""
@@ -45,41 +202,125 @@ class Pokemon:
             "speed": 0,
         }
 
-        # Moves
-        self.moves: list[Move] = []
+        # Moves, and their moves_dim rowids
+        self.moves: tuple[Move, ...] = ()
+        self.move_ids: tuple[int, ...] = ()
 
         # Battle state
         self.current_hp: int = 0
         self.max_hp: int = 0
-        self.status: Optional[str] = None  # paralysis, burn, sleep, etc.
-        self.stat_stages = {
-            "attack": 0,
-            "defense": 0,
-            "special_attack": 0,
-            "special_defense": 0,
-            "speed": 0,
-            "accuracy": 0,
-            "evasion": 0,
-        }
+        self.status: int = STATUS_NONE
+        self.stat_stages = array("b", _NO_STAGES)  # indexed by STAGE_INDEX
 
         # Load data
         self._load_base_stats()
+        self.defense_vector = defensive_vector(self.get_types())
         self._load_smogon_set()
-        self._calculate_stats()
+        if stats is None:
+            self._calculate_stats()
+        else:
+            (
+                self.max_hp,
+                self.attack,
+                self.defense,
+                self.special_attack,
+                self.special_defense,
+                self.speed,
+            ) = (int(stat) for stat in stats)
         self.current_hp = self.max_hp
 
+    @classmethod
+    def from_template(cls, template: PokemonTemplate) -> "Pokemon":
+        """
+        Create a fresh battle state from a template.
+
+        Skips the database and stat calculation entirely; moves, move IDs and
+        EVs are shared with the template rather than copied.
+        """
+        pokemon = cls.__new__(cls)
+        pokemon.name = template.name
+        pokemon.db_path = None
+        pokemon.catalog = None
+
+        pokemon.id = template.id
+        pokemon.base_hp = template.base_hp
+        pokemon.base_attack = template.base_attack
+        pokemon.base_defense = template.base_defense
+        pokemon.base_special_attack = template.base_special_attack
+        pokemon.base_special_defense = template.base_special_defense
+        pokemon.base_speed = template.base_speed
+        pokemon.type1 = template.type1
+        pokemon.type2 = template.type2
+        pokemon.defense_vector = template.defense_vector
+
+        pokemon.ability = template.ability
+        pokemon.item = template.item
+        pokemon.nature = template.nature
+        pokemon.evs = template.evs
+        pokemon.moves = template.moves
+        pokemon.move_ids = template.move_ids
+
+        pokemon.max_hp = template.max_hp
+        pokemon.attack = template.attack
+        pokemon.defense = template.defense
+        pokemon.special_attack = template.special_attack
+        pokemon.special_defense = template.special_defense
+        pokemon.speed = template.speed
+
+        pokemon.current_hp = template.max_hp
+        pokemon.status = STATUS_NONE
+        pokemon.stat_stages = array("b", _NO_STAGES)
+        return pokemon
+
+    def template(self) -> PokemonTemplate:
+        """Freeze this Pokemon's species, set and computed stats into a template."""
+        return PokemonTemplate(
+            name=self.name,
+            id=self.id,
+            type1=self.type1,
+            type2=self.type2,
+            defense_vector=self.defense_vector,
+            base_hp=self.base_hp,
+            base_attack=self.base_attack,
+            base_defense=self.base_defense,
+            base_special_attack=self.base_special_attack,
+            base_special_defense=self.base_special_defense,
+            base_speed=self.base_speed,
+            ability=self.ability,
+            item=self.item,
+            nature=self.nature,
+            evs=MappingProxyType(dict(self.evs)),
+            moves=tuple(self.moves),
+            move_ids=tuple(self.move_ids),
+            max_hp=self.max_hp,
+            attack=self.attack,
+            defense=self.defense,
+            special_attack=self.special_attack,
+            special_defense=self.special_defense,
+            speed=self.speed,
+        )
+
+    def reset(self):
+        """Restore full HP, clear status and stat stages, in place."""
+        self.current_hp = self.max_hp
+        self.status = STATUS_NONE
+        self.stat_stages[:] = _NO_STAGES
+
     def _load_base_stats(self):
         """Load base stats from pokemon_fact table."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if self.catalog is not None:
+            result = self.catalog.get_species(self.name)
+        else:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """SELECT id, hp, attack, defense, special_attack, special_defense, speed, type1, type2
-               FROM pokemon_fact WHERE name = ?""",
-            (self.name,),
-        )
-        result = cursor.fetchone()
-        conn.close()
+            cursor.execute(
+                """SELECT id, hp, attack, defense, special_attack, special_defense, speed, type1, type2
+                   FROM pokemon_fact WHERE name = ?""",
+                (self.name,),
+            )
+            result = cursor.fetchone()
+            conn.close()
 
         if result:
             (
@@ -98,17 +339,20 @@ class Pokemon:
 
     def _load_smogon_set(self):
         """Load competitive moveset from smogon_sets table."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """SELECT ability, item, nature, move1, move2, move3, move4,
-                      ev_hp, ev_attack, ev_defense, ev_special_attack, ev_special_defense, ev_speed
-               FROM smogon_sets WHERE pokemon_name = ?""",
-            (self.name,),
-        )
-        result = cursor.fetchone()
-        conn.close()
+        if self.catalog is not None:
+            result = self.catalog.get_set(self.name)
+        else:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """SELECT ability, item, nature, move1, move2, move3, move4,
+                          ev_hp, ev_attack, ev_defense, ev_special_attack, ev_special_defense, ev_speed
+                   FROM smogon_sets WHERE pokemon_name = ?""",
+                (self.name,),
+            )
+            result = cursor.fetchone()
+            conn.close()
 
         if result:
             (
@@ -137,74 +381,53 @@ class Pokemon:
             }
 
             # Load moves
+            moves = []
             for move_name in [move1, move2, move3, move4]:
                 if move_name:
                     try:
-                        self.moves.append(Move(move_name, self.db_path))
+                        if self.catalog is not None:
+                            moves.append(self.catalog.move(move_name))
+                        else:
+                            moves.append(Move(move_name, self.db_path))
                     except Exception as e:
                         print(f"Warning: Could not load move '{move_name}': {e}")
+            self.moves = tuple(moves)
+            self.move_ids = tuple(move.id for move in moves)
 
-    def _calculate_stats(self, level: int = 100):
+    def _calculate_stats(self, level: int = LEVEL):
         """
         Calculate actual stats from base stats, EVs, IVs (assumed max), and nature.
         Uses Pokemon stat formula.
         """
-        iv = 31  # Assume perfect IVs
-
-        # HP calculation
-        if self.base_hp > 0:
-            self.max_hp = (
-                int(((2 * self.base_hp + iv + self.evs["hp"] // 4) * level) / 100)
-                + level
-                + 10
-            )
-        else:
-            self.max_hp = 1
-
-        # Other stats (with nature modifiers)
-        self.attack = self._calc_stat(
-            self.base_attack, self.evs["attack"], iv, level, "attack"
-        )
-        self.defense = self._calc_stat(
-            self.base_defense, self.evs["defense"], iv, level, "defense"
-        )
-        self.special_attack = self._calc_stat(
-            self.base_special_attack,
-            self.evs["special_attack"],
-            iv,
-            level,
-            "special_attack",
-        )
-        self.special_defense = self._calc_stat(
-            self.base_special_defense,
-            self.evs["special_defense"],
-            iv,
+        (
+            self.max_hp,
+            self.attack,
+            self.defense,
+            self.special_attack,
+            self.special_defense,
+            self.speed,
+        ) = calc_stats(
+            (
+                self.base_hp,
+                self.base_attack,
+                self.base_defense,
+                self.base_special_attack,
+                self.base_special_defense,
+                self.base_speed,
+            ),
+            tuple(self.evs[stat] for stat in STAT_NAMES),
+            self.nature,
+            IV,
             level,
-            "special_defense",
-        )
-        self.speed = self._calc_stat(
-            self.base_speed, self.evs["speed"], iv, level, "speed"
         )
 
-    def _calc_stat(
-        self, base: int, ev: int, iv: int, level: int, stat_name: str
-    ) -> int:
-        """Calculate individual stat with nature modifier."""
-        stat = int(((2 * base + iv + ev // 4) * level) / 100) + 5
-
-        # Apply nature modifier (simplified - would need full nature chart)
-        nature_boosts = {
-            "adamant": {"attack": 1.1, "special_attack": 0.9},
-            "modest": {"special_attack": 1.1, "attack": 0.9},
-            "jolly": {"speed": 1.1, "special_attack": 0.9},
-            "timid": {"speed": 1.1, "attack": 0.9},
-            # Add more natures as needed
-        }
-
-        if self.nature in nature_boosts and stat_name in nature_boosts[self.nature]:
-            stat = int(stat * nature_boosts[self.nature][stat_name])
+    def status_name(self) -> Optional[str]:
+        """Get the status condition's name, or None if healthy."""
+        return STATUS_NAMES[self.status]
 
-        return stat
+    def stage(self, stat: str) -> int:
+        """Get the current stage (-6 to +6) of a stat from STAGE_STATS."""
+        return self.stat_stages[STAGE_INDEX[stat]]
 
     def get_types(self) -> list[str]:
         """Get list of types."""
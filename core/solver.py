@@ -0,0 +1,188 @@
+"""
+Exact win probabilities for a 1v1 matchup by dynamic programming.
+
+With the greedy AI each side uses one fixed move for the whole battle (see
+core.matchup), so the only randomness is the accuracy roll, the crit and the
+damage roll in [0.85, 1.0]. That makes the outcome computable exactly rather
+than sampled.
+
+The battle state is (HP1, HP2, turn). Neither side's damage depends on the
+other's HP, so the joint distribution over (HP1, HP2) after each turn is the
+outer product of two independent per-side HP distributions. The solver
+propagates each side's distribution one attack at a time and combines them
+through the turn order, which costs O(max_turns * HP * rolls) instead of
+O(max_turns * HP1 * HP2 * rolls).
+"""
+
+import math
+from typing import Optional
+import numpy as np
+from core.matchup import (
+    AttackPlan,
+    CRIT_CHANCE,
+    CRIT_MULTIPLIER,
+    ROLL_MAX,
+    ROLL_MIN,
+    plan_matchup,
+)
+from core.pokemon import Pokemon
+
+
+class MatchupOdds:
+    """Exact outcome probabilities of one matchup."""
+
+    def __init__(
+        self,
+        pokemon1: Pokemon,
+        pokemon2: Pokemon,
+        p1_win: float,
+        p2_win: float,
+        turn_distribution: np.ndarray,
+        max_turns: int,
+    ):
+        """
+        Args:
+            pokemon1: First Pokemon
+            pokemon2: Second Pokemon
+            p1_win: Probability pokemon1 wins
+            p2_win: Probability pokemon2 wins
+            turn_distribution: Probability of the battle ending on each turn
+            max_turns: Turn limit the odds were computed for
+        """
+        self.pokemon1 = pokemon1
+        self.pokemon2 = pokemon2
+        self.p1_win = p1_win
+        self.p2_win = p2_win
+        self.draw = max(0.0, 1.0 - p1_win - p2_win)
+        self.turn_distribution = turn_distribution
+        self.max_turns = max_turns
+
+    def expected_turns(self) -> float:
+        """Mean battle length in turns."""
+        turns = np.arange(len(self.turn_distribution))
+        return float((turns * self.turn_distribution).sum())
+
+    def __repr__(self):
+        return (
+            f"MatchupOdds({self.pokemon1.name} vs {self.pokemon2.name}, "
+            f"{self.p1_win:.4f}/{self.p2_win:.4f}/{self.draw:.4f})"
+        )
+
+
+def damage_distribution(plan: AttackPlan) -> np.ndarray:
+    """
+    Exact distribution of damage dealt by one attack.
+
+    The roll is continuous, so P(int(B * roll) = k) is the length of the
+    roll interval mapping to k, divided by the width of the roll range.
+
+    Returns:
+        Array of probabilities indexed by damage
+    """
+    hit = plan.hit_chance()
+    if plan.base_damage <= 0 or hit == 0:
+        return np.array([1.0])
+
+    width = ROLL_MAX - ROLL_MIN
+    top = int(plan.base_damage * CRIT_MULTIPLIER * ROLL_MAX)
+    pmf = np.zeros(top + 1)
+    pmf[0] = 1.0 - hit
+
+    for multiplier, weight in (
+        (1.0, 1.0 - CRIT_CHANCE),
+        (CRIT_MULTIPLIER, CRIT_CHANCE),
+    ):
+        scaled = plan.base_damage * multiplier
+        for k in range(math.floor(scaled * ROLL_MIN), math.floor(scaled * ROLL_MAX) + 1):
+            lo = max(k / scaled, ROLL_MIN)
+            hi = min((k + 1) / scaled, ROLL_MAX)
+            if hi > lo:
+                pmf[k] += hit * weight * (hi - lo) / width
+
+    return pmf
+
+
+def knockout_cdf(
+    plan: Optional[AttackPlan], defender_hp: int, attempts: int
+) -> np.ndarray:
+    """
+    Probability the defender has fainted after each number of attacks.
+
+    Propagates the distribution of damage taken so far, with everything at
+    or above the defender's HP lumped into one absorbing fainted state.
+
+    Returns:
+        Array where index t is P(fainted within t attacks), t = 0..attempts
+    """
+    cdf = np.zeros(attempts + 1)
+    if defender_hp <= 0:
+        cdf[1:] = 1.0
+        return cdf
+    if plan is None:
+        return cdf
+
+    pmf = damage_distribution(plan)
+    if len(pmf) == 1:
+        return cdf
+
+    taken = np.zeros(defender_hp + 1)
+    taken[0] = 1.0
+    for t in range(1, attempts + 1):
+        spread = np.convolve(taken, pmf)
+        taken = spread[: defender_hp + 1]
+        taken[defender_hp] += spread[defender_hp + 1 :].sum()
+        cdf[t] = taken[defender_hp]
+        if cdf[t] >= 1.0:
+            cdf[t:] = 1.0
+            break
+
+    return cdf
+
+
+def solve_matchup(
+    pokemon1: Pokemon, pokemon2: Pokemon, max_turns: int = 100
+) -> MatchupOdds:
+    """
+    Compute exact win/draw/loss probabilities for Battle.simulate_many's model.
+
+    Args:
+        pokemon1: First Pokemon
+        pokemon2: Second Pokemon
+        max_turns: Maximum number of turns before declaring a draw
+
+    Returns:
+        MatchupOdds for pokemon1 vs pokemon2
+    """
+    p1_first, first, second, first_plan, second_plan = plan_matchup(pokemon1, pokemon2)
+
+    turn_distribution = np.zeros(max_turns + 1)
+
+    if first_plan is None or max_turns < 1:
+        # The battle stops before anyone attacks
+        turn_distribution[min(1, max_turns)] = 1.0
+        first_win = second_win = 0.0
+    else:
+        first_cdf = knockout_cdf(first_plan, second.current_hp, max_turns)
+        first_ko = np.diff(first_cdf)  # P(first KOs on its t-th attack), t = 1..
+
+        if second_plan is None:
+            # Second stops the battle on its first action unless already KO'd
+            first_win = float(first_ko[0])
+            second_win = 0.0
+            turn_distribution[1] = 1.0
+        else:
+            second_cdf = knockout_cdf(second_plan, first.current_hp, max_turns)
+            second_ko = np.diff(second_cdf)
+
+            # First wins on turn t if it KOs then and second hasn't earlier
+            first_wins = first_ko * (1.0 - second_cdf[:-1])
+            # Second wins on turn t if it KOs then and first hasn't through t
+            second_wins = second_ko * (1.0 - first_cdf[1:])
+
+            first_win = float(first_wins.sum())
+            second_win = float(second_wins.sum())
+            turn_distribution[1:] = first_wins + second_wins
+            turn_distribution[max_turns] += max(0.0, 1.0 - first_win - second_win)
+
+    p1_win, p2_win = (first_win, second_win) if p1_first else (second_win, first_win)
+    return MatchupOdds(pokemon1, pokemon2, p1_win, p2_win, turn_distribution, max_turns)
@@ -0,0 +1,258 @@
+"""
+Stat formulas and a vectorized stat compiler.
+
+Final stats depend only on base stats, EVs, nature, IVs and level, so they
+can be computed for every species, EV spread and nature at once:
+
+    compiler = StatCompiler.from_db(db_path)
+    stats = compiler.compile(evs=[[0, 252, 0, 0, 4, 252]], natures=NATURE_NAMES)
+    stats[species, spread, nature]  # -> (hp, attack, ..., speed)
+
+Catalog.set_stats() runs this once for every species' own set and
+Catalog templates read their stats from it; a Pokemon loaded straight from
+the database uses the scalar calc_stats() below, which gives identical
+results.
+"""
+
+import sqlite3
+from typing import Optional, Sequence
+import numpy as np
+
+LEVEL = 100
+IV = 31  # Assume perfect IVs
+
+# Order of the stat columns everywhere in this module
+STAT_NAMES = (
+    "hp",
+    "attack",
+    "defense",
+    "special_attack",
+    "special_defense",
+    "speed",
+)
+STAT_INDEX = {stat: i for i, stat in enumerate(STAT_NAMES)}
+
+# nature -> (raised stat, lowered stat); the same stat twice means neutral
+NATURES = {
+    "hardy": ("attack", "attack"),
+    "lonely": ("attack", "defense"),
+    "brave": ("attack", "speed"),
+    "adamant": ("attack", "special_attack"),
+    "naughty": ("attack", "special_defense"),
+    "bold": ("defense", "attack"),
+    "docile": ("defense", "defense"),
+    "relaxed": ("defense", "speed"),
+    "impish": ("defense", "special_attack"),
+    "lax": ("defense", "special_defense"),
+    "timid": ("speed", "attack"),
+    "hasty": ("speed", "defense"),
+    "serious": ("speed", "speed"),
+    "jolly": ("speed", "special_attack"),
+    "naive": ("speed", "special_defense"),
+    "modest": ("special_attack", "attack"),
+    "mild": ("special_attack", "defense"),
+    "quiet": ("special_attack", "speed"),
+    "bashful": ("special_attack", "special_attack"),
+    "rash": ("special_attack", "special_defense"),
+    "calm": ("special_defense", "attack"),
+    "gentle": ("special_defense", "defense"),
+    "sassy": ("special_defense", "speed"),
+    "careful": ("special_defense", "special_attack"),
+    "quirky": ("special_defense", "special_defense"),
+}
+NATURE_NAMES = tuple(NATURES)
+NATURE_IDS = {name: i for i, name in enumerate(NATURE_NAMES)}
+NEUTRAL_NATURE = "hardy"
+
+
+def _modifier_row(raised: str, lowered: str) -> tuple[float, ...]:
+    row = [1.0] * len(STAT_NAMES)
+    if raised != lowered:
+        row[STAT_INDEX[raised]] = 1.1
+        row[STAT_INDEX[lowered]] = 0.9
+    return tuple(row)
+
+
+# nature -> multiplier per stat column (HP is never affected)
+NATURE_MODIFIERS = {
+    name: _modifier_row(raised, lowered) for name, (raised, lowered) in NATURES.items()
+}
+NATURE_MATRIX = np.array([NATURE_MODIFIERS[name] for name in NATURE_NAMES])
+
+
+def nature_id(nature: Optional[str]) -> int:
+    """Get a nature's row in NATURE_MATRIX; unknown or missing natures are neutral."""
+    return NATURE_IDS.get((nature or NEUTRAL_NATURE).lower(), NATURE_IDS[NEUTRAL_NATURE])
+
+
+def nature_modifiers(nature: Optional[str]) -> tuple[float, ...]:
+    """Get the per-stat multipliers for a nature; unknown natures are neutral."""
+    return NATURE_MODIFIERS.get((nature or NEUTRAL_NATURE).lower(), NATURE_MODIFIERS[NEUTRAL_NATURE])
+
+
+def calc_hp(base: int, ev: int, iv: int = IV, level: int = LEVEL) -> int:
+    """HP stat formula; species with base HP 0 get 1 HP."""
+    if base <= 0:
+        return 1
+    return int(((2 * base + iv + ev // 4) * level) / 100) + level + 10
+
+
+def calc_stat(base: int, ev: int, modifier: float = 1.0, iv: int = IV, level: int = LEVEL) -> int:
+    """Non-HP stat formula with a nature multiplier."""
+    stat = int(((2 * base + iv + ev // 4) * level) / 100) + 5
+    return int(stat * modifier)
+
+
+def calc_stats(
+    base: Sequence[int],
+    evs: Sequence[int],
+    nature: Optional[str] = None,
+    iv: int = IV,
+    level: int = LEVEL,
+) -> tuple[int, ...]:
+    """
+    Compute one set of final stats.
+
+    Args:
+        base: Base stats in STAT_NAMES order
+        evs: EVs in STAT_NAMES order
+        nature: Nature name
+        iv: IV in every stat
+        level: Pokemon level
+
+    Returns:
+        Final stats in STAT_NAMES order
+    """
+    modifiers = nature_modifiers(nature)
+    return (calc_hp(base[0], evs[0], iv, level),) + tuple(
+        calc_stat(base[i], evs[i], modifiers[i], iv, level) for i in range(1, len(STAT_NAMES))
+    )
+
+
+def compile_stats(
+    base: np.ndarray,
+    evs: np.ndarray,
+    natures: Optional[Sequence[str]] = None,
+    iv: int = IV,
+    level: int = LEVEL,
+) -> np.ndarray:
+    """
+    Compute final stats for every species x EV spread x nature in one pass.
+
+    Args:
+        base: (species, 6) base stats
+        evs: (spreads, 6) EV spreads
+        natures: Nature names; all 25 if not given. Unknown ones are neutral
+        iv: IV in every stat
+        level: Pokemon level
+
+    Returns:
+        (species, spreads, natures, 6) int32 array of final stats
+    """
+    base = np.asarray(base, dtype=np.int64).reshape(-1, len(STAT_NAMES))
+    evs = np.asarray(evs, dtype=np.int64).reshape(-1, len(STAT_NAMES))
+    names = NATURE_NAMES if natures is None else natures
+    modifiers = NATURE_MATRIX[[nature_id(name) for name in names]]
+    return _final_stats(
+        base[:, None, None, :], evs[None, :, None, :], modifiers[None, None, :, :], iv, level
+    )
+
+
+def _final_stats(
+    base: np.ndarray, evs: np.ndarray, modifiers: np.ndarray, iv: int, level: int
+) -> np.ndarray:
+    """calc_stats() over broadcastable arrays whose last axis is the stat."""
+    # Exact integer arithmetic up to the nature multiplier
+    raw = ((2 * base + iv + evs // 4) * level) // 100
+
+    # Nature multiplies the truncated stat, then truncates again, like calc_stat
+    stats = np.floor((raw + 5) * modifiers).astype(np.int64)
+    stats[..., 0] = np.where(base[..., 0] > 0, raw[..., 0] + level + 10, 1)
+    return stats.astype(np.int32)
+
+
+def load_base_stats(db_path: str = "data_prep/pkmn_battle_station.db") -> tuple[list[str], np.ndarray]:
+    """Get species names and their (species, 6) base stat matrix, in Pokedex order."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        """SELECT name, hp, attack, defense, special_attack, special_defense, speed
+           FROM pokemon_fact ORDER BY id"""
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    names = [row[0] for row in rows]
+    base = np.array([row[1:] for row in rows], dtype=np.int64).reshape(-1, len(STAT_NAMES))
+    return names, base
+
+
+class StatCompiler:
+    """
+    Base-stat matrix plus a cache of compiled stat arrays.
+
+    Compiled arrays are keyed by their EV spreads, natures, IVs and level,
+    so repeated requests (an optimizer revisiting the same spreads, every
+    tournament worker asking for the roster's stats) are a dict lookup.
+    """
+
+    def __init__(self, names: Sequence[str], base: np.ndarray):
+        """
+        Args:
+            names: Species names, one per base stat row
+            base: (species, 6) base stats in STAT_NAMES order
+        """
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.base = np.asarray(base, dtype=np.int64).reshape(-1, len(STAT_NAMES))
+        self._cache: dict[tuple, np.ndarray] = {}
+
+    @classmethod
+    def from_db(cls, db_path: str = "data_prep/pkmn_battle_station.db") -> "StatCompiler":
+        """Build a compiler over every species in pokemon_fact."""
+        return cls(*load_base_stats(db_path))
+
+    def compile(
+        self,
+        evs: np.ndarray,
+        natures: Optional[Sequence[str]] = None,
+        iv: int = IV,
+        level: int = LEVEL,
+    ) -> np.ndarray:
+        """
+        Get (species, spreads, natures, 6) final stats, computing them once.
+
+        The returned array is shared with the cache and marked read-only.
+        """
+        evs = np.asarray(evs, dtype=np.int64).reshape(-1, len(STAT_NAMES))
+        names = NATURE_NAMES if natures is None else tuple(natures)
+        key = (evs.tobytes(), names, iv, level)
+        stats = self._cache.get(key)
+        if stats is None:
+            stats = compile_stats(self.base, evs, names, iv, level)
+            stats.flags.writeable = False
+            self._cache[key] = stats
+        return stats
+
+    def set_stats(
+        self, evs: np.ndarray, natures: Sequence[str], iv: int = IV, level: int = LEVEL
+    ) -> np.ndarray:
+        """
+        Final stats for one set per species, in one pass.
+
+        Args:
+            evs: (species, 6) EV spread per species
+            natures: Nature name per species
+
+        Returns:
+            (species, 6) int32 array
+        """
+        evs = np.asarray(evs, dtype=np.int64).reshape(-1, len(STAT_NAMES))
+        modifiers = NATURE_MATRIX[[nature_id(name) for name in natures]]
+        return _final_stats(self.base, evs, modifiers, iv, level)
+
+    def clear(self):
+        """Drop every cached array."""
+        self._cache.clear()
+
+    def __repr__(self):
+        return f"StatCompiler({len(self.names)} species, {len(self._cache)} cached)"
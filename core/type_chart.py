@@ -3,6 +3,10 @@ Type effectiveness chart for Pokemon battles.
 Based on Generation 8+ type chart.
 """
 
+import sqlite3
+from typing import Optional
+import numpy as np
+
 TYPE_CHART = {
     "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
     "fire": {
@@ -138,6 +142,82 @@ TYPE_CHART = {
 }
 
 
+# Integer type IDs, in TYPE_CHART order
+TYPES = tuple(TYPE_CHART)
+TYPE_IDS = {name: idx for idx, name in enumerate(TYPES)}
+NUM_TYPES = len(TYPES)
+
+# ID for attacking types missing from the chart; always hits for 1x
+UNKNOWN_TYPE_ID = NUM_TYPES
+
+
+def compile_type_matrix(chart: dict = TYPE_CHART) -> np.ndarray:
+    """
+    Compile a nested type chart into a NUM_TYPES x NUM_TYPES matrix.
+
+    Rows are attacking type IDs, columns are defending type IDs.
+    """
+    matrix = np.ones((NUM_TYPES, NUM_TYPES))
+    for attacking_type, row in chart.items():
+        atk_id = TYPE_IDS.get(attacking_type.lower())
+        if atk_id is None:
+            continue
+        for defending_type, multiplier in row.items():
+            def_id = TYPE_IDS.get(defending_type.lower())
+            if def_id is not None:
+                matrix[atk_id, def_id] = multiplier
+    return matrix
+
+
+def load_type_matrix(db_path: str = "data_prep/pkmn_battle_station.db") -> np.ndarray:
+    """Build the type matrix from the type_effectiveness table."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT attacking_type, defending_type, multiplier FROM type_effectiveness"
+    )
+    chart: dict[str, dict[str, float]] = {}
+    for attacking_type, defending_type, multiplier in cursor.fetchall():
+        chart.setdefault(attacking_type, {})[defending_type] = multiplier
+    conn.close()
+    return compile_type_matrix(chart)
+
+
+TYPE_MATRIX = compile_type_matrix()
+_MATRIX_ROWS = TYPE_MATRIX.tolist()
+
+
+def type_id(type_name: Optional[str]) -> int:
+    """Get the integer ID for a type name, or UNKNOWN_TYPE_ID."""
+    if not type_name:
+        return UNKNOWN_TYPE_ID
+    return TYPE_IDS.get(type_name.lower(), UNKNOWN_TYPE_ID)
+
+
+def defensive_vector(
+    defending_types: list[str], matrix: np.ndarray = TYPE_MATRIX
+) -> tuple[float, ...]:
+    """
+    Precompute a defender's multiplier against every attacking type.
+
+    Indexed by attacking type ID. The vector has NUM_TYPES + 1 entries; the
+    last one is 1.0 and covers UNKNOWN_TYPE_ID.
+
+    Args:
+        defending_types: List of defending Pokemon's types (1 or 2 types)
+        matrix: Type matrix to read from
+
+    Returns:
+        Tuple of multipliers, one per attacking type ID
+    """
+    vector = np.ones(NUM_TYPES + 1)
+    for def_type in defending_types:
+        def_id = type_id(def_type)
+        if def_id != UNKNOWN_TYPE_ID:
+            vector[:NUM_TYPES] *= matrix[:, def_id]
+    return tuple(vector.tolist())
+
+
 def get_type_effectiveness(attacking_type: str, defending_types: list[str]) -> float:
     """
     Calculate type effectiveness multiplier.
@@ -152,17 +232,19 @@ def get_type_effectiveness(attacking_type: str, defending_types: list[str]) -> f
     if not attacking_type or not defending_types:
         return 1.0
 
+    atk_id = TYPE_IDS.get(attacking_type.lower())
+    if atk_id is None:
+        return 1.0
+
     multiplier = 1.0
-    attacking_type = attacking_type.lower()
+    row = _MATRIX_ROWS[atk_id]
 
     for def_type in defending_types:
         if not def_type:
             continue
-        def_type = def_type.lower()
-
-        if attacking_type in TYPE_CHART:
-            effectiveness = TYPE_CHART[attacking_type].get(def_type, 1.0)
-            multiplier *= effectiveness
+        def_id = TYPE_IDS.get(def_type.lower())
+        if def_id is not None:
+            multiplier *= row[def_id]
 
     return multiplier
 
@@ -10,9 +10,18 @@ CREATE TABLE IF NOT EXISTS pokemon_fact (
     speed INTEGER,
     type1 TEXT,
     type2 TEXT,
-    sprite_url TEXT
+    sprite_url TEXT,
+    -- Base stat total, kept by SQLite so the Pokedex can filter and sort on it
+    total INTEGER GENERATED ALWAYS AS (
+        hp + attack + defense + special_attack + special_defense + speed
+    ) STORED
 );
 
+-- Pokedex type filters and stat total range/sort
+CREATE INDEX IF NOT EXISTS idx_pokemon_fact_type1 ON pokemon_fact (type1);
+CREATE INDEX IF NOT EXISTS idx_pokemon_fact_type2 ON pokemon_fact (type2);
+CREATE INDEX IF NOT EXISTS idx_pokemon_fact_total ON pokemon_fact (total);
+
 -- Stores all moves and their properties
 CREATE TABLE IF NOT EXISTS moves_dim (
     name TEXT PRIMARY KEY,
@@ -54,16 +63,22 @@ CREATE TABLE IF NOT EXISTS battle_results (
     turns INTEGER,
     pokemon1_hp_remaining INTEGER,
     pokemon2_hp_remaining INTEGER,
+    pokemon1_config TEXT,  -- Battle configuration hash of each side when fought
+    pokemon2_config TEXT,
     battle_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (pokemon1_name) REFERENCES pokemon_fact(name),
     FOREIGN KEY (pokemon2_name) REFERENCES pokemon_fact(name),
     FOREIGN KEY (winner_name) REFERENCES pokemon_fact(name)
 );
 
+CREATE INDEX IF NOT EXISTS idx_battle_results_pair
+    ON battle_results (pokemon1_name, pokemon2_name);
+
 -- Stores Pokemon rankings/ELO ratings
 CREATE TABLE IF NOT EXISTS pokemon_rankings (
     pokemon_name TEXT PRIMARY KEY,
     elo_rating INTEGER DEFAULT 1500,
+    bt_rating REAL DEFAULT 1500.0,  -- Bradley-Terry fit on the same scale
     wins INTEGER DEFAULT 0,
     losses INTEGER DEFAULT 0,
     draws INTEGER DEFAULT 0,
@@ -79,4 +94,20 @@ CREATE TABLE IF NOT EXISTS type_effectiveness (
     defending_type TEXT,
     multiplier REAL,
     PRIMARY KEY (attacking_type, defending_type)
-);
\ No newline at end of file
+);
+
+-- Stores downloaded sprite images once per distinct image (SHA-256 of the bytes)
+CREATE TABLE IF NOT EXISTS sprite_blobs (
+    sha256 TEXT PRIMARY KEY,
+    image BLOB,
+    thumbnail BLOB  -- Small PNG for card grids; NULL if it could not be made
+);
+
+-- Maps each Pokemon to its stored sprite
+CREATE TABLE IF NOT EXISTS pokemon_sprites (
+    pokemon_id INTEGER PRIMARY KEY,
+    sprite_url TEXT,  -- URL the image was downloaded from
+    sha256 TEXT,
+    FOREIGN KEY (pokemon_id) REFERENCES pokemon_fact(id),
+    FOREIGN KEY (sha256) REFERENCES sprite_blobs(sha256)
+);
@@ -0,0 +1,323 @@
+"""
+Build pokemon_fact, moves_dim and type_effectiveness from a local PokeAPI
+data dump, with no network access.
+
+Two dump layouts are understood, each as a directory or a tarball:
+- the CSV export from the PokeAPI repository (data/v2/csv/pokemon.csv, ...)
+- the static JSON tree from the api-data repository
+  (data/api/v2/pokemon/<id>/index.json, ...)
+
+Records are streamed: CSV rows go straight from csv.reader into SQLite
+staging tables with executemany and are joined there, and JSON resources
+are parsed one file at a time. Each target table is written in a single
+transaction.
+
+    python import_dump.py path/to/pokeapi/data/v2/csv
+    python import_dump.py pokeapi-master.tar.gz
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+import tarfile
+import time
+from typing import IO, Iterator, Optional
+from moves_dim import parse_move
+from pokemon_fact import parse_pokemon
+from schema import SCHEMA_PATH, apply_schema
+
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{id}.png"
+
+# Staging table -> (CSV file, columns read from it)
+CSV_TABLES = {
+    "dump_pokemon": ("pokemon.csv", ("id", "identifier")),
+    "dump_types": ("types.csv", ("id", "identifier")),
+    "dump_pokemon_types": ("pokemon_types.csv", ("pokemon_id", "type_id", "slot")),
+    "dump_stats": ("stats.csv", ("id", "identifier")),
+    "dump_pokemon_stats": ("pokemon_stats.csv", ("pokemon_id", "stat_id", "base_stat")),
+    "dump_moves": (
+        "moves.csv",
+        ("identifier", "type_id", "power", "pp", "accuracy", "priority", "damage_class_id"),
+    ),
+    "dump_damage_classes": ("move_damage_classes.csv", ("id", "identifier")),
+    "dump_type_efficacy": ("type_efficacy.csv", ("damage_type_id", "target_type_id", "damage_factor")),
+}
+
+JSON_RESOURCE = re.compile(r"api/v2/(pokemon|move|type)/(\d+)/index\.json$")
+
+# Standard type IDs; higher ones (unknown, shadow, stellar) have no chart rows
+MAX_TYPE_ID = 18
+
+
+class DumpReader:
+    """Uniform file access to a dump directory or tarball."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Dump directory, or a .tar/.tar.gz/.tgz archive
+        """
+        self.path = path
+        self._tar: Optional[tarfile.TarFile] = None
+        # Relative path -> tar member or filesystem path; names only, no data
+        self._files: dict[str, object] = {}
+
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    full = os.path.join(root, name)
+                    self._files[os.path.relpath(full, path).replace(os.sep, "/")] = full
+        else:
+            self._tar = tarfile.open(path, "r:*")
+            for member in self._tar:
+                if member.isfile():
+                    self._files[member.name] = member
+
+    def find(self, name: str) -> Optional[str]:
+        """Get the relative path of the file called `name`, preferring csv/ folders."""
+        matches = [path for path in self._files if path == name or path.endswith("/" + name)]
+        if not matches:
+            return None
+        matches.sort(key=lambda path: ("/csv/" not in "/" + path, len(path)))
+        return matches[0]
+
+    def open(self, path: str) -> IO[bytes]:
+        """Open a file by relative path for binary reading."""
+        source = self._files[path]
+        if self._tar is not None:
+            return self._tar.extractfile(source)
+        return open(source, "rb")
+
+    def matching(self, pattern: re.Pattern) -> Iterator[tuple[re.Match, str]]:
+        """Yield (match, path) for every file whose path matches `pattern`."""
+        for path in self._files:
+            match = pattern.search(path)
+            if match:
+                yield match, path
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+
+    def __enter__(self) -> "DumpReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def is_csv_dump(reader: DumpReader) -> bool:
+    return reader.find("pokemon.csv") is not None and reader.find("moves.csv") is not None
+
+
+def _csv_rows(reader: DumpReader, filename: str, columns: tuple[str, ...]) -> Iterator[tuple]:
+    """Stream the wanted columns of a CSV file; empty cells become NULL."""
+    with reader.open(reader.find(filename)) as raw:
+        rows = csv.reader(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+        header = next(rows)
+        positions = [header.index(column) for column in columns]
+        for row in rows:
+            yield tuple(row[i] if row[i] != "" else None for i in positions)
+
+
+def _stage_csv(conn: sqlite3.Connection, reader: DumpReader, table: str):
+    filename, columns = CSV_TABLES[table]
+    conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+    conn.execute(f"CREATE TEMP TABLE {table} ({', '.join(columns)})")
+    conn.executemany(
+        f"INSERT INTO temp.{table} VALUES ({', '.join('?' * len(columns))})",
+        _csv_rows(reader, filename, columns),
+    )
+
+
+def import_csv(conn: sqlite3.Connection, reader: DumpReader, sprite_url: str = SPRITE_URL) -> dict[str, int]:
+    """Load all three tables from the CSV export."""
+    counts = {}
+
+    conn.execute("BEGIN")
+    for table in ("dump_pokemon", "dump_types", "dump_pokemon_types", "dump_stats", "dump_pokemon_stats"):
+        _stage_csv(conn, reader, table)
+    prefix, suffix = sprite_url.split("{id}")
+    cursor = conn.execute(
+        """
+        INSERT OR REPLACE INTO pokemon_fact (
+            id, name, type1, type2, hp, attack, defense, special_attack,
+            special_defense, speed, sprite_url
+        )
+        SELECT
+            p.id, p.identifier,
+            (SELECT t.identifier FROM dump_pokemon_types pt JOIN dump_types t ON t.id = pt.type_id
+              WHERE pt.pokemon_id = p.id AND pt.slot = '1'),
+            (SELECT t.identifier FROM dump_pokemon_types pt JOIN dump_types t ON t.id = pt.type_id
+              WHERE pt.pokemon_id = p.id AND pt.slot = '2'),
+            COALESCE(s.hp, 0), COALESCE(s.attack, 0), COALESCE(s.defense, 0),
+            COALESCE(s.special_attack, 0), COALESCE(s.special_defense, 0), COALESCE(s.speed, 0),
+            ? || p.id || ?
+        FROM dump_pokemon p
+        LEFT JOIN (
+            SELECT ps.pokemon_id,
+                   MAX(CASE WHEN st.identifier = 'hp' THEN CAST(ps.base_stat AS INTEGER) END) AS hp,
+                   MAX(CASE WHEN st.identifier = 'attack' THEN CAST(ps.base_stat AS INTEGER) END) AS attack,
+                   MAX(CASE WHEN st.identifier = 'defense' THEN CAST(ps.base_stat AS INTEGER) END) AS defense,
+                   MAX(CASE WHEN st.identifier = 'special-attack' THEN CAST(ps.base_stat AS INTEGER) END) AS special_attack,
+                   MAX(CASE WHEN st.identifier = 'special-defense' THEN CAST(ps.base_stat AS INTEGER) END) AS special_defense,
+                   MAX(CASE WHEN st.identifier = 'speed' THEN CAST(ps.base_stat AS INTEGER) END) AS speed
+            FROM dump_pokemon_stats ps JOIN dump_stats st ON st.id = ps.stat_id
+            GROUP BY ps.pokemon_id
+        ) s ON s.pokemon_id = p.id
+        """,
+        (prefix, suffix),
+    )
+    counts["pokemon_fact"] = cursor.rowcount
+    conn.execute("COMMIT")
+
+    conn.execute("BEGIN")
+    for table in ("dump_moves", "dump_damage_classes"):
+        _stage_csv(conn, reader, table)
+    cursor = conn.execute(
+        """
+        INSERT OR REPLACE INTO moves_dim (name, power, accuracy, pp, type, damage_class, priority)
+        SELECT m.identifier, CAST(m.power AS INTEGER), CAST(m.accuracy AS INTEGER),
+               COALESCE(CAST(m.pp AS INTEGER), 0), t.identifier, dc.identifier,
+               COALESCE(CAST(m.priority AS INTEGER), 0)
+        FROM dump_moves m
+        LEFT JOIN dump_types t ON t.id = m.type_id
+        LEFT JOIN dump_damage_classes dc ON dc.id = m.damage_class_id
+        """
+    )
+    counts["moves_dim"] = cursor.rowcount
+    conn.execute("COMMIT")
+
+    conn.execute("BEGIN")
+    _stage_csv(conn, reader, "dump_type_efficacy")
+    cursor = conn.execute(
+        """
+        INSERT OR REPLACE INTO type_effectiveness (attacking_type, defending_type, multiplier)
+        SELECT a.identifier, d.identifier, CAST(e.damage_factor AS REAL) / 100.0
+        FROM dump_type_efficacy e
+        JOIN dump_types a ON a.id = e.damage_type_id
+        JOIN dump_types d ON d.id = e.target_type_id
+        """
+    )
+    counts["type_effectiveness"] = cursor.rowcount
+    conn.execute("COMMIT")
+
+    for table in CSV_TABLES:
+        conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+    return counts
+
+
+def _json_resources(reader: DumpReader, resource: str) -> Iterator[tuple[int, dict]]:
+    """Stream (id, parsed JSON) for one resource type, one file at a time."""
+    for match, path in reader.matching(JSON_RESOURCE):
+        if match.group(1) == resource:
+            with reader.open(path) as raw:
+                yield int(match.group(2)), json.load(raw)
+
+
+def _type_chart_rows(reader: DumpReader) -> Iterator[tuple[str, str, float]]:
+    """Expand each type's damage_relations into one row per defending type."""
+    relations = {}
+    for type_id, data in _json_resources(reader, "type"):
+        if type_id <= MAX_TYPE_ID:
+            relations[data["name"]] = data["damage_relations"]
+    for attacking, damage in relations.items():
+        multipliers = dict.fromkeys(relations, 1.0)
+        for key, multiplier in (
+            ("double_damage_to", 2.0),
+            ("half_damage_to", 0.5),
+            ("no_damage_to", 0.0),
+        ):
+            for target in damage.get(key, []):
+                if target["name"] in multipliers:
+                    multipliers[target["name"]] = multiplier
+        for defending, multiplier in multipliers.items():
+            yield attacking, defending, multiplier
+
+
+def import_json(conn: sqlite3.Connection, reader: DumpReader) -> dict[str, int]:
+    """Load all three tables from the api-data JSON tree."""
+    counts = {}
+
+    def insert(table: str, sql: str, rows: Iterator[tuple]):
+        conn.execute("BEGIN")
+        before = conn.total_changes
+        conn.executemany(sql, rows)
+        counts[table] = conn.total_changes - before
+        conn.execute("COMMIT")
+
+    insert(
+        "pokemon_fact",
+        """
+        INSERT OR REPLACE INTO pokemon_fact (
+            id, name, type1, type2, hp, attack, defense, special_attack,
+            special_defense, speed, sprite_url
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (parse_pokemon(data) for _, data in _json_resources(reader, "pokemon")),
+    )
+    insert(
+        "moves_dim",
+        """
+        INSERT OR REPLACE INTO moves_dim (
+            name, power, accuracy, pp, type, damage_class, priority
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (parse_move(data) for _, data in _json_resources(reader, "move")),
+    )
+    insert(
+        "type_effectiveness",
+        "INSERT OR REPLACE INTO type_effectiveness VALUES (?, ?, ?)",
+        _type_chart_rows(reader),
+    )
+    return counts
+
+
+def import_dump(
+    dump_path: str,
+    db_path: str = "pkmn_battle_station.db",
+    schema_path: Optional[str] = SCHEMA_PATH,
+) -> dict[str, int]:
+    """
+    Build the database from a local dump.
+
+    Args:
+        dump_path: Dump directory or tarball (CSV export or JSON tree)
+        db_path: Path to SQLite database
+        schema_path: Schema to apply first; None to skip
+
+    Returns:
+        Rows written per table
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    if schema_path:
+        apply_schema(conn, schema_path)
+
+    with DumpReader(dump_path) as reader:
+        if is_csv_dump(reader):
+            counts = import_csv(conn, reader)
+        else:
+            counts = import_json(conn, reader)
+    conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the database from a local PokeAPI dump.")
+    parser.add_argument("dump", help="Dump directory or tarball (CSV export or api-data JSON)")
+    parser.add_argument("--db", default="pkmn_battle_station.db")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = import_dump(args.dump, args.db)
+    for table, count in counts.items():
+        print(f"{table}: {count} rows")
+    print(f"Imported in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,91 @@
-import requests
+import argparse
 import sqlite3
+import time
+from pokeapi import DEFAULT_BASE_URL, DEFAULT_CACHE_DIR, PokeAPIClient
 
-# Create or connect to the SQLite database
-connection = sqlite3.connect("pkmn_battle_station.db")
-cursor = connection.cursor()
+MOVE_COUNT = 937
 
-# Fetch the list of all moves from PokeAPI
-response = requests.get("https://pokeapi.co/api/v2/move?limit=937")
-data = response.json()
-moves_list = data["results"]
 
-print(f"Fetching {len(moves_list)} moves from PokeAPI...")
+def parse_move(move_data: dict) -> tuple:
+    """Turn a PokeAPI move resource into a moves_dim row."""
+    move_name = move_data["name"]
+    power = move_data.get("power")  # Can be None for status moves
+    accuracy = move_data.get("accuracy")  # Can be None for some moves
+    pp = move_data.get("pp", 0)
+    move_type = move_data["type"]["name"] if move_data.get("type") else None
+    damage_class = (
+        move_data["damage_class"]["name"] if move_data.get("damage_class") else None
+    )
+    priority = move_data.get("priority", 0)
+    return (move_name, power, accuracy, pp, move_type, damage_class, priority)
 
-for idx, move in enumerate(moves_list, 1):
-    url = move["url"]
 
-    try:
-        move_data = requests.get(url).json()
+def load_moves(
+    db_path: str = "pkmn_battle_station.db",
+    client: PokeAPIClient = None,
+    limit: int = MOVE_COUNT,
+) -> int:
+    """
+    Fetch every move concurrently and write moves_dim in one transaction.
 
-        # Extract move details
-        move_name = move_data["name"]
-        power = move_data.get("power")  # Can be None for status moves
-        accuracy = move_data.get("accuracy")  # Can be None for some moves
-        pp = move_data.get("pp", 0)
-        move_type = move_data["type"]["name"] if move_data.get("type") else None
-        damage_class = (
-            move_data["damage_class"]["name"] if move_data.get("damage_class") else None
-        )
-        priority = move_data.get("priority", 0)
+    Returns:
+        Number of rows written
+    """
+    client = client or PokeAPIClient()
+    moves_list = client.list_resources("move", limit)
+    print(f"Fetching {len(moves_list)} moves from PokeAPI...")
+
+    rows = []
+    results = client.fetch_many([move["url"] for move in moves_list])
+    for move, move_data in zip(moves_list, results):
+        try:
+            if isinstance(move_data, Exception):
+                raise move_data
+            rows.append(parse_move(move_data))
+        except Exception as e:
+            print(f"Error processing move {move['name']}: {e}")
+            continue
 
-        # Insert data into the database
-        cursor.execute(
+    # Create or connect to the SQLite database
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.executemany(
             """
             INSERT OR REPLACE INTO moves_dim (
                 name, power, accuracy, pp, type, damage_class, priority
             ) VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            (move_name, power, accuracy, pp, move_type, damage_class, priority),
+            rows,
         )
+    connection.close()
+    return len(rows)
+
 
-        # Print progress every 100 moves
-        if idx % 100 == 0:
-            print(f"Processed {idx}/{len(moves_list)} moves...")
-            connection.commit()  # Commit periodically
+def main():
+    parser = argparse.ArgumentParser(description="Load moves_dim from PokeAPI.")
+    parser.add_argument("--db", default="pkmn_battle_station.db")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Always hit the network")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="Requests per second")
+    parser.add_argument("--limit", type=int, default=MOVE_COUNT)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with PokeAPIClient(
+        args.base_url,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        workers=args.workers,
+        rate_limit=args.rate_limit,
+    ) as client:
+        count = load_moves(args.db, client, args.limit)
+        print(
+            f"\nSuccessfully cached {count} moves in the database in "
+            f"{time.perf_counter() - start:.1f}s ({client.requests_made} requests, "
+            f"{client.cache_hits} cache hits)"
+        )
 
-    except Exception as e:
-        print(f"Error processing move {move['name']}: {e}")
-        continue
 
-# Final commit and close
-connection.commit()
-print(f"\nSuccessfully cached {len(moves_list)} moves in the database!")
-connection.close()
+if __name__ == "__main__":
+    main()
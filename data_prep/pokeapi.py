@@ -0,0 +1,247 @@
+"""
+Concurrent PokeAPI client with a local response cache.
+
+Requests go through one keep-alive requests.Session shared by a bounded
+thread pool, are rate limited across all threads, and are retried with
+exponential backoff on connection errors, 429 and 5xx responses.
+
+Every response body is stored once under the SHA-256 of its content, with
+a small reference file per URL pointing at it, so re-runs read from disk
+and never touch the network.
+
+    client = PokeAPIClient()
+    urls = [entry["url"] for entry in client.list_resources("pokemon", 1302)]
+    for url, data in zip(urls, client.fetch_many(urls)):
+        ...
+
+base_url can point at any server with the same layout, e.g. a local stub.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Sequence, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://pokeapi.co/api/v2/"
+DEFAULT_CACHE_DIR = ".pokeapi_cache"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate: Optional[float]):
+        """
+        Args:
+            rate: Maximum calls per second; None or 0 for no limit
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class ResponseCache:
+    """
+    Content-addressed store of response bodies.
+
+    objects/<sha256 of body> holds each distinct body once;
+    refs/<sha256 of URL> holds the object hash for a URL.
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "refs"), exist_ok=True)
+
+    def _ref_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.root, "refs", key)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Get the cached body for a URL, or None."""
+        try:
+            with open(self._ref_path(url)) as ref:
+                digest = ref.read().strip()
+            with open(self._object_path(digest), "rb") as obj:
+                return obj.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url: str, body: bytes) -> str:
+        """Store a body for a URL; returns its content hash."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            self._write_atomic(path, body)
+        self._write_atomic(self._ref_path(url), digest.encode())
+        return digest
+
+    def _write_atomic(self, path: str, data: bytes):
+        """Write via a temp file and rename, so readers never see partial files."""
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+class PokeAPIClient:
+    """Cached, rate-limited, concurrent fetcher for PokeAPI and its sprites."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        workers: int = 16,
+        rate_limit: Optional[float] = 50.0,
+        retries: int = 4,
+        backoff: float = 0.5,
+        timeout: float = 15.0,
+        offline: bool = False,
+    ):
+        """
+        Args:
+            base_url: API root; relative paths are resolved against it
+            cache_dir: Response cache directory; None disables the cache
+            workers: Concurrent requests (thread pool and connection pool size)
+            rate_limit: Maximum requests per second across all workers
+            retries: Extra attempts after a failed request
+            backoff: Initial retry delay in seconds, doubled per attempt
+            timeout: Per-request timeout in seconds
+            offline: Serve from the cache only; a miss raises LookupError
+        """
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.offline = offline
+        self.limiter = RateLimiter(rate_limit)
+
+        self.requests_made = 0
+        self.cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path: str) -> str:
+        """Resolve a path like "pokemon/25" against base_url."""
+        if path.startswith(("http://", "https://")):
+            return path
+        return self.base_url + path.lstrip("/")
+
+    def get_bytes(self, path: str) -> bytes:
+        """Fetch one response body, from the cache when possible."""
+        url = self.url(path)
+        if self.cache is not None:
+            body = self.cache.get(url)
+            if body is not None:
+                with self._stats_lock:
+                    self.cache_hits += 1
+                return body
+        if self.offline:
+            raise LookupError(f"{url} is not cached")
+
+        body = self._fetch(url)
+        if self.cache is not None:
+            self.cache.put(url, body)
+        return body
+
+    def get_json(self, path: str) -> Any:
+        """Fetch one resource, from the cache when possible."""
+        return json.loads(self.get_bytes(path))
+
+    def _fetch(self, url: str) -> bytes:
+        """GET with rate limiting and exponential backoff."""
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            with self._stats_lock:
+                self.requests_made += 1
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.content
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            time.sleep(delay)
+            delay *= 2
+        raise RuntimeError("unreachable")
+
+    def fetch_many(
+        self, paths: Sequence[str], return_exceptions: bool = True, raw: bool = False
+    ) -> list[Union[Any, Exception]]:
+        """
+        Fetch many resources concurrently, in input order.
+
+        Args:
+            paths: Paths or full URLs
+            return_exceptions: Put a failed resource's exception in its slot
+                               instead of raising it
+            raw: Return response bodies as bytes instead of parsing JSON
+
+        Returns:
+            Parsed JSON or bytes (or an exception) per path
+        """
+        get = self.get_bytes if raw else self.get_json
+
+        def fetch(path: str):
+            try:
+                return get(path)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(fetch, paths))
+
+    def list_resources(self, resource: str, limit: int) -> list[dict]:
+        """Get the named-resource listing, e.g. list_resources("pokemon", 1302)."""
+        return self.get_json(f"{resource}?limit={limit}")["results"]
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self) -> "PokeAPIClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return f"PokeAPIClient({self.base_url}, {self.requests_made} requests, {self.cache_hits} cache hits)"
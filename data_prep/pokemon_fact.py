@@ -1,19 +1,13 @@
-import requests
+import argparse
 import sqlite3
+import time
+from pokeapi import DEFAULT_BASE_URL, DEFAULT_CACHE_DIR, PokeAPIClient
+from schema import ensure_pokemon_schema
 
-# Create or connect to the SQLite database
-connection = sqlite3.connect("pkmn_battle_station.db")
-cursor = connection.cursor()
+POKEMON_COUNT = 1302
 
-
-# Function to fetch data from a given URL
-response = requests.get("https://pokeapi.co/api/v2/pokemon?limit=1302")
-data = response.json()
-pokemon_list = data["results"]
-for pokemon in pokemon_list:
-    url = pokemon["url"]
-
-    pokemon_data = requests.get(url).json()
+def parse_pokemon(pokemon_data: dict) -> tuple:
+    """Turn a PokeAPI pokemon resource into a pokemon_fact row."""
     pokemon_id = pokemon_data["id"]
     pokemon_name = pokemon_data["name"]
     # Extract types
@@ -34,33 +28,86 @@ for pokemon in pokemon_list:
     speed = stats.get("speed", 0)
 
     # Extract sprite URL (front default)
-    sprite_url = pokemon_data.get("sprites", {}).get("front_default", None)
+    sprite_url = (pokemon_data.get("sprites") or {}).get("front_default")
 
-    # Insert data into the database
-    cursor.execute(
-        """
-        INSERT OR REPLACE INTO pokemon_fact (
-            id, name, type1, type2, hp, attack, defense, special_attack,
-            special_defense, speed, sprite_url
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            pokemon_id,
-            pokemon_name,
-            type1,
-            type2,
-            hp,
-            attack,
-            defense,
-            sp_atk,
-            sp_def,
-            speed,
-            sprite_url,
-        ),
+    return (
+        pokemon_id,
+        pokemon_name,
+        type1,
+        type2,
+        hp,
+        attack,
+        defense,
+        sp_atk,
+        sp_def,
+        speed,
+        sprite_url,
     )
 
-    print(f"Inserted/Updated {pokemon_name} (ID: {pokemon_id})")
 
-# Commit changes and close the connection
-connection.commit()
-connection.close()
+def load_pokemon(
+    db_path: str = "pkmn_battle_station.db",
+    client: PokeAPIClient = None,
+    limit: int = POKEMON_COUNT,
+) -> int:
+    """
+    Fetch every Pokemon concurrently and write pokemon_fact in one transaction.
+
+    Returns:
+        Number of rows written
+    """
+    client = client or PokeAPIClient()
+    pokemon_list = client.list_resources("pokemon", limit)
+    urls = [pokemon["url"] for pokemon in pokemon_list]
+
+    rows = []
+    for pokemon, pokemon_data in zip(pokemon_list, client.fetch_many(urls)):
+        if isinstance(pokemon_data, Exception):
+            print(f"Error fetching {pokemon['name']}: {pokemon_data}")
+            continue
+        rows.append(parse_pokemon(pokemon_data))
+
+    # Create or connect to the SQLite database
+    connection = sqlite3.connect(db_path)
+    with connection:
+        ensure_pokemon_schema(connection)
+        connection.executemany(
+            """
+            INSERT OR REPLACE INTO pokemon_fact (
+                id, name, type1, type2, hp, attack, defense, special_attack,
+                special_defense, speed, sprite_url
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+    connection.close()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load pokemon_fact from PokeAPI.")
+    parser.add_argument("--db", default="pkmn_battle_station.db")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Always hit the network")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="Requests per second")
+    parser.add_argument("--limit", type=int, default=POKEMON_COUNT)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with PokeAPIClient(
+        args.base_url,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        workers=args.workers,
+        rate_limit=args.rate_limit,
+    ) as client:
+        count = load_pokemon(args.db, client, args.limit)
+        print(
+            f"Inserted/Updated {count} Pokemon in {time.perf_counter() - start:.1f}s "
+            f"({client.requests_made} requests, {client.cache_hits} cache hits)"
+        )
+
+
+if __name__ == "__main__":
+    main()
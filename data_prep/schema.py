@@ -0,0 +1,88 @@
+"""
+The database schema, applied from create_tables.sql only.
+
+Scripts that may create tables call apply_schema() instead of carrying
+their own DDL, so create_tables.sql stays the single definition. Upgrades
+for databases created before a column existed live here too, one
+ensure_*_schema() per table, and upgrade_schema() runs them all. Only the
+standard library is imported here, so the app, tournament and benchmark
+code import this module as data_prep.schema.
+"""
+
+import os
+import sqlite3
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "create_tables.sql")
+
+# pokemon_fact's stat total; create_tables.sql spells out the same sum
+TOTAL_EXPRESSION = "hp + attack + defense + special_attack + special_defense + speed"
+
+
+def ensure_pokemon_schema(conn: sqlite3.Connection):
+    """
+    Bring pokemon_fact in databases created before the total column up to date.
+
+    ALTER TABLE cannot add a STORED generated column, so older databases get
+    a VIRTUAL one; it is computed on read but can be indexed all the same.
+    Does nothing if pokemon_fact does not exist yet.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(pokemon_fact)")}
+    if not columns:
+        return
+    if "total" not in columns:
+        conn.execute(
+            f"ALTER TABLE pokemon_fact ADD COLUMN total INTEGER "
+            f"GENERATED ALWAYS AS ({TOTAL_EXPRESSION}) VIRTUAL"
+        )
+    for column in ("type1", "type2", "total"):
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_pokemon_fact_{column} ON pokemon_fact ({column})"
+        )
+
+
+def ensure_results_schema(conn: sqlite3.Connection):
+    """
+    Bring battle_results in databases created before the config columns up to date.
+
+    Does nothing if battle_results does not exist yet.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(battle_results)")}
+    if not columns:
+        return
+    for column in ("pokemon1_config", "pokemon2_config"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE battle_results ADD COLUMN {column} TEXT")
+    create_pair_index(conn)
+
+
+def create_pair_index(conn: sqlite3.Connection):
+    """Index battle_results by pair, for incremental runs' lookups and deletes."""
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_battle_results_pair
+           ON battle_results (pokemon1_name, pokemon2_name)"""
+    )
+
+
+def ensure_rankings_schema(conn: sqlite3.Connection):
+    """
+    Add pokemon_rankings.bt_rating to databases created before it existed.
+
+    Does nothing if pokemon_rankings does not exist yet.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(pokemon_rankings)")}
+    if columns and "bt_rating" not in columns:
+        conn.execute("ALTER TABLE pokemon_rankings ADD COLUMN bt_rating REAL DEFAULT 1500.0")
+
+
+def upgrade_schema(conn: sqlite3.Connection):
+    """Bring every existing table up to date, without creating missing ones."""
+    ensure_pokemon_schema(conn)
+    ensure_results_schema(conn)
+    ensure_rankings_schema(conn)
+
+
+def apply_schema(conn: sqlite3.Connection, schema_path: str = SCHEMA_PATH):
+    """Upgrade tables from older versions, then create anything missing."""
+    upgrade_schema(conn)
+    with open(schema_path) as sql_file:
+        conn.executescript(sql_file.read())
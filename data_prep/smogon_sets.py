@@ -26,9 +26,9 @@ NATURES = {
 }
 
 
-def get_pokemon_from_db():
+def get_pokemon_from_db(db_path: str = "pkmn_battle_station.db"):
     """Get all Pokemon names from the database."""
-    conn = sqlite3.connect("pkmn_battle_station.db")
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute("SELECT name FROM pokemon_fact ORDER BY name")
     pokemon_names = [row[0] for row in cursor.fetchall()]
@@ -48,180 +48,244 @@ def fetch_showdown_data():
         return {}
 
 
+# Names whose PokeAPI form differs from the stripped Showdown key
+SPECIAL_CASES = {
+    "mrrime": "mr-rime",
+    "mrmime": "mr-mime",
+    "mimikyutotem": "mimikyu-totem",
+    "typeNull": "type-null",
+    "tapukoko": "tapu-koko",
+    "tapulele": "tapu-lele",
+    "tapubulu": "tapu-bulu",
+    "tapufini": "tapu-fini",
+}
+
+
 def normalize_pokemon_name(name: str) -> str:
     """Normalize Pokemon name for matching."""
     # Remove special characters and convert to lowercase
     name = name.lower().replace(" ", "").replace("-", "").replace("'", "")
 
     # Handle special cases
-    special_cases = {
-        "mrrime": "mr-rime",
-        "mrmime": "mr-mime",
-        "mimikyutotem": "mimikyu-totem",
-        "typeNull": "type-null",
-        "tapukoko": "tapu-koko",
-        "tapulele": "tapu-lele",
-        "tapubulu": "tapu-bulu",
-        "tapufini": "tapu-fini",
-    }
-
-    return special_cases.get(name, name)
+    return SPECIAL_CASES.get(name, name)
 
 
-def generate_competitive_set(
-    pokemon_name: str, showdown_data: Dict
-) -> Optional[Dict[str, Any]]:
+def build_dex_index(showdown_data: Dict) -> Dict[str, Dict]:
     """
-    Generate a competitive moveset based on Pokemon stats and common strategies.
-    This is a simplified version - ideally would use actual Smogon usage stats.
-    """
-    # Normalize name for showdown lookup
-    normalized_name = normalize_pokemon_name(pokemon_name)
+    Index Showdown dex entries by normalized name.
 
-    # Try to find in Showdown data
-    showdown_entry = None
+    When several keys normalize to the same name, the first one in the dex
+    wins, as with the old linear scan.
+    """
+    index = {}
     for key, value in showdown_data.items():
-        if normalize_pokemon_name(key) == normalized_name:
-            showdown_entry = value
-            break
+        index.setdefault(normalize_pokemon_name(key), value)
+    return index
 
-    if not showdown_entry:
-        return None
 
-    # Get Pokemon stats
-    conn = sqlite3.connect("pkmn_battle_station.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT attack, defense, special_attack, special_defense, speed, type1, type2
-           FROM pokemon_fact WHERE name = ?""",
-        (pokemon_name,),
-    )
-    result = cursor.fetchone()
+class SetGenerator:
+    """
+    Generates competitive sets from in-memory indexes.
+
+    The Showdown dex is indexed by normalized name, and pokemon_fact stats,
+    moves_dim names and each type's damaging moves are read once up front,
+    so generating a set runs no queries at all.
+    """
 
-    if not result:
+    def __init__(self, showdown_data: Dict, db_path: str = "pkmn_battle_station.db"):
+        """
+        Args:
+            showdown_data: Showdown pokedex JSON
+            db_path: Path to SQLite database
+        """
+        self.dex = build_dex_index(showdown_data)
+
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT name, attack, defense, special_attack, special_defense, speed, type1, type2
+               FROM pokemon_fact"""
+        )
+        self.stats = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        cursor.execute("SELECT name FROM moves_dim")
+        self.move_names = {row[0] for row in cursor.fetchall()}
+
+        # type -> [(power, rowid, name)] of damaging moves, strongest first
+        self.moves_by_type: Dict[str, list] = {}
+        cursor.execute(
+            """SELECT type, power, rowid, name FROM moves_dim
+               WHERE damage_class IN ('physical', 'special') AND power IS NOT NULL"""
+        )
+        for move_type, power, rowid, name in cursor.fetchall():
+            self.moves_by_type.setdefault(move_type, []).append((power, rowid, name))
+        for moves in self.moves_by_type.values():
+            moves.sort(key=lambda move: (-move[0], move[1]))
         conn.close()
-        return None
-
-    atk, defense, sp_atk, sp_def, speed, type1, type2 = result
-
-    # Determine if physical or special attacker
-    is_physical = atk > sp_atk
-
-    # Get common moves for this Pokemon from showdown
-    move_pool = showdown_entry.get("randomBattleMoves", [])
-    if not move_pool:
-        move_pool = showdown_entry.get("moves", [])[:4]
-
-    # Ensure moves exist in our moves_dim table
-    valid_moves = []
-    for move in move_pool[:8]:  # Get up to 8 potential moves to find 4 valid ones
-        # Try different name formats
-        move_variants = [
-            move.lower().replace(" ", "-"),
-            move.lower().replace(" ", ""),
-            move.lower(),
-        ]
-
-        for move_name in move_variants:
-            cursor.execute("SELECT name FROM moves_dim WHERE name = ?", (move_name,))
-            result = cursor.fetchone()
-            if result:
-                valid_moves.append(result[0])
-                break
 
-        if len(valid_moves) >= 4:
-            break
-
-    # If still not enough, get ANY moves that match the types
-    if len(valid_moves) < 4:
-        type_moves_query = """
-            SELECT name FROM moves_dim 
-            WHERE type IN (?, ?) 
-            AND damage_class IN ('physical', 'special')
-            AND power IS NOT NULL
-            ORDER BY power DESC
-            LIMIT 4
+    def strongest_moves(self, type1: str, type2: Optional[str], limit: int = 4) -> list:
+        """Highest-power damaging moves of either type."""
+        candidates = list(self.moves_by_type.get(type1, []))
+        if type2 and type2 != type1:
+            candidates.extend(self.moves_by_type.get(type2, []))
+            candidates.sort(key=lambda move: (-move[0], move[1]))
+        return [name for _, _, name in candidates[:limit]]
+
+    def generate(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Generate a competitive moveset based on Pokemon stats and common strategies.
+        This is a simplified version - ideally would use actual Smogon usage stats.
         """
-        cursor.execute(type_moves_query, (type1, type2 or type1))
-        type_moves = [row[0] for row in cursor.fetchall()]
+        # Find in Showdown data by normalized name
+        showdown_entry = self.dex.get(normalize_pokemon_name(pokemon_name))
+        if not showdown_entry:
+            return None
+
+        # Get Pokemon stats
+        result = self.stats.get(pokemon_name)
+        if not result:
+            return None
+
+        atk, defense, sp_atk, sp_def, speed, type1, type2 = result
+
+        # Determine if physical or special attacker
+        is_physical = atk > sp_atk
+
+        # Get common moves for this Pokemon from showdown
+        move_pool = showdown_entry.get("randomBattleMoves", [])
+        if not move_pool:
+            move_pool = showdown_entry.get("moves", [])[:4]
+
+        # Ensure moves exist in our moves_dim table
+        valid_moves = []
+        for move in move_pool[:8]:  # Get up to 8 potential moves to find 4 valid ones
+            # Try different name formats
+            move_variants = [
+                move.lower().replace(" ", "-"),
+                move.lower().replace(" ", ""),
+                move.lower(),
+            ]
+
+            for move_name in move_variants:
+                if move_name in self.move_names:
+                    valid_moves.append(move_name)
+                    break
 
-        for move in type_moves:
-            if move not in valid_moves:
-                valid_moves.append(move)
             if len(valid_moves) >= 4:
                 break
 
-    conn.close()
-
-    # If not enough moves, skip this Pokemon
-    if len(valid_moves) < 4:
-        return None
-
-    # Determine nature based on stats
-    if is_physical:
-        if speed > max(atk, defense, sp_def):
-            nature = "jolly"
+        # If still not enough, get ANY moves that match the types
+        if len(valid_moves) < 4:
+            for move in self.strongest_moves(type1, type2):
+                if move not in valid_moves:
+                    valid_moves.append(move)
+                if len(valid_moves) >= 4:
+                    break
+
+        # If not enough moves, skip this Pokemon
+        if len(valid_moves) < 4:
+            return None
+
+        # Determine nature based on stats
+        if is_physical:
+            if speed > max(atk, defense, sp_def):
+                nature = "jolly"
+            else:
+                nature = "adamant"
         else:
-            nature = "adamant"
-    else:
-        if speed > max(sp_atk, defense, sp_def):
-            nature = "timid"
+            if speed > max(sp_atk, defense, sp_def):
+                nature = "timid"
+            else:
+                nature = "modest"
+
+        # Determine EV spread (simplified)
+        if is_physical:
+            evs = {
+                "hp": 0,
+                "attack": 252,
+                "defense": 4,
+                "special_attack": 0,
+                "special_defense": 0,
+                "speed": 252,
+            }
         else:
-            nature = "modest"
-
-    # Determine EV spread (simplified)
-    if is_physical:
-        evs = {
-            "hp": 0,
-            "attack": 252,
-            "defense": 4,
-            "special_attack": 0,
-            "special_defense": 0,
-            "speed": 252,
-        }
-    else:
-        evs = {
-            "hp": 0,
-            "attack": 0,
-            "defense": 4,
-            "special_attack": 252,
-            "special_defense": 0,
-            "speed": 252,
+            evs = {
+                "hp": 0,
+                "attack": 0,
+                "defense": 4,
+                "special_attack": 252,
+                "special_defense": 0,
+                "speed": 252,
+            }
+
+        # Get ability
+        abilities = showdown_entry.get("abilities", {})
+        ability = abilities.get("0", "Unknown")
+
+        # Get tier
+        tier = showdown_entry.get("tier", "OU")
+
+        return {
+            "pokemon_name": pokemon_name,
+            "ability": ability,
+            "item": "life-orb",  # Default item
+            "nature": nature,
+            "move1": valid_moves[0] if len(valid_moves) > 0 else None,
+            "move2": valid_moves[1] if len(valid_moves) > 1 else None,
+            "move3": valid_moves[2] if len(valid_moves) > 2 else None,
+            "move4": valid_moves[3] if len(valid_moves) > 3 else None,
+            "ev_hp": evs["hp"],
+            "ev_attack": evs["attack"],
+            "ev_defense": evs["defense"],
+            "ev_special_attack": evs["special_attack"],
+            "ev_special_defense": evs["special_defense"],
+            "ev_speed": evs["speed"],
+            "usage_percent": 0.0,  # Would need actual usage stats
+            "tier": tier,
         }
 
-    # Get ability
-    abilities = showdown_entry.get("abilities", {})
-    ability = abilities.get("0", "Unknown")
-
-    # Get tier
-    tier = showdown_entry.get("tier", "OU")
-
-    return {
-        "pokemon_name": pokemon_name,
-        "ability": ability,
-        "item": "life-orb",  # Default item
-        "nature": nature,
-        "move1": valid_moves[0] if len(valid_moves) > 0 else None,
-        "move2": valid_moves[1] if len(valid_moves) > 1 else None,
-        "move3": valid_moves[2] if len(valid_moves) > 2 else None,
-        "move4": valid_moves[3] if len(valid_moves) > 3 else None,
-        "ev_hp": evs["hp"],
-        "ev_attack": evs["attack"],
-        "ev_defense": evs["defense"],
-        "ev_special_attack": evs["special_attack"],
-        "ev_special_defense": evs["special_defense"],
-        "ev_speed": evs["speed"],
-        "usage_percent": 0.0,  # Would need actual usage stats
-        "tier": tier,
-    }
-
-
-def main():
+
+def generate_competitive_set(
+    pokemon_name: str, showdown_data: Dict, generator: Optional[SetGenerator] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Generate one competitive set.
+
+    Builds a SetGenerator when none is given; reuse one to generate many sets.
+    """
+    if generator is None:
+        generator = SetGenerator(showdown_data)
+    return generator.generate(pokemon_name)
+
+
+def set_row(moveset: Dict[str, Any]) -> tuple:
+    """Order a generated set as a smogon_sets row."""
+    return (
+        moveset["pokemon_name"],
+        moveset["ability"],
+        moveset["item"],
+        moveset["nature"],
+        moveset["move1"],
+        moveset["move2"],
+        moveset["move3"],
+        moveset["move4"],
+        moveset["ev_hp"],
+        moveset["ev_attack"],
+        moveset["ev_defense"],
+        moveset["ev_special_attack"],
+        moveset["ev_special_defense"],
+        moveset["ev_speed"],
+        moveset["usage_percent"],
+        moveset["tier"],
+    )
+
+
+def main(db_path: str = "pkmn_battle_station.db"):
     """Main function to scrape and populate Smogon sets."""
     print("Starting Smogon sets scraper...")
 
     # Get Pokemon from database
-    pokemon_list = get_pokemon_from_db()
+    pokemon_list = get_pokemon_from_db(db_path)
     print(f"Found {len(pokemon_list)} Pokemon in database")
 
     # Fetch Showdown data
@@ -232,77 +296,48 @@ def main():
 
     print(f"Loaded {len(showdown_data)} Pokemon from Showdown")
 
-    # Connect to database
-    conn = sqlite3.connect("pkmn_battle_station.db")
-    cursor = conn.cursor()
+    start = time.perf_counter()
+    generator = SetGenerator(showdown_data, db_path)
 
-    successful = 0
+    rows = []
     skipped = 0
 
     for idx, pokemon_name in enumerate(pokemon_list, 1):
         try:
             # Generate competitive set
-            moveset = generate_competitive_set(pokemon_name, showdown_data)
+            moveset = generator.generate(pokemon_name)
 
             if not moveset:
                 skipped += 1
-                if idx % 100 == 0:
-                    print(
-                        f"Processed {idx}/{len(pokemon_list)} - Skipped {pokemon_name} (no data)"
-                    )
                 continue
 
-            # Insert into database
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO smogon_sets (
-                    pokemon_name, ability, item, nature,
-                    move1, move2, move3, move4,
-                    ev_hp, ev_attack, ev_defense,
-                    ev_special_attack, ev_special_defense, ev_speed,
-                    usage_percent, tier
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    moveset["pokemon_name"],
-                    moveset["ability"],
-                    moveset["item"],
-                    moveset["nature"],
-                    moveset["move1"],
-                    moveset["move2"],
-                    moveset["move3"],
-                    moveset["move4"],
-                    moveset["ev_hp"],
-                    moveset["ev_attack"],
-                    moveset["ev_defense"],
-                    moveset["ev_special_attack"],
-                    moveset["ev_special_defense"],
-                    moveset["ev_speed"],
-                    moveset["usage_percent"],
-                    moveset["tier"],
-                ),
-            )
-
-            successful += 1
-
-            # Print progress every 100 Pokemon
-            if idx % 100 == 0:
-                print(
-                    f"Processed {idx}/{len(pokemon_list)} - Success: {successful}, Skipped: {skipped}"
-                )
-                conn.commit()
+            rows.append(set_row(moveset))
 
         except Exception as e:
             print(f"Error processing {pokemon_name}: {e}")
             skipped += 1
             continue
 
-    # Final commit
-    conn.commit()
+    # Insert every set in one transaction
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO smogon_sets (
+                pokemon_name, ability, item, nature,
+                move1, move2, move3, move4,
+                ev_hp, ev_attack, ev_defense,
+                ev_special_attack, ev_special_defense, ev_speed,
+                usage_percent, tier
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
     conn.close()
+    successful = len(rows)
 
     print(f"\n{'='*60}")
-    print(f"Scraping complete!")
+    print(f"Scraping complete in {time.perf_counter() - start:.2f}s!")
     print(f"Successfully added: {successful} Pokemon")
     print(f"Skipped: {skipped} Pokemon")
     print(f"Total processed: {len(pokemon_list)}")
@@ -0,0 +1,103 @@
+"""
+Local, content-addressed sprite storage inside the database.
+
+Each distinct image is stored once in sprite_blobs under the SHA-256 of its
+bytes, next to a pre-rendered thumbnail; pokemon_sprites maps Pokemon IDs
+to it. The Streamlit pages read these blobs through components.data, so
+they work offline and never make the browser fetch remote sprites.
+"""
+
+import hashlib
+import io
+import sqlite3
+from typing import Iterable, Optional
+from schema import apply_schema
+
+try:
+    from PIL import Image
+except ImportError:  # Thumbnails are skipped without Pillow
+    Image = None
+
+THUMBNAIL_SIZE = (96, 96)
+
+
+def make_thumbnail(image: bytes, size: tuple[int, int] = THUMBNAIL_SIZE) -> Optional[bytes]:
+    """
+    Crop away transparent padding and shrink to fit `size`, as optimized PNG.
+
+    Returns None without Pillow or for unreadable images.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(image)) as source:
+            picture = source.convert("RGBA")
+    except Exception:
+        return None
+    bbox = picture.getchannel("A").getbbox()
+    if bbox:
+        picture = picture.crop(bbox)
+    picture.thumbnail(size)
+    out = io.BytesIO()
+    picture.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+class SpriteStore:
+    """Writes downloaded sprites into sprite_blobs and pokemon_sprites."""
+
+    def __init__(self, db_path: str = "pkmn_battle_station.db", thumbnail_size: tuple[int, int] = THUMBNAIL_SIZE):
+        """
+        Args:
+            db_path: Path to SQLite database
+            thumbnail_size: Bounding box of generated thumbnails
+        """
+        self.db_path = db_path
+        self.thumbnail_size = thumbnail_size
+        conn = sqlite3.connect(db_path)
+        apply_schema(conn)
+        conn.close()
+
+    def missing(self) -> list[tuple[int, str]]:
+        """(id, sprite_url) of Pokemon whose current sprite_url is not stored yet."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            """SELECT p.id, p.sprite_url FROM pokemon_fact p
+               LEFT JOIN pokemon_sprites s ON s.pokemon_id = p.id
+               WHERE p.sprite_url IS NOT NULL AND p.sprite_url != ''
+                 AND (s.sprite_url IS NULL OR s.sprite_url != p.sprite_url)
+               ORDER BY p.id"""
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def store(self, sprites: Iterable[tuple[int, str, bytes]]) -> int:
+        """
+        Store (pokemon_id, sprite_url, image bytes) triples in one transaction.
+
+        Identical images are hashed to the same blob and stored, and
+        thumbnailed, only once.
+
+        Returns:
+            Number of Pokemon mapped
+        """
+        blobs = {}
+        mappings = []
+        for pokemon_id, url, image in sprites:
+            digest = hashlib.sha256(image).hexdigest()
+            if digest not in blobs:
+                blobs[digest] = (digest, image, make_thumbnail(image, self.thumbnail_size))
+            mappings.append((pokemon_id, url, digest))
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO sprite_blobs (sha256, image, thumbnail) VALUES (?, ?, ?)",
+                blobs.values(),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO pokemon_sprites (pokemon_id, sprite_url, sha256) VALUES (?, ?, ?)",
+                mappings,
+            )
+        conn.close()
+        return len(mappings)
@@ -1,48 +1,87 @@
 """
-Update sprite URLs for existing Pokemon in the database.
+Update sprite URLs for existing Pokemon in the database, then download the
+sprites themselves into the local sprite store.
 """
 
-import requests
+import argparse
 import sqlite3
 import time
+from pokeapi import DEFAULT_BASE_URL, DEFAULT_CACHE_DIR, PokeAPIClient
+from sprite_store import SpriteStore
 
-conn = sqlite3.connect("pkmn_battle_station.db")
-cursor = conn.cursor()
 
-# Get all Pokemon without sprite URLs
-cursor.execute(
-    "SELECT id, name FROM pokemon_fact WHERE sprite_url IS NULL OR sprite_url = ''"
-)
-pokemon_list = cursor.fetchall()
+def update_sprite_urls(db_path: str, client: PokeAPIClient) -> int:
+    """Fill in sprite_url for Pokemon that have none, fetching concurrently."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
 
-print(f"Updating sprite URLs for {len(pokemon_list)} Pokemon...")
+    # Get all Pokemon without sprite URLs
+    cursor.execute(
+        "SELECT id, name FROM pokemon_fact WHERE sprite_url IS NULL OR sprite_url = ''"
+    )
+    pokemon_list = cursor.fetchall()
+    print(f"Updating sprite URLs for {len(pokemon_list)} Pokemon...")
 
-for idx, (poke_id, poke_name) in enumerate(pokemon_list, 1):
-    try:
-        # Fetch from PokeAPI
-        url = f"https://pokeapi.co/api/v2/pokemon/{poke_id}"
-        response = requests.get(url)
-        response.raise_for_status()
+    updates = []
+    results = client.fetch_many([f"pokemon/{poke_id}" for poke_id, _ in pokemon_list])
+    for (poke_id, poke_name), data in zip(pokemon_list, results):
+        if isinstance(data, Exception):
+            print(f"Error updating {poke_name}: {data}")
+            continue
+        sprite_url = (data.get("sprites") or {}).get("front_default")
+        if sprite_url:
+            updates.append((sprite_url, poke_id))
 
-        data = response.json()
-        sprite_url = data.get("sprites", {}).get("front_default", None)
+    with conn:
+        conn.executemany("UPDATE pokemon_fact SET sprite_url = ? WHERE id = ?", updates)
+    conn.close()
+    return len(updates)
 
-        # Update database
-        cursor.execute(
-            "UPDATE pokemon_fact SET sprite_url = ? WHERE id = ?", (sprite_url, poke_id)
-        )
 
-        if idx % 50 == 0:
-            print(f"Processed {idx}/{len(pokemon_list)}...")
-            conn.commit()
+def download_sprites(db_path: str, client: PokeAPIClient) -> int:
+    """Download every sprite not stored yet and store it with its thumbnail."""
+    store = SpriteStore(db_path)
+    missing = store.missing()
+    print(f"Downloading {len(missing)} sprites...")
 
-        # Rate limiting
-        time.sleep(0.1)
+    downloaded = []
+    images = client.fetch_many([url for _, url in missing], raw=True)
+    for (poke_id, url), image in zip(missing, images):
+        if isinstance(image, Exception):
+            print(f"Error downloading sprite for #{poke_id}: {image}")
+            continue
+        downloaded.append((poke_id, url, image))
 
-    except Exception as e:
-        print(f"Error updating {poke_name}: {e}")
-        continue
+    return store.store(downloaded)
 
-conn.commit()
-conn.close()
-print(f"\nCompleted! Updated {len(pokemon_list)} Pokemon sprite URLs.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill in sprite URLs and download sprites.")
+    parser.add_argument("--db", default="pkmn_battle_station.db")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="Requests per second")
+    parser.add_argument("--urls-only", action="store_true", help="Skip downloading images")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with PokeAPIClient(
+        args.base_url, cache_dir=args.cache_dir, workers=args.workers, rate_limit=args.rate_limit
+    ) as client:
+        updated = update_sprite_urls(args.db, client)
+        print(f"Updated {updated} Pokemon sprite URLs.")
+
+    if not args.urls_only:
+        # Sprites live in the database, so skip the response cache for them
+        with PokeAPIClient(
+            args.base_url, cache_dir=None, workers=args.workers, rate_limit=args.rate_limit
+        ) as client:
+            stored = download_sprites(args.db, client)
+            print(f"Stored {stored} sprites.")
+
+    print(f"\nCompleted in {time.perf_counter() - start:.1f}s!")
+
+
+if __name__ == "__main__":
+    main()
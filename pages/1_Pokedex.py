@@ -3,40 +3,18 @@ Pokedex Page - Browse and explore all Pokemon
 """
 
 import streamlit as st
-import sqlite3
 import pandas as pd
+from components.data import PokedexFilter, get_store
 
 st.set_page_config(page_title="Pokedex", page_icon="📖", layout="wide")
 
 st.title("📖 Pokedex")
 st.markdown("Browse and explore all Pokemon in the database")
 
-# Connect to database
-conn = sqlite3.connect("data_prep/pkmn_battle_station.db")
-
-# Get Pokemon data
-query = """
-SELECT 
-    id,
-    name,
-    type1,
-    type2,
-    hp,
-    attack,
-    defense,
-    special_attack,
-    special_defense,
-    speed,
-    sprite_url,
-    (hp + attack + defense + special_attack + special_defense + speed) as total
-FROM pokemon_fact
-ORDER BY id
-"""
-
-df = pd.read_sql_query(query, conn)
-conn.close()
+store = get_store()
+pokemon_count = store.count("pokemon_fact") if store.exists() else 0
 
-if df.empty:
+if not pokemon_count:
     st.error(
         "No Pokemon found in database. Please run `python data_prep/pokemon_fact.py` first."
     )
@@ -46,35 +24,27 @@ if df.empty:
 st.sidebar.header("🔍 Filters")
 
 # Type filter
-all_types = set(df["type1"].tolist() + df["type2"].dropna().tolist())
-all_types = sorted([t for t in all_types if t])
+all_types = store.pokemon_types()
 selected_types = st.sidebar.multiselect("Filter by Type", all_types)
 
-# Stat range filters
+# Stat range filters; custom species may go past the usual 800
 st.sidebar.subheader("Stat Ranges")
-min_total = st.sidebar.slider("Minimum Total Stats", 0, 800, 0)
-max_total = st.sidebar.slider("Maximum Total Stats", 0, 800, 800)
+stat_ceiling = max(800, store.pokedex_summary()["max_total"] or 0)
+min_total = st.sidebar.slider("Minimum Total Stats", 0, stat_ceiling, 0)
+max_total = st.sidebar.slider("Maximum Total Stats", 0, stat_ceiling, stat_ceiling)
 
 # Search by name
 search_query = st.sidebar.text_input("🔎 Search by name", "")
 
-# Apply filters
-filtered_df = df.copy()
-
-if selected_types:
-    filtered_df = filtered_df[
-        filtered_df["type1"].isin(selected_types)
-        | filtered_df["type2"].isin(selected_types)
-    ]
-
-filtered_df = filtered_df[
-    (filtered_df["total"] >= min_total) & (filtered_df["total"] <= max_total)
-]
-
-if search_query:
-    filtered_df = filtered_df[
-        filtered_df["name"].str.contains(search_query.lower(), case=False)
-    ]
+# Filters are applied by SQLite, not on a DataFrame of every Pokemon
+filters = PokedexFilter(
+    types=tuple(selected_types),
+    min_total=min_total,
+    max_total=max_total,
+    search=search_query,
+)
+summary = store.pokedex_summary(filters)
+match_count = summary["count"]
 
 # Sort options
 sort_by = st.sidebar.selectbox(
@@ -105,34 +75,87 @@ sort_mapping = {
 }
 
 sort_order = st.sidebar.radio("Order", ["Ascending", "Descending"])
-filtered_df = filtered_df.sort_values(
-    by=sort_mapping[sort_by], ascending=(sort_order == "Ascending")
-)
+sort_args = dict(sort=sort_mapping[sort_by], descending=(sort_order == "Descending"))
 
 # Display stats
-st.markdown(f"### Showing {len(filtered_df)} of {len(df)} Pokemon")
+st.markdown(f"### Showing {match_count} of {pokemon_count} Pokemon")
 
 # Display mode
 display_mode = st.radio("Display Mode", ["Cards", "Table"], horizontal=True)
 
 if display_mode == "Cards":
-    # Card view
+    # Card view, one page at a time so only the visible cards (and their
+    # sprites) are built
     cols_per_row = 3
-    rows = len(filtered_df) // cols_per_row + (
-        1 if len(filtered_df) % cols_per_row else 0
+    page_size = st.sidebar.selectbox("Cards per page", [12, 24, 48, 96], index=1)
+    page_count = max(1, -(-match_count // page_size))
+
+    # Back to the first page whenever the filters, sort or page size change
+    view_key = (
+        tuple(selected_types),
+        min_total,
+        max_total,
+        search_query,
+        sort_by,
+        sort_order,
+        page_size,
     )
+    if st.session_state.get("pokedex_view") != view_key:
+        st.session_state["pokedex_view"] = view_key
+        st.session_state["pokedex_page"] = 1
+    st.session_state["pokedex_page"] = min(st.session_state["pokedex_page"], page_count)
+
+    def show_pager(position: str):
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        page = st.session_state["pokedex_page"]
+        with prev_col:
+            if st.button(
+                "◀ Previous",
+                key=f"pokedex_prev_{position}",
+                disabled=page <= 1,
+                use_container_width=True,
+            ):
+                st.session_state["pokedex_page"] = page - 1
+                st.rerun()
+        with info_col:
+            st.markdown(
+                f"<div style='text-align: center'>Page {page} of {page_count}</div>",
+                unsafe_allow_html=True,
+            )
+        with next_col:
+            if st.button(
+                "Next ▶",
+                key=f"pokedex_next_{position}",
+                disabled=page >= page_count,
+                use_container_width=True,
+            ):
+                st.session_state["pokedex_page"] = page + 1
+                st.rerun()
+
+    show_pager("top")
+
+    # Locally stored sprites, served by Streamlit instead of fetched remotely
+    thumbnails = store.thumbnails()
+
+    # Only the rows for this page are fetched
+    start = (st.session_state["pokedex_page"] - 1) * page_size
+    page_df = store.pokedex_page(filters, limit=page_size, offset=start, **sort_args)
+    rows = len(page_df) // cols_per_row + (1 if len(page_df) % cols_per_row else 0)
 
     for row in range(rows):
         cols = st.columns(cols_per_row)
         for col_idx in range(cols_per_row):
             idx = row * cols_per_row + col_idx
-            if idx < len(filtered_df):
-                pokemon = filtered_df.iloc[idx]
+            if idx < len(page_df):
+                pokemon = page_df.iloc[idx]
 
                 with cols[col_idx]:
                     with st.container(border=True):
                         # Pokemon sprite
-                        if pd.notna(pokemon["sprite_url"]):
+                        thumbnail = thumbnails.get(int(pokemon["id"]))
+                        if thumbnail is not None:
+                            st.image(thumbnail, width=150)
+                        elif pd.notna(pokemon["sprite_url"]):
                             st.image(pokemon["sprite_url"], width=150)
                         else:
                             st.write("No image")
@@ -182,9 +205,11 @@ if display_mode == "Cards":
                             st.query_params["pokemon"] = pokemon["name"]
                             st.switch_page("pages/3_Pokemon_Details.py")
 
+    show_pager("bottom")
+
 else:
     # Table view
-    display_df = filtered_df.copy()
+    display_df = store.pokedex_page(filters, **sort_args).copy()
     display_df["name"] = display_df["name"].str.title()
     display_df["type1"] = display_df["type1"].str.title()
     display_df["type2"] = display_df["type2"].str.title()
@@ -246,16 +271,16 @@ st.subheader("📊 Statistics")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Pokemon", len(filtered_df))
+    st.metric("Total Pokemon", match_count)
 
-with col2:
-    avg_total = filtered_df["total"].mean()
-    st.metric("Average Total Stats", f"{avg_total:.1f}")
+if match_count:
+    with col2:
+        st.metric("Average Total Stats", f"{summary['avg_total']:.1f}")
 
-with col3:
-    highest = filtered_df.loc[filtered_df["total"].idxmax()]
-    st.metric("Highest Total", f"{highest['name'].title()}", f"{int(highest['total'])}")
+    with col3:
+        name, total = summary["highest"]
+        st.metric("Highest Total", f"{name.title()}", f"{total}")
 
-with col4:
-    lowest = filtered_df.loc[filtered_df["total"].idxmin()]
-    st.metric("Lowest Total", f"{lowest['name'].title()}", f"{int(lowest['total'])}")
+    with col4:
+        name, total = summary["lowest"]
+        st.metric("Lowest Total", f"{name.title()}", f"{total}")
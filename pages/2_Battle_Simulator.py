@@ -1,12 +1,17 @@
 """
 Interactive Battle Simulator Page
 Watch two Pokemon fight in real-time!
+
+The battle runs through Battle.iter_turns() and the log is streamed as it
+goes: each turn appends one text element holding only that turn's lines,
+rather than rewriting a single placeholder with the whole log so far, so
+output grows linearly with the battle's length.
 """
 
 import streamlit as st
-import sqlite3
-from core.pokemon import Pokemon
+from components.data import get_store
 from core.battle import Battle
+from core.battle_log import LogRenderer
 
 st.set_page_config(page_title="Battle Simulator", page_icon="⚔️", layout="wide")
 
@@ -14,11 +19,8 @@ st.title("⚔️ Battle Simulator")
 st.markdown("Select two Pokemon and watch them battle!")
 
 # Get list of Pokemon
-conn = sqlite3.connect("data_prep/pkmn_battle_station.db")
-cursor = conn.cursor()
-cursor.execute("SELECT name FROM pokemon_fact ORDER BY name")
-pokemon_names = [row[0] for row in cursor.fetchall()]
-conn.close()
+store = get_store()
+pokemon_names = store.pokemon_names()
 
 if not pokemon_names:
     st.error("No Pokemon found in database. Please run data preparation scripts.")
@@ -44,59 +46,75 @@ if st.button("⚔️ Start Battle!", type="primary", use_container_width=True):
     if pokemon1_name == pokemon2_name:
         st.warning("Please select two different Pokemon!")
     else:
-        with st.spinner("Loading Pokemon data..."):
-            try:
-                # Load Pokemon
-                pokemon1 = Pokemon(pokemon1_name)
-                pokemon2 = Pokemon(pokemon2_name)
-
-                # Display Pokemon stats before battle
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.markdown(f"### 🔴 {pokemon1.name.title()}")
-                    st.write(
-                        f"**Type:** {pokemon1.type1.title()}"
-                        + (f" / {pokemon1.type2.title()}" if pokemon1.type2 else "")
-                    )
-                    st.write(f"**HP:** {pokemon1.max_hp}")
-                    st.write(f"**Attack:** {pokemon1.attack}")
-                    st.write(f"**Defense:** {pokemon1.defense}")
-                    st.write(f"**Sp. Atk:** {pokemon1.special_attack}")
-                    st.write(f"**Sp. Def:** {pokemon1.special_defense}")
-                    st.write(f"**Speed:** {pokemon1.speed}")
-
-                    if pokemon1.moves:
-                        st.write("**Moves:**")
-                        for move in pokemon1.moves:
-                            st.write(f"  - {move.name.title()}")
-
-                with col2:
-                    st.markdown(f"### 🔵 {pokemon2.name.title()}")
-                    st.write(
-                        f"**Type:** {pokemon2.type1.title()}"
-                        + (f" / {pokemon2.type2.title()}" if pokemon2.type2 else "")
-                    )
-                    st.write(f"**HP:** {pokemon2.max_hp}")
-                    st.write(f"**Attack:** {pokemon2.attack}")
-                    st.write(f"**Defense:** {pokemon2.defense}")
-                    st.write(f"**Sp. Atk:** {pokemon2.special_attack}")
-                    st.write(f"**Sp. Def:** {pokemon2.special_defense}")
-                    st.write(f"**Speed:** {pokemon2.speed}")
-
-                    if pokemon2.moves:
-                        st.write("**Moves:**")
-                        for move in pokemon2.moves:
-                            st.write(f"  - {move.name.title()}")
-
-                st.markdown("---")
-
-                # Run battle
-                with st.spinner("Battle in progress..."):
-                    battle = Battle(pokemon1, pokemon2)
-                    winner, battle_log = battle.simulate()
-
-                # Display battle results
+        try:
+            with st.spinner("Loading Pokemon data..."):
+                # Load Pokemon from the cached catalog
+                catalog = store.catalog()
+                pokemon1 = catalog.pokemon(pokemon1_name)
+                pokemon2 = catalog.pokemon(pokemon2_name)
+
+            # Display Pokemon stats before battle
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown(f"### 🔴 {pokemon1.name.title()}")
+                st.write(
+                    f"**Type:** {pokemon1.type1.title()}"
+                    + (f" / {pokemon1.type2.title()}" if pokemon1.type2 else "")
+                )
+                st.write(f"**HP:** {pokemon1.max_hp}")
+                st.write(f"**Attack:** {pokemon1.attack}")
+                st.write(f"**Defense:** {pokemon1.defense}")
+                st.write(f"**Sp. Atk:** {pokemon1.special_attack}")
+                st.write(f"**Sp. Def:** {pokemon1.special_defense}")
+                st.write(f"**Speed:** {pokemon1.speed}")
+
+                if pokemon1.moves:
+                    st.write("**Moves:**")
+                    for move in pokemon1.moves:
+                        st.write(f"  - {move.name.title()}")
+
+            with col2:
+                st.markdown(f"### 🔵 {pokemon2.name.title()}")
+                st.write(
+                    f"**Type:** {pokemon2.type1.title()}"
+                    + (f" / {pokemon2.type2.title()}" if pokemon2.type2 else "")
+                )
+                st.write(f"**HP:** {pokemon2.max_hp}")
+                st.write(f"**Attack:** {pokemon2.attack}")
+                st.write(f"**Defense:** {pokemon2.defense}")
+                st.write(f"**Sp. Atk:** {pokemon2.special_attack}")
+                st.write(f"**Sp. Def:** {pokemon2.special_defense}")
+                st.write(f"**Speed:** {pokemon2.speed}")
+
+                if pokemon2.moves:
+                    st.write("**Moves:**")
+                    for move in pokemon2.moves:
+                        st.write(f"  - {move.name.title()}")
+
+            st.markdown("---")
+
+            # Result goes above the log, filled in once the battle ends
+            result_container = st.container()
+
+            # Battle log, streamed a turn at a time; each turn only sends
+            # its own lines, so nothing already shown is re-sent or kept
+            st.markdown("---")
+            st.subheader("📜 Battle Log")
+            log_container = st.container()
+
+            battle = Battle(pokemon1, pokemon2)
+            renderer = LogRenderer(pokemon1, pokemon2)
+            log_container.text("\n".join(renderer.header()))
+            for events in battle.iter_turns():
+                text = "\n".join(renderer.lines(events))
+                if text:
+                    log_container.text(text)
+            winner = battle.winner
+            log_container.text("\n".join(renderer.result(battle.battle_log.winner)))
+
+            # Display battle results
+            with result_container:
                 st.success(f"Battle Complete in {battle.turn} turns!")
 
                 if winner:
@@ -110,18 +128,9 @@ if st.button("⚔️ Start Battle!", type="primary", use_container_width=True):
                 else:
                     st.info("Battle ended in a draw!")
 
-                # Battle log
-                st.markdown("---")
-                st.subheader("📜 Battle Log")
-
-                log_container = st.container()
-                with log_container:
-                    for line in battle_log:
-                        st.text(line)
-
-            except Exception as e:
-                st.error(f"Error during battle: {e}")
-                st.exception(e)
+        except Exception as e:
+            st.error(f"Error during battle: {e}")
+            st.exception(e)
 
 st.markdown("---")
 st.info(
@@ -3,7 +3,7 @@ Pokemon Details Page - Detailed view of a single Pokemon
 """
 
 import streamlit as st
-import sqlite3
+from components.data import get_store
 
 st.set_page_config(page_title="Pokemon Details", page_icon="📋", layout="wide")
 
@@ -16,25 +16,13 @@ if not pokemon_name:
     st.info("Please select a Pokemon from the Pokedex.")
     st.stop()
 
-# Connect to database
-conn = sqlite3.connect("data_prep/pkmn_battle_station.db")
-cursor = conn.cursor()
+store = get_store()
 
 # Get Pokemon data
-cursor.execute(
-    """
-    SELECT id, name, hp, attack, defense, special_attack, special_defense, speed,
-           type1, type2, sprite_url
-    FROM pokemon_fact
-    WHERE name = ?
-    """,
-    (pokemon_name,),
-)
-pokemon_data = cursor.fetchone()
+pokemon_data = store.pokemon(pokemon_name)
 
 if not pokemon_data:
     st.error(f"Pokemon '{pokemon_name}' not found!")
-    conn.close()
     st.stop()
 
 (
@@ -52,25 +40,16 @@ if not pokemon_data:
 ) = pokemon_data
 
 # Get Smogon set if available
-cursor.execute(
-    """
-    SELECT ability, item, nature, move1, move2, move3, move4,
-           ev_hp, ev_attack, ev_defense, ev_special_attack, ev_special_defense, ev_speed,
-           tier
-    FROM smogon_sets
-    WHERE pokemon_name = ?
-    """,
-    (pokemon_name,),
-)
-smogon_data = cursor.fetchone()
-
-conn.close()
+smogon_data = store.smogon_set(pokemon_name)
 
 # Header with image and basic info
 col1, col2 = st.columns([1, 2])
 
 with col1:
-    if sprite_url:
+    sprite = store.sprite(poke_id)
+    if sprite is not None:
+        st.image(sprite, width=200)
+    elif sprite_url:
         st.image(sprite_url, width=200)
     else:
         st.info("No image available")
@@ -85,7 +64,7 @@ with col2:
     st.markdown(type_str)
 
     if smogon_data:
-        tier = smogon_data[12]
+        tier = smogon_data[13]
         st.markdown(f"**Tier:** {tier}")
 
 st.markdown("---")
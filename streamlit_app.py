@@ -4,8 +4,7 @@ Main entry point for the interactive application.
 """
 
 import streamlit as st
-import sqlite3
-from pathlib import Path
+from components.data import get_store
 
 # Configure page
 st.set_page_config(
@@ -49,8 +48,8 @@ st.markdown(
 )
 
 # Check if database exists
-db_path = Path("./data_prep/pkmn_battle_station.db")
-if not db_path.exists():
+store = get_store()
+if not store.exists():
     st.error("⚠️ Database not found! Please run the data preparation scripts first.")
     st.info(
         """
@@ -65,32 +64,19 @@ if not db_path.exists():
     st.stop()
 
 # Database stats
-conn = sqlite3.connect(str(db_path))
-cursor = conn.cursor()
-
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    cursor.execute("SELECT COUNT(*) FROM pokemon_fact")
-    pokemon_count = cursor.fetchone()[0]
-    st.metric("Pokemon Loaded", pokemon_count)
+    st.metric("Pokemon Loaded", store.count("pokemon_fact"))
 
 with col2:
-    cursor.execute("SELECT COUNT(*) FROM moves_dim")
-    moves_count = cursor.fetchone()[0]
-    st.metric("Moves Cached", moves_count)
+    st.metric("Moves Cached", store.count("moves_dim"))
 
 with col3:
-    cursor.execute("SELECT COUNT(*) FROM smogon_sets")
-    sets_count = cursor.fetchone()[0]
-    st.metric("Smogon Sets", sets_count)
+    st.metric("Smogon Sets", store.count("smogon_sets"))
 
 with col4:
-    cursor.execute("SELECT COUNT(*) FROM battle_results")
-    battles_count = cursor.fetchone()[0]
-    st.metric("Battles Simulated", battles_count)
-
-conn.close()
+    st.metric("Battles Simulated", store.count("battle_results"))
 
 # Main content
 st.markdown("---")
@@ -0,0 +1,27 @@
+"""
+Ratings over a tier-filtered roster.
+"""
+
+import sqlite3
+from benchmarks.fixtures import build_fixture_db
+from tournament.elo_system import update_rankings
+from tournament.incremental import run_incremental
+from tournament.round_robin import load_roster
+
+
+def test_tier_only_rates_its_own_battles(tmp_path):
+    db_path = build_fixture_db(str(tmp_path / "fixture.db"), species=30, moves=60)
+    run_incremental(db_path, workers=1)
+    update_rankings(db_path)
+
+    tier = load_roster(db_path, "OU")
+    engine = update_rankings(db_path, tier="OU")
+    battles = int((engine.wins + engine.losses + engine.draws).sum()) // 2
+    assert engine.names == tier
+    assert battles == len(tier) * (len(tier) - 1) // 2
+
+    # Rankings from the earlier, untiered pass are replaced, not left stale
+    conn = sqlite3.connect(db_path)
+    ranked = {row[0] for row in conn.execute("SELECT pokemon_name FROM pokemon_rankings")}
+    conn.close()
+    assert ranked == set(tier)
@@ -0,0 +1,134 @@
+"""
+Incremental tournaments with a process pool and the live results writer.
+
+Workers read the catalog while the writer thread holds its own connection,
+so the writer must finish its WAL switch and schema changes before any
+worker starts, and workers must not be forked from the threaded parent.
+"""
+
+import sqlite3
+from benchmarks.fixtures import build_fixture_db
+from tournament.incremental import run_incremental
+from tournament.results_writer import ResultWriter
+from tournament.round_robin import _pool_context
+
+
+def _fixture(tmp_path) -> str:
+    return build_fixture_db(str(tmp_path / "fixture.db"), species=40, moves=60)
+
+
+def test_incremental_with_workers(tmp_path):
+    db_path = _fixture(tmp_path)
+    pairs = 40 * 39 // 2
+
+    result = run_incremental(db_path, workers=2, chunk_size=100, replicates=2)
+    assert result.pairs == pairs
+    assert result.battles == pairs * 2
+
+    conn = sqlite3.connect(db_path)
+    stored = conn.execute("SELECT COUNT(*) FROM battle_results").fetchone()[0]
+    conn.close()
+    assert stored == pairs * 2
+
+    # Everything is up to date, so nothing is re-simulated
+    again = run_incremental(db_path, workers=2, chunk_size=100, replicates=2)
+    assert again.pairs == 0
+    assert again.battles == 0
+
+
+def _stored(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM battle_results").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_run_settings_are_part_of_the_key(tmp_path):
+    db_path = _fixture(tmp_path)
+    pairs = 40 * 39 // 2
+
+    run_incremental(db_path, workers=1, seed=0)
+    assert run_incremental(db_path, workers=1, seed=1).pairs == pairs
+    assert run_incremental(db_path, workers=1, seed=1, max_turns=50).pairs == pairs
+    assert run_incremental(db_path, workers=1, seed=1, max_turns=50).pairs == 0
+    assert _stored(db_path) == pairs
+
+
+def test_flipped_and_departed_rows_are_pruned(tmp_path):
+    db_path = _fixture(tmp_path)
+    pairs = 40 * 39 // 2
+    run_incremental(db_path, workers=1)
+
+    conn = sqlite3.connect(db_path)
+    name1, name2 = conn.execute(
+        "SELECT pokemon1_name, pokemon2_name FROM battle_results LIMIT 1"
+    ).fetchone()
+    conn.executemany(
+        """INSERT INTO battle_results (pokemon1_name, pokemon2_name, winner_name, turns,
+               pokemon1_hp_remaining, pokemon2_hp_remaining, pokemon1_config, pokemon2_config)
+           VALUES (?, ?, NULL, 1, 1, 1, 'old', 'old')""",
+        [(name2, name1), (name1, "missingno"), ("missingno", name2)],
+    )
+    conn.commit()
+    conn.close()
+
+    # Only the pair stored in both orders is re-simulated, and every
+    # extra row is gone
+    assert run_incremental(db_path, workers=1).pairs == 1
+    assert _stored(db_path) == pairs
+
+
+def test_tier_run_keeps_other_tiers(tmp_path):
+    db_path = _fixture(tmp_path)
+    pairs = 40 * 39 // 2
+    run_incremental(db_path, workers=1)
+
+    # Everything in the tier is already up to date, and nothing else is touched
+    assert run_incremental(db_path, workers=1, tier="OU").pairs == 0
+    assert _stored(db_path) == pairs
+    assert run_incremental(db_path, workers=1).pairs == 0
+
+
+def test_deferred_index_is_rebuilt(tmp_path):
+    db_path = _fixture(tmp_path)
+    with ResultWriter(db_path, defer_index=True) as writer:
+        writer.write([("a", "b", "a", 3, 10, 0, None, None)])
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(battle_results)")}
+        conn.close()
+
+    conn = sqlite3.connect(db_path)
+    rebuilt = {row[1] for row in conn.execute("PRAGMA index_list(battle_results)")}
+    conn.close()
+    assert "idx_battle_results_pair" not in indexes
+    assert "idx_battle_results_pair" in rebuilt
+
+
+def test_writer_ready_when_started(tmp_path):
+    db_path = _fixture(tmp_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE battle_results")
+    conn.execute(
+        """CREATE TABLE battle_results (
+               id INTEGER PRIMARY KEY AUTOINCREMENT, pokemon1_name TEXT, pokemon2_name TEXT,
+               winner_name TEXT, turns INTEGER,
+               pokemon1_hp_remaining INTEGER, pokemon2_hp_remaining INTEGER
+           )"""
+    )
+    conn.commit()
+    conn.close()
+
+    writer = ResultWriter(db_path).start()
+    try:
+        # No waiting: the setup is done by the time start() returns
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(battle_results)")}
+        assert {"pokemon1_config", "pokemon2_config"} <= columns
+        conn.close()
+    finally:
+        writer.close()
+
+
+def test_workers_are_not_forked():
+    assert _pool_context().get_start_method() != "fork"
@@ -0,0 +1,138 @@
+"""
+PokeAPIClient against a local stub HTTP server.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from data_prep.pokeapi import PokeAPIClient
+
+
+class StubAPI:
+    """Serves JSON per path, optionally preceded by scripted error responses."""
+
+    def __init__(self):
+        self.failures: dict[str, list[tuple[int, dict]]] = {}
+        self.requests: list[tuple[str, float]] = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub.lock:
+                    stub.requests.append((self.path, time.monotonic()))
+                    pending = stub.failures.get(self.path)
+                    failure = pending.pop(0) if pending else None
+                if failure is not None:
+                    status, headers = failure
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps({"path": self.path}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v2/"
+
+    def hits(self, path: str) -> int:
+        return sum(1 for requested, _ in self.requests if requested == path)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    api = StubAPI()
+    yield api
+    api.close()
+
+
+def _client(stub: StubAPI, cache_dir, **kwargs) -> PokeAPIClient:
+    options = {"rate_limit": None, "backoff": 0.01, "timeout": 5.0}
+    options.update(kwargs)
+    return PokeAPIClient(stub.base_url, cache_dir=cache_dir, **options)
+
+
+def test_retries_429_and_503(stub):
+    stub.failures["/api/v2/pokemon/1"] = [(429, {}), (503, {})]
+    with _client(stub, None) as client:
+        assert client.get_json("pokemon/1") == {"path": "/api/v2/pokemon/1"}
+        assert client.requests_made == 3
+    assert stub.hits("/api/v2/pokemon/1") == 3
+
+
+def test_gives_up_after_retries(stub):
+    stub.failures["/api/v2/pokemon/2"] = [(503, {})] * 3
+    with _client(stub, None, retries=2) as client:
+        with pytest.raises(requests.HTTPError):
+            client.get_json("pokemon/2")
+    assert stub.hits("/api/v2/pokemon/2") == 3
+
+
+def test_honors_retry_after(stub):
+    stub.failures["/api/v2/pokemon/3"] = [(429, {"Retry-After": "1"})]
+    with _client(stub, None) as client:
+        start = time.monotonic()
+        client.get_json("pokemon/3")
+        elapsed = time.monotonic() - start
+    # The 0.01s backoff alone would retry almost immediately
+    assert elapsed >= 0.9
+
+
+def test_cache_hit_makes_no_request(stub, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    with _client(stub, cache_dir) as client:
+        first = client.get_bytes("pokemon/4")
+    with _client(stub, cache_dir) as client:
+        assert client.get_bytes("pokemon/4") == first
+        assert client.cache_hits == 1
+        assert client.requests_made == 0
+    assert stub.hits("/api/v2/pokemon/4") == 1
+
+
+def test_cache_stores_identical_bodies_once(stub, tmp_path):
+    cache_dir = tmp_path / "cache"
+    with _client(stub, str(cache_dir)) as client:
+        client.cache.put(stub.base_url + "a", b"same")
+        client.cache.put(stub.base_url + "b", b"same")
+    assert len(list((cache_dir / "objects").iterdir())) == 1
+    assert len(list((cache_dir / "refs").iterdir())) == 2
+
+
+def test_no_cache_refetches(stub, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    with _client(stub, cache_dir) as client:
+        client.get_json("pokemon/5")
+    # --no-cache in the data_prep scripts passes cache_dir=None
+    with _client(stub, None) as client:
+        client.get_json("pokemon/5")
+        client.get_json("pokemon/5")
+    assert stub.hits("/api/v2/pokemon/5") == 3
+
+
+def test_rate_limit_spans_the_worker_pool(stub):
+    paths = [f"pokemon/{i}" for i in range(100, 112)]
+    with _client(stub, None, rate_limit=20.0, workers=8) as client:
+        results = client.fetch_many(paths, return_exceptions=False)
+    assert [result["path"] for result in results] == ["/api/v2/" + path for path in paths]
+
+    times = sorted(at for _, at in stub.requests)
+    # 12 requests at 20/s span at least 11 intervals of 50ms, whatever the pool size
+    assert times[-1] - times[0] >= 11 * 0.05 * 0.9
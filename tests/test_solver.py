@@ -0,0 +1,99 @@
+"""
+The exact solver against the Monte Carlo model it claims to match.
+"""
+
+import numpy as np
+import pytest
+from benchmarks.fixtures import build_fixture_db
+from core.batch import simulate_matchup
+from core.catalog import Catalog
+from core.matchup import plan_matchup
+from core.solver import solve_matchup
+
+REPLICATES = 40_000
+# About six standard errors of a win rate over REPLICATES battles
+TOLERANCE = 0.015
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("solver") / "fixture.db")
+    build_fixture_db(db_path, species=40, moves=60)
+    return Catalog(db_path)
+
+
+def _status_move(catalog: Catalog):
+    name = next(name for name, row in catalog.moves.items() if row[5] == "status")
+    return catalog.move(name)
+
+
+def _assert_matches(pokemon1, pokemon2, max_turns: int = 100, seed: int = 0):
+    odds = solve_matchup(pokemon1, pokemon2, max_turns)
+    batch = simulate_matchup(
+        pokemon1, pokemon2, REPLICATES, max_turns, np.random.default_rng(seed)
+    )
+    assert odds.p1_win == pytest.approx(batch.p1_win_rate, abs=TOLERANCE)
+    assert odds.p2_win == pytest.approx(batch.p2_win_rate, abs=TOLERANCE)
+    assert odds.draw == pytest.approx(batch.draw_rate, abs=TOLERANCE)
+    assert odds.turn_distribution.sum() == pytest.approx(1.0)
+    assert odds.expected_turns() == pytest.approx(batch.turns.mean(), rel=0.02, abs=0.05)
+    return odds
+
+
+@pytest.mark.parametrize(
+    "name1, name2",
+    [
+        ("pokemon-7", "pokemon-8"),
+        ("pokemon-11", "pokemon-12"),
+        ("pokemon-15", "pokemon-16"),
+        ("pokemon-23", "pokemon-24"),
+    ],
+)
+def test_matches_simulate_many(catalog, name1, name2):
+    odds = _assert_matches(catalog.pokemon(name1), catalog.pokemon(name2))
+    # Close matchups, so the comparison says something
+    assert 0.1 < odds.p1_win < 0.9
+
+
+def test_no_damaging_moves(catalog):
+    pokemon1 = catalog.pokemon("pokemon-7")
+    pokemon2 = catalog.pokemon("pokemon-8")
+    status = _status_move(catalog)
+    pokemon1.moves = (status,)
+    pokemon1.move_ids = (status.id,)
+
+    odds = _assert_matches(pokemon1, pokemon2)
+    assert odds.p1_win == 0.0
+
+    pokemon2.moves = (status,)
+    pokemon2.move_ids = (status.id,)
+    odds = _assert_matches(pokemon1, pokemon2, max_turns=20)
+    assert odds.draw == 1.0
+    assert odds.turn_distribution[20] == 1.0
+
+
+def test_immune_target(catalog):
+    pokemon1 = catalog.pokemon("pokemon-11")
+    pokemon2 = catalog.pokemon("pokemon-12")
+    pokemon2.defense_vector = (0.0,) * len(pokemon2.defense_vector)
+
+    odds = _assert_matches(pokemon1, pokemon2)
+    assert odds.p1_win == 0.0
+
+
+def test_single_turn(catalog):
+    odds = _assert_matches(catalog.pokemon("pokemon-7"), catalog.pokemon("pokemon-8"), max_turns=1)
+    assert odds.turn_distribution[1] == pytest.approx(1.0)
+
+
+def test_speed_tie_goes_to_pokemon1(catalog):
+    pokemon1 = catalog.pokemon("pokemon-15")
+    pokemon2 = catalog.pokemon("pokemon-16")
+    pokemon2.speed = pokemon1.speed
+
+    assert plan_matchup(pokemon1, pokemon2).first is pokemon1
+    assert plan_matchup(pokemon2, pokemon1).first is pokemon2
+    forward = _assert_matches(pokemon1, pokemon2)
+    backward = _assert_matches(pokemon2, pokemon1)
+    # Moving first is worth something to whichever side is pokemon1
+    assert forward.p1_win > backward.p2_win
@@ -0,0 +1,50 @@
+"""
+The vectorized stat compiler against the scalar formulas.
+"""
+
+import itertools
+import numpy as np
+import pytest
+from core.stats import NATURE_NAMES, StatCompiler, calc_stats, compile_stats
+
+BASE = np.array(
+    [
+        [1, 5, 5, 5, 5, 5],  # Shedinja-like: base HP 1
+        [45, 49, 49, 65, 65, 45],
+        [108, 130, 95, 80, 85, 102],
+        [255, 10, 10, 75, 135, 55],
+        [80, 82, 83, 100, 100, 80],
+    ]
+)
+EVS = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 252, 4, 0, 0, 252],
+        [252, 0, 252, 0, 4, 0],
+        [85, 85, 85, 85, 85, 85],
+        [3, 7, 11, 1, 2, 255],
+    ]
+)
+
+
+@pytest.mark.parametrize("iv, level", [(31, 100), (0, 100), (31, 50), (17, 73)])
+def test_compile_matches_calc_stats(iv, level):
+    stats = compile_stats(BASE, EVS, NATURE_NAMES, iv, level)
+    assert stats.shape == (len(BASE), len(EVS), len(NATURE_NAMES), 6)
+    for (s, base), (e, evs), (n, nature) in itertools.product(
+        enumerate(BASE), enumerate(EVS), enumerate(NATURE_NAMES)
+    ):
+        assert tuple(stats[s, e, n]) == calc_stats(base, evs, nature, iv, level)
+
+
+@pytest.mark.parametrize("nature", [None, "", "unknown", "ADAMANT"])
+def test_unknown_natures_match_scalar_path(nature):
+    stats = compile_stats(BASE, EVS[1:2], [nature])
+    compiler = StatCompiler([f"s{i}" for i in range(len(BASE))], BASE)
+    rows = compiler.set_stats(np.repeat(EVS[1:2], len(BASE), axis=0), [nature] * len(BASE))
+    cached = compiler.compile(EVS[1:2], [nature])
+    for s, base in enumerate(BASE):
+        expected = calc_stats(base, EVS[1], nature)
+        assert tuple(stats[s, 0, 0]) == expected
+        assert tuple(rows[s]) == expected
+        assert tuple(cached[s, 0, 0]) == expected
@@ -0,0 +1 @@
+"""Tournament system for Pokemon Battle Station."""
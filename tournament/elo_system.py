@@ -0,0 +1,298 @@
+"""
+Ratings for the pokemon_rankings table.
+
+battle_results is streamed in chunks and converted to integer-indexed NumPy
+arrays once. Two ratings come out of the same pass:
+
+- ELO: the classic sequential update, replayed in result order over a flat
+  ratings array.
+- Bradley-Terry: a maximum-likelihood fit of the aggregated pair win matrix,
+  which does not depend on result order at all.
+"""
+
+import argparse
+import math
+import sqlite3
+import time
+from typing import Iterator, Optional, Sequence, Union
+import numpy as np
+from data_prep.schema import ensure_rankings_schema
+from tournament.round_robin import load_roster
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+
+class ResultChunk:
+    """One chunk of battle_results as integer-indexed arrays."""
+
+    __slots__ = ("index1", "index2", "score", "turns")
+
+    def __init__(self, index1: np.ndarray, index2: np.ndarray, score: np.ndarray, turns: np.ndarray):
+        """
+        Args:
+            index1: Roster index of pokemon1 per battle
+            index2: Roster index of pokemon2 per battle
+            score: 1.0 if pokemon1 won, 0.0 if pokemon2 won, 0.5 for a draw
+            turns: Battle length per battle
+        """
+        self.index1 = index1
+        self.index2 = index2
+        self.score = score
+        self.turns = turns
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+
+def stream_results(
+    db_path: str, index: dict[str, int], chunk_size: int = 200_000, closed: bool = False
+) -> Iterator[ResultChunk]:
+    """
+    Read battle_results in insertion order, one chunk at a time.
+
+    Names missing from `index` are appended to it, unless `closed`, in which
+    case battles involving them are skipped.
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        """SELECT pokemon1_name, pokemon2_name, winner_name, turns
+           FROM battle_results ORDER BY id"""
+    )
+
+    def lookup(name: str) -> int:
+        position = index.get(name)
+        if position is None:
+            position = index[name] = len(index)
+        return position
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        if closed:
+            rows = [r for r in rows if r[0] in index and r[1] in index]
+            if not rows:
+                continue
+        index1 = np.fromiter((lookup(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+        index2 = np.fromiter((lookup(r[1]) for r in rows), dtype=np.int64, count=len(rows))
+        score = np.fromiter(
+            (0.5 if r[2] is None else (1.0 if r[2] == r[0] else 0.0) for r in rows),
+            dtype=np.float64,
+            count=len(rows),
+        )
+        turns = np.fromiter((r[3] or 0 for r in rows), dtype=np.int64, count=len(rows))
+        yield ResultChunk(index1, index2, score, turns)
+
+    conn.close()
+
+
+class RatingEngine:
+    """Accumulates ELO and pair statistics over streamed result chunks."""
+
+    def __init__(self, roster: list[str], k_factor: float = K_FACTOR):
+        """
+        Args:
+            roster: Names in index order; grows if results mention others
+            k_factor: ELO K-factor
+        """
+        self.index = {name: i for i, name in enumerate(roster)}
+        self.k_factor = k_factor
+        self._elo: list[float] = [INITIAL_RATING] * len(roster)
+        size = max(len(roster), 1)
+        self.wins = np.zeros(size)
+        self.losses = np.zeros(size)
+        self.draws = np.zeros(size)
+        self.win_turns = np.zeros(size)
+        # pair_wins[i, j]: wins of i over j, with draws counted as half a win each
+        self.pair_wins = np.zeros((size, size))
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.index)
+
+    def _grow(self):
+        """Resize arrays when new names were added to the index."""
+        size = len(self.index)
+        old = len(self.wins)
+        if size <= old:
+            return
+        self._elo.extend([INITIAL_RATING] * (size - len(self._elo)))
+        for attr in ("wins", "losses", "draws", "win_turns"):
+            grown = np.zeros(size)
+            grown[:old] = getattr(self, attr)
+            setattr(self, attr, grown)
+        pair_wins = np.zeros((size, size))
+        pair_wins[:old, :old] = self.pair_wins
+        self.pair_wins = pair_wins
+
+    def add(self, chunk: ResultChunk):
+        """Fold one chunk into the ELO replay and the aggregate counts."""
+        self._grow()
+        i, j, score = chunk.index1, chunk.index2, chunk.score
+
+        p1_won = score == 1.0
+        p2_won = score == 0.0
+        drawn = ~(p1_won | p2_won)
+        self.wins += np.bincount(i[p1_won], minlength=len(self.wins))
+        self.wins += np.bincount(j[p2_won], minlength=len(self.wins))
+        self.losses += np.bincount(j[p1_won], minlength=len(self.wins))
+        self.losses += np.bincount(i[p2_won], minlength=len(self.wins))
+        self.draws += np.bincount(i[drawn], minlength=len(self.wins))
+        self.draws += np.bincount(j[drawn], minlength=len(self.wins))
+        self.win_turns += np.bincount(i[p1_won], weights=chunk.turns[p1_won], minlength=len(self.wins))
+        self.win_turns += np.bincount(j[p2_won], weights=chunk.turns[p2_won], minlength=len(self.wins))
+
+        np.add.at(self.pair_wins, (i, j), score)
+        np.add.at(self.pair_wins, (j, i), 1.0 - score)
+
+        self._replay_elo(i.tolist(), j.tolist(), score.tolist())
+
+    def _replay_elo(self, index1: list[int], index2: list[int], scores: list[float]):
+        """Sequential ELO over plain lists; the only per-battle Python loop."""
+        elo = self._elo
+        k = self.k_factor
+        for a, b, s in zip(index1, index2, scores):
+            ra = elo[a]
+            rb = elo[b]
+            delta = k * (s - 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0)))
+            elo[a] = ra + delta
+            elo[b] = rb - delta
+
+    def elo(self) -> np.ndarray:
+        return np.array(self._elo)
+
+    def bradley_terry(self, iterations: int = 500, tol: float = 1e-9, prior: float = 0.5) -> np.ndarray:
+        """
+        Fit Bradley-Terry strengths to the pair win matrix.
+
+        Uses the minorization-maximization update
+            p_i <- W_i / sum_j N_ij / (p_i + p_j)
+        vectorized over the whole matrix. `prior` pseudo-wins are added both
+        ways for every pair that met, so unbeaten or winless Pokemon get
+        finite ratings.
+
+        Returns:
+            Ratings on an ELO-like scale: 1500 + 400 * log10(p / geometric mean)
+        """
+        pair_wins = self.pair_wins
+        played = (pair_wins + pair_wins.T) > 0
+        wins = pair_wins + prior * played
+        games = wins + wins.T
+        total_wins = wins.sum(axis=1)
+
+        active = total_wins > 0
+        strength = np.ones(len(total_wins))
+        for _ in range(iterations):
+            denominator = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+            updated = np.where(active, total_wins / np.where(denominator > 0, denominator, 1.0), 1.0)
+            updated /= math.exp(np.log(updated[active]).mean()) if active.any() else 1.0
+            change = np.abs(updated - strength).max()
+            strength = updated
+            if change < tol:
+                break
+
+        ratings = np.full(len(strength), INITIAL_RATING)
+        ratings[active] = INITIAL_RATING + 400.0 * np.log10(strength[active])
+        return ratings
+
+    def ranking_rows(self, bt_iterations: int = 500) -> list[tuple]:
+        """Build pokemon_rankings rows for everyone who fought."""
+        games = self.wins + self.losses + self.draws
+        elo = self.elo()
+        bt = self.bradley_terry(bt_iterations)
+        rows = []
+        for name, i in self.index.items():
+            if games[i] == 0:
+                continue
+            rows.append(
+                (
+                    name,
+                    int(round(elo[i])),
+                    float(bt[i]),
+                    int(self.wins[i]),
+                    int(self.losses[i]),
+                    int(self.draws[i]),
+                    float(self.wins[i] / games[i]),
+                    float(self.win_turns[i] / self.wins[i]) if self.wins[i] else 0.0,
+                )
+            )
+        return rows
+
+
+def write_rankings(db_path: str, rows: list[tuple]):
+    """
+    Replace pokemon_rankings with these rows in a single transaction.
+
+    Ratings from different passes are not on a common scale, so rows for
+    Pokemon missing from this pass are deleted rather than kept stale.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    ensure_rankings_schema(conn)
+    conn.execute("BEGIN")
+    conn.execute("DELETE FROM pokemon_rankings")
+    conn.executemany(
+        """
+        INSERT INTO pokemon_rankings (
+            pokemon_name, elo_rating, bt_rating, wins, losses, draws,
+            win_rate, avg_turns_to_win, last_updated
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        rows,
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def update_rankings(
+    db_path: str = "data_prep/pkmn_battle_station.db",
+    chunk_size: int = 200_000,
+    k_factor: float = K_FACTOR,
+    roster: Optional[list[str]] = None,
+    tier: Union[str, Sequence[str], None] = None,
+) -> RatingEngine:
+    """
+    Recompute pokemon_rankings from battle_results.
+
+    With a roster or tier, only battles between two of its members are
+    rated; otherwise every stored battle is. Either way pokemon_rankings
+    ends up holding exactly the Pokemon rated in this pass.
+
+    Args:
+        db_path: Path to SQLite database
+        chunk_size: battle_results rows read per chunk
+        k_factor: ELO K-factor
+        roster: Only rate battles between these names, indexed in this order
+        tier: Only rate battles between Pokemon from this smogon_sets tier
+              (or tiers) when no roster is given
+
+    Returns:
+        The RatingEngine, for inspecting the ratings
+    """
+    closed = roster is not None or tier is not None
+    if roster is None:
+        roster = load_roster(db_path, tier)
+    engine = RatingEngine(roster, k_factor)
+    for chunk in stream_results(db_path, engine.index, chunk_size, closed):
+        engine.add(chunk)
+    write_rankings(db_path, engine.ranking_rows())
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute pokemon_rankings.")
+    parser.add_argument("--db", default="data_prep/pkmn_battle_station.db")
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument("--k", type=float, default=K_FACTOR)
+    parser.add_argument("--tier", action="append", help="Restrict to a smogon_sets tier")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = update_rankings(args.db, args.chunk_size, args.k, tier=args.tier)
+    games = int((engine.wins + engine.losses + engine.draws).sum() // 2)
+    print(f"Rated {len(engine.index)} Pokemon from {games} battles in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Incremental, resumable round-robin tournaments.
+
+Every battle_results row stores the configuration hash of both sides (see
+PokemonTemplate.config_hash) with the run's seed and turn limit folded in
+(round_robin.run_hash). A pair is up to date when its stored rows carry
+both sides' current hashes and the expected number of replicates, and
+nothing else is stored for it in either order; only the other pairs are
+re-simulated. Rows for species no longer in pokemon_fact are dropped; a
+tier-filtered run leaves results outside its tier untouched.
+
+The ResultWriter commits whole chunks per transaction, so every committed
+pair is complete. After a crash, running again picks up from the last
+committed transaction.
+"""
+
+import sqlite3
+from collections import Counter
+from typing import Callable, Optional, Sequence, Union
+from core.catalog import Catalog
+from data_prep.schema import ensure_results_schema
+from tournament.results_writer import ResultWriter
+from tournament.round_robin import (
+    TournamentResult,
+    iter_pairs,
+    load_roster,
+    run_hash,
+    run_tournament,
+)
+
+
+def current_hashes(
+    catalog: Catalog, roster: Sequence[str], seed: int = 0, max_turns: int = 100
+) -> dict[str, str]:
+    """Get every roster member's configuration hash for a run's settings."""
+    return {name: run_hash(catalog.config_hash(name), seed, max_turns) for name in roster}
+
+
+def completed_pairs(
+    conn: sqlite3.Connection, hashes: dict[str, str], replicates: int
+) -> set[tuple[str, str]]:
+    """
+    Pairs whose stored results are exactly the replicates for the current hashes.
+
+    Only pairs with both sides in `hashes` (the current roster) are
+    considered. A pair with any other rows, stale hashes or the opposite
+    order, is not complete, so it gets cleared and re-simulated.
+    """
+    matching = {}
+    totals = Counter()
+    cursor = conn.execute(
+        """SELECT pokemon1_name, pokemon2_name, pokemon1_config, pokemon2_config, COUNT(*)
+           FROM battle_results
+           GROUP BY pokemon1_name, pokemon2_name, pokemon1_config, pokemon2_config"""
+    )
+    for name1, name2, hash1, hash2, count in cursor:
+        if name1 not in hashes or name2 not in hashes:
+            continue
+        totals[frozenset((name1, name2))] += count
+        if hash1 is not None and hashes[name1] == hash1 and hashes[name2] == hash2:
+            matching[(name1, name2)] = count
+    return {
+        pair
+        for pair, count in matching.items()
+        if count == replicates and totals[frozenset(pair)] == replicates
+    }
+
+
+def delete_stale(
+    conn: sqlite3.Connection, species: Sequence[str], pending: list[tuple[str, str]]
+):
+    """
+    Drop stored rows for pairs about to be re-simulated, in either order,
+    and for names that are not among `species`.
+
+    Args:
+        conn: Connection in autocommit mode
+        species: Every species that still exists, not a tier-filtered roster
+        pending: Pairs of the current roster about to be re-simulated
+    """
+    conn.execute("BEGIN")
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS roster_names (name TEXT PRIMARY KEY)")
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS pending_pairs (pokemon1_name TEXT, pokemon2_name TEXT)"
+    )
+    conn.execute("DELETE FROM roster_names")
+    conn.execute("DELETE FROM pending_pairs")
+    conn.executemany("INSERT INTO roster_names VALUES (?)", ((name,) for name in species))
+    conn.executemany("INSERT INTO pending_pairs VALUES (?, ?)", pending)
+    conn.execute(
+        """DELETE FROM battle_results
+           WHERE pokemon1_name NOT IN (SELECT name FROM roster_names)
+              OR pokemon2_name NOT IN (SELECT name FROM roster_names)"""
+    )
+    # Both orders, each through the pair index
+    conn.execute(
+        """DELETE FROM battle_results WHERE id IN (
+               SELECT r.id FROM pending_pairs p
+               JOIN battle_results r
+                 ON r.pokemon1_name = p.pokemon1_name AND r.pokemon2_name = p.pokemon2_name
+               UNION ALL
+               SELECT r.id FROM pending_pairs p
+               JOIN battle_results r
+                 ON r.pokemon1_name = p.pokemon2_name AND r.pokemon2_name = p.pokemon1_name
+           )"""
+    )
+    conn.execute("DROP TABLE pending_pairs")
+    conn.execute("DROP TABLE roster_names")
+    conn.execute("COMMIT")
+
+
+def run_incremental(
+    db_path: str = "data_prep/pkmn_battle_station.db",
+    tier: Union[str, Sequence[str], None] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 2000,
+    replicates: int = 1,
+    seed: int = 0,
+    max_turns: int = 100,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> TournamentResult:
+    """
+    Bring battle_results up to date, simulating only changed or missing pairs.
+
+    Args:
+        db_path: Path to SQLite database
+        tier: Only include Pokemon from this smogon_sets tier (or tiers)
+        workers: Worker processes; defaults to the CPU count
+        chunk_size: Pairs handed to a worker at a time
+        replicates: Battles per pair
+        seed: Global seed
+        max_turns: Maximum number of turns before declaring a draw
+        progress: Called with (pairs done, pairs pending) after each chunk
+
+    Returns:
+        TournamentResult covering only the pairs that were re-simulated
+    """
+    roster = load_roster(db_path, tier)
+    hashes = current_hashes(Catalog(db_path), roster, seed, max_turns)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    ensure_results_schema(conn)
+    done = completed_pairs(conn, hashes, replicates)
+    pending = [pair for pair in iter_pairs(roster) if pair not in done]
+    delete_stale(conn, roster if tier is None else load_roster(db_path), pending)
+    conn.close()
+
+    # Rebuilding the pair index once beats maintaining it when most pairs are rewritten
+    total = len(roster) * (len(roster) - 1) // 2
+    with ResultWriter(db_path, defer_index=2 * len(pending) > total) as writer:
+        return run_tournament(
+            db_path,
+            workers=workers,
+            chunk_size=chunk_size,
+            replicates=replicates,
+            seed=seed,
+            max_turns=max_turns,
+            roster=roster,
+            pairs=pending,
+            progress=progress,
+            on_results=writer.write,
+        )
@@ -0,0 +1,341 @@
+"""
+All-pairs outcome matrices, persisted as memory-mappable .npy files.
+
+A tournament's results fold into three N x N float32 matrices over the
+roster, where cell [i, j] describes species i fighting species j:
+
+    win_rate.npy      share of battles i won (draws count as not won)
+    turns.npy         mean battle length in turns
+    hp_remaining.npy  mean HP i had left when the battle ended
+
+Cells for pairs that never fought, including the diagonal, are NaN.
+index.json maps rows to Pokemon IDs and names. Loss rates are the
+transpose of win_rate, and draw rates are 1 - W - W.T.
+
+WinMatrix opens the arrays with mmap_mode="r". Rows, columns and top-k
+queries read only the pages they touch, and every process that opens the
+same files shares one copy in the OS page cache:
+
+    matrix = WinMatrix()
+    matrix.counters("garchomp", k=5)
+
+Each save() writes a new generation directory holding all four files,
+then atomically replaces the CURRENT file naming it. A reader therefore
+always opens one generation's matrices and index together. Readers still
+holding an older mapping keep reading consistent data. The previous
+generation is kept and older ones are removed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Optional, Sequence, Union
+import numpy as np
+from core.battle import ENGINE_VERSION
+from tournament.round_robin import ResultRow, load_roster
+
+MATRIX_DIR = "data_prep/win_matrix"
+INDEX_FILE = "index.json"
+CURRENT_FILE = "CURRENT"  # Names the generation directory readers should open
+GENERATION_PREFIX = "gen-"
+MATRICES = ("win_rate", "turns", "hp_remaining")
+
+
+def current_generation(directory: str = MATRIX_DIR) -> Optional[str]:
+    """Name of the generation a reader should open, or None if nothing was saved."""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def roster_ids(db_path: str, roster: Sequence[str]) -> list[int]:
+    """Get the pokemon_fact ID of every roster member, in roster order."""
+    conn = sqlite3.connect(db_path)
+    ids = dict(conn.execute("SELECT name, id FROM pokemon_fact"))
+    conn.close()
+    return [ids[name] for name in roster]
+
+
+class MatrixBuilder:
+    """
+    Accumulates battle_results rows into per-pair sums.
+
+    Usable as the on_results callback of run_tournament():
+
+        builder = MatrixBuilder(roster, roster_ids(db_path, roster))
+        run_tournament(db_path, roster=roster, on_results=builder.add)
+        builder.save()
+    """
+
+    def __init__(self, roster: Sequence[str], ids: Sequence[int]):
+        """
+        Args:
+            roster: Pokemon names, one per row and column
+            ids: pokemon_fact ID of each roster member
+        """
+        if len(roster) != len(ids):
+            raise ValueError("roster and ids must be the same length")
+        self.roster = list(roster)
+        self.ids = [int(pokemon_id) for pokemon_id in ids]
+        self._index = {name: i for i, name in enumerate(self.roster)}
+
+        n = len(self.roster)
+        self.battles = np.zeros((n, n), dtype=np.int64)
+        self.wins = np.zeros((n, n), dtype=np.int64)
+        self.turn_sum = np.zeros((n, n), dtype=np.int64)
+        self.hp_sum = np.zeros((n, n), dtype=np.int64)
+
+    def add(self, rows: Sequence[ResultRow]):
+        """Fold a chunk of battle rows into the sums; rows off the roster are skipped."""
+        index = self._index
+        rows = [row for row in rows if row[0] in index and row[1] in index]
+        if not rows:
+            return
+        i = np.fromiter((index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+        j = np.fromiter((index[row[1]] for row in rows), dtype=np.intp, count=len(rows))
+        won1 = np.fromiter((row[2] == row[0] for row in rows), dtype=np.int64, count=len(rows))
+        won2 = np.fromiter((row[2] == row[1] for row in rows), dtype=np.int64, count=len(rows))
+        turns = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+        hp1 = np.fromiter((row[4] for row in rows), dtype=np.int64, count=len(rows))
+        hp2 = np.fromiter((row[5] for row in rows), dtype=np.int64, count=len(rows))
+
+        # Each battle fills both [i, j] and [j, i]; add.at handles repeated pairs
+        for rows_, cols, won, hp in ((i, j, won1, hp1), (j, i, won2, hp2)):
+            np.add.at(self.battles, (rows_, cols), 1)
+            np.add.at(self.wins, (rows_, cols), won)
+            np.add.at(self.turn_sum, (rows_, cols), turns)
+            np.add.at(self.hp_sum, (rows_, cols), hp)
+
+    @classmethod
+    def from_results(
+        cls, db_path: str, roster: Optional[Sequence[str]] = None
+    ) -> "MatrixBuilder":
+        """
+        Build from the stored battle_results, aggregated per pair in SQLite.
+
+        Args:
+            db_path: Path to SQLite database
+            roster: Pokemon to include; every Pokemon if not given
+        """
+        if roster is None:
+            roster = load_roster(db_path)
+        builder = cls(roster, roster_ids(db_path, roster))
+        index = builder._index
+
+        conn = sqlite3.connect(db_path)
+        cursor = conn.execute(
+            """SELECT pokemon1_name, pokemon2_name, COUNT(*),
+                      SUM(winner_name = pokemon1_name), SUM(winner_name = pokemon2_name),
+                      SUM(turns), SUM(pokemon1_hp_remaining), SUM(pokemon2_hp_remaining)
+               FROM battle_results
+               GROUP BY pokemon1_name, pokemon2_name"""
+        )
+        for name1, name2, count, wins1, wins2, turns, hp1, hp2 in cursor:
+            if name1 not in index or name2 not in index:
+                continue
+            i, j = index[name1], index[name2]
+            for a, b, wins, hp in ((i, j, wins1, hp1), (j, i, wins2, hp2)):
+                builder.battles[a, b] += count
+                builder.wins[a, b] += wins or 0
+                builder.turn_sum[a, b] += turns or 0
+                builder.hp_sum[a, b] += hp or 0
+        conn.close()
+        return builder
+
+    def matrices(self) -> dict[str, np.ndarray]:
+        """The float32 matrices, NaN where a pair never fought."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            battles = np.where(self.battles > 0, self.battles, np.nan)
+            return {
+                "win_rate": (self.wins / battles).astype(np.float32),
+                "turns": (self.turn_sum / battles).astype(np.float32),
+                "hp_remaining": (self.hp_sum / battles).astype(np.float32),
+            }
+
+    def save(self, directory: str = MATRIX_DIR) -> str:
+        """
+        Write the matrices and index as a new generation and make it current.
+
+        Returns:
+            The generation's name
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = tempfile.mkdtemp(prefix=GENERATION_PREFIX, dir=directory)
+        os.chmod(path, 0o755)
+        generation = os.path.basename(path)
+        try:
+            for name, matrix in self.matrices().items():
+                np.save(os.path.join(path, f"{name}.npy"), matrix)
+            index = {
+                "generation": generation,
+                "ids": self.ids,
+                "names": self.roster,
+                "battles": int(self.battles.sum() // 2),
+                "engine_version": ENGINE_VERSION,
+            }
+            with open(os.path.join(path, INDEX_FILE), "w") as f:
+                json.dump(index, f)
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        previous = current_generation(directory)
+        _write_atomic(
+            os.path.join(directory, CURRENT_FILE), lambda out: out.write(generation.encode())
+        )
+        for entry in os.listdir(directory):
+            if entry.startswith(GENERATION_PREFIX) and entry not in (generation, previous):
+                shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+        return generation
+
+    def __repr__(self):
+        return f"MatrixBuilder({len(self.roster)} pokemon, {int(self.battles.sum() // 2)} battles)"
+
+
+def _write_atomic(path: str, write):
+    """Call write(file) on a temp file, then rename it over path."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class WinMatrix:
+    """Read-only, memory-mapped view of one saved generation."""
+
+    def __init__(self, directory: str = MATRIX_DIR, generation: Optional[str] = None):
+        """
+        Args:
+            directory: Directory written by MatrixBuilder.save()
+            generation: Generation to open; the current one if not given
+        """
+        self.directory = directory
+        # A save can remove the generation we just read from CURRENT; re-read it
+        for attempt in range(3):
+            name = generation or current_generation(directory)
+            if name is None:
+                raise FileNotFoundError(f"No matrices saved in {directory}")
+            try:
+                self._open(name)
+                return
+            except FileNotFoundError:
+                if generation is not None or attempt == 2:
+                    raise
+
+    def _open(self, generation: str):
+        self.generation = generation
+        self.path = os.path.join(self.directory, generation)
+        with open(os.path.join(self.path, INDEX_FILE)) as f:
+            index = json.load(f)
+        if index["generation"] != generation:
+            raise ValueError(f"{INDEX_FILE} in {self.path} belongs to {index['generation']}")
+        self.names: list[str] = index["names"]
+        self.ids: list[int] = index["ids"]
+        self.battles: int = index["battles"]
+        self.engine_version: str = index["engine_version"]
+        self._by_name = {name: i for i, name in enumerate(self.names)}
+        self._by_id = {pokemon_id: i for i, pokemon_id in enumerate(self.ids)}
+
+        self.win_rate = self._load("win_rate")
+        self.turns = self._load("turns")
+        self.hp_remaining = self._load("hp_remaining")
+
+    def _load(self, name: str) -> np.ndarray:
+        matrix = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+        if matrix.shape != (len(self.names), len(self.names)):
+            raise ValueError(f"{name}.npy does not match {INDEX_FILE}")
+        return matrix
+
+    def index(self, pokemon: Union[str, int]) -> int:
+        """Row/column of a Pokemon, by name or pokemon_fact ID."""
+        try:
+            if isinstance(pokemon, str):
+                return self._by_name[pokemon]
+            return self._by_id[pokemon]
+        except KeyError:
+            raise KeyError(f"{pokemon!r} is not in the matrix") from None
+
+    def _matrix(self, matrix: str) -> np.ndarray:
+        if matrix not in MATRICES:
+            raise ValueError(f"Unknown matrix {matrix!r}; expected one of {MATRICES}")
+        return getattr(self, matrix)
+
+    def row(self, pokemon: Union[str, int], matrix: str = "win_rate") -> np.ndarray:
+        """How a Pokemon fares against every other (a view, not a copy)."""
+        return self._matrix(matrix)[self.index(pokemon)]
+
+    def column(self, pokemon: Union[str, int], matrix: str = "win_rate") -> np.ndarray:
+        """How every other Pokemon fares against this one (a strided view)."""
+        return self._matrix(matrix)[:, self.index(pokemon)]
+
+    def get(self, pokemon1: Union[str, int], pokemon2: Union[str, int], matrix: str = "win_rate") -> float:
+        """One cell, e.g. the rate at which pokemon1 beats pokemon2."""
+        return float(self._matrix(matrix)[self.index(pokemon1), self.index(pokemon2)])
+
+    def top_k(self, values: np.ndarray, k: int = 10, largest: bool = True) -> list[tuple[str, float]]:
+        """
+        The k best entries of a row or column as (name, value), skipping NaN.
+
+        Args:
+            values: Length-N vector, e.g. from row() or column()
+            k: Entries to return
+            largest: Highest values first; False for lowest first
+        """
+        values = np.asarray(values, dtype=np.float64)
+        keyed = np.where(np.isnan(values), -np.inf, values if largest else -values)
+        k = min(k, int(np.count_nonzero(~np.isnan(values))))
+        if k <= 0:
+            return []
+        top = np.argpartition(-keyed, k - 1)[:k]
+        top = top[np.lexsort((top, -keyed[top]))]
+        return [(self.names[i], float(values[i])) for i in top]
+
+    def counters(self, pokemon: Union[str, int], k: int = 10) -> list[tuple[str, float]]:
+        """Who beats this Pokemon most often, with their win rates against it."""
+        return self.top_k(self.column(pokemon), k)
+
+    def best_matchups(self, pokemon: Union[str, int], k: int = 10) -> list[tuple[str, float]]:
+        """Whom this Pokemon beats most often, with its win rates."""
+        return self.top_k(self.row(pokemon), k)
+
+    def ranking(self, k: Optional[int] = None) -> list[tuple[str, float]]:
+        """Pokemon by mean win rate over the opponents they fought, best first."""
+        fought = np.count_nonzero(~np.isnan(self.win_rate), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(fought > 0, np.nansum(self.win_rate, axis=1) / fought, np.nan)
+        return self.top_k(means, len(self.names) if k is None else k)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, pokemon: Union[str, int]) -> bool:
+        return pokemon in (self._by_name if isinstance(pokemon, str) else self._by_id)
+
+    def __repr__(self):
+        return f"WinMatrix({self.path}, {len(self.names)} pokemon, {self.battles} battles)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build win-rate matrices from battle_results.")
+    parser.add_argument("--db", default="data_prep/pkmn_battle_station.db")
+    parser.add_argument("--tier", action="append", help="Restrict to a smogon_sets tier")
+    parser.add_argument("--out", default=MATRIX_DIR)
+    args = parser.parse_args()
+
+    builder = MatrixBuilder.from_results(args.db, load_roster(args.db, args.tier))
+    builder.save(args.out)
+    print(f"Saved {builder} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Batched, transactional writer for the battle_results table.
+
+Rows are handed to a dedicated writer thread through a queue and written
+with executemany inside large transactions on a WAL-journaled connection,
+so producers never wait on disk.
+
+The pair index on battle_results costs more than the inserts themselves
+on bulk loads. With defer_index the writer drops it at start and builds
+it once after the last batch, which is much cheaper for whole
+tournaments; incremental top-ups into a large table keep it live.
+
+start() opens the connection, switches to WAL and applies the schema
+before the thread exists, so readers such as tournament workers never
+race that setup. run_tournament() starts its workers without fork, so a
+live writer thread is never copied into them.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+from data_prep.schema import create_pair_index, ensure_results_schema
+from tournament.round_robin import ResultRow
+
+INSERT_RESULTS = """
+    INSERT INTO battle_results (
+        pokemon1_name, pokemon2_name, winner_name, turns,
+        pokemon1_hp_remaining, pokemon2_hp_remaining,
+        pokemon1_config, pokemon2_config
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_STOP = object()
+
+
+class ResultWriter:
+    """
+    Buffered sink for battle_results rows.
+
+    Usable as a context manager, and as the on_results callback of
+    run_tournament():
+
+        with ResultWriter(db_path) as writer:
+            run_tournament(db_path, on_results=writer.write)
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data_prep/pkmn_battle_station.db",
+        batch_size: int = 50_000,
+        max_pending: int = 256,
+        defer_index: bool = False,
+    ):
+        """
+        Args:
+            db_path: Path to SQLite database
+            batch_size: Rows buffered before each transaction is committed
+            max_pending: Chunks that may wait in the queue before write() blocks
+            defer_index: Drop the pair index while writing and rebuild it on
+                         close; if the writer fails, the next
+                         ensure_results_schema() rebuilds it
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.defer_index = defer_index
+        self.rows_written = 0
+        self.transactions = 0
+        self.elapsed = 0.0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> "ResultWriter":
+        """Set up the connection and schema, then start the writer thread."""
+        if self._thread is None:
+            # Handed to the writer thread, which is its only user from here on
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                ensure_results_schema(conn)
+                if self.defer_index:
+                    conn.execute("DROP INDEX IF EXISTS idx_battle_results_pair")
+            except BaseException:
+                conn.close()
+                raise
+            self._conn = conn
+            self._thread = threading.Thread(
+                target=self._run, name="battle-results-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def write(self, rows: Iterable[ResultRow]):
+        """Queue rows for writing; returns without touching disk."""
+        if self._error is not None:
+            raise RuntimeError("battle_results writer failed") from self._error
+        if self._thread is None:
+            self.start()
+        self._queue.put(rows if isinstance(rows, list) else list(rows))
+
+    def close(self):
+        """Flush everything still buffered and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise RuntimeError("battle_results writer failed") from self._error
+
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.elapsed if self.elapsed else 0.0
+
+    def __enter__(self) -> "ResultWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        """Writer thread: drain the queue, committing one transaction per batch."""
+        start = time.perf_counter()
+        conn = self._conn
+        stopped = False
+        try:
+            buffer: list[ResultRow] = []
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    stopped = True
+                    break
+                # Only flush between chunks, so a pair's replicates always
+                # land in the same transaction
+                buffer.extend(item)
+                if len(buffer) >= self.batch_size:
+                    self._flush(conn, buffer)
+                    buffer = []
+
+            if buffer:
+                self._flush(conn, buffer)
+            if self.defer_index:
+                create_pair_index(conn)
+        except BaseException as e:
+            self._error = e
+            # Keep draining so producers blocked on a full queue can finish
+            while not stopped:
+                stopped = self._queue.get() is _STOP
+        finally:
+            conn.close()
+            self._conn = None
+            self.elapsed = time.perf_counter() - start
+
+    def _flush(self, conn: sqlite3.Connection, rows: list[ResultRow]):
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(INSERT_RESULTS, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self.rows_written += len(rows)
+        self.transactions += 1
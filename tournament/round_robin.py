@@ -0,0 +1,404 @@
+"""
+Round-robin tournament: every Pokemon battles every other Pokemon.
+
+Pairs are fanned out to a process pool in chunks. Each worker loads the
+catalog once at startup and reuses one battle state per species, so the
+per-battle cost is the simulation itself.
+
+Workers are started through a forkserver (spawn where that is missing),
+never forked from the caller. Callers typically have a ResultWriter
+thread with an open SQLite connection, and a forked copy of that can
+deadlock or find the database locked.
+"""
+
+import argparse
+import functools
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterator, Optional, Sequence, Union
+from core.battle import Battle
+from core.catalog import Catalog
+from core.pokemon import Pokemon
+from core.rng import battle_stream, pair_id
+
+# One battle_results row:
+# (pokemon1_name, pokemon2_name, winner_name, turns,
+#  pokemon1_hp_remaining, pokemon2_hp_remaining,
+#  pokemon1_config, pokemon2_config), the configs being run_hash()es
+ResultRow = tuple[str, str, Optional[str], int, int, int, str, str]
+
+# Per-worker state, set up once by _init_worker
+_catalog: Optional[Catalog] = None
+_states: dict[str, Pokemon] = {}
+_hashes: dict[str, str] = {}
+
+
+class TournamentResult:
+    """Aggregated outcome of a round-robin run."""
+
+    def __init__(self, roster: list[str]):
+        """
+        Args:
+            roster: Pokemon names that took part
+        """
+        self.roster = roster
+        # name -> [wins, losses, draws]
+        self.standings: dict[str, list[int]] = {name: [0, 0, 0] for name in roster}
+        self.battles = 0
+        self.pairs = 0
+        self.elapsed = 0.0
+
+    def add(self, rows: Sequence[ResultRow]):
+        """Fold a chunk of battle rows into the standings."""
+        standings = self.standings
+        for name1, name2, winner, *_ in rows:
+            if winner is None:
+                standings[name1][2] += 1
+                standings[name2][2] += 1
+            elif winner == name1:
+                standings[name1][0] += 1
+                standings[name2][1] += 1
+            else:
+                standings[name2][0] += 1
+                standings[name1][1] += 1
+        self.battles += len(rows)
+
+    def win_rate(self, name: str) -> float:
+        """Share of battles won, counting draws as not won."""
+        wins, losses, draws = self.standings[name]
+        total = wins + losses + draws
+        return wins / total if total else 0.0
+
+    def ranking(self) -> list[tuple[str, float]]:
+        """Names sorted by win rate, best first."""
+        return sorted(
+            ((name, self.win_rate(name)) for name in self.roster),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def __repr__(self):
+        return f"TournamentResult({len(self.roster)} pokemon, {self.battles} battles, {self.elapsed:.1f}s)"
+
+
+def load_roster(
+    db_path: str = "data_prep/pkmn_battle_station.db",
+    tier: Union[str, Sequence[str], None] = None,
+) -> list[str]:
+    """
+    Get the Pokemon taking part, in Pokedex order.
+
+    Args:
+        db_path: Path to SQLite database
+        tier: Only include Pokemon whose smogon_sets tier is this (or one of these)
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    if tier is None:
+        cursor.execute("SELECT name FROM pokemon_fact ORDER BY id")
+    else:
+        tiers = [tier] if isinstance(tier, str) else list(tier)
+        placeholders = ", ".join("?" for _ in tiers)
+        cursor.execute(
+            f"""SELECT p.name FROM pokemon_fact p
+                JOIN smogon_sets s ON s.pokemon_name = p.name
+                WHERE s.tier IN ({placeholders})
+                ORDER BY p.id""",
+            tiers,
+        )
+
+    roster = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return roster
+
+
+@functools.lru_cache(maxsize=None)
+def run_hash(config_hash: str, seed: int, max_turns: int) -> str:
+    """
+    Fold the run settings into a species' configuration hash.
+
+    This is what battle_results stores per side, so results fought with a
+    different seed or turn limit never count as up to date.
+    """
+    return hashlib.sha1(f"{config_hash}:{seed}:{max_turns}".encode()).hexdigest()
+
+
+def iter_pairs(roster: Sequence[str]) -> Iterator[tuple[str, str]]:
+    """Yield every unordered pair once."""
+    for i in range(len(roster)):
+        for j in range(i + 1, len(roster)):
+            yield roster[i], roster[j]
+
+
+def _chunks(pairs: Iterator[tuple[str, str]], size: int) -> Iterator[list[tuple[str, str]]]:
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _pool_context():
+    """Start method for worker processes: forkserver, else spawn, never fork."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _init_worker(db_path: str):
+    """Load the catalog and compile every species' stats once per worker process."""
+    global _catalog
+    _catalog = Catalog(db_path)
+    _catalog.set_stats()
+    _states.clear()
+    _hashes.clear()
+
+
+def _battle_state(name: str) -> Pokemon:
+    """Get this worker's reusable battle state for a species, reset."""
+    pokemon = _states.get(name)
+    if pokemon is None:
+        pokemon = _catalog.pokemon(name)
+        _states[name] = pokemon
+        _hashes[name] = _catalog.config_hash(name)
+    else:
+        pokemon.reset()
+    return pokemon
+
+
+def run_pair(
+    name1: str, name2: str, seed: int, replicates: int = 1, max_turns: int = 100
+) -> list[ResultRow]:
+    """
+    Fight one pair in the current worker.
+
+    The random stream for each replicate is keyed by the two species IDs,
+    so results do not depend on roster filtering or scheduling.
+    """
+    pokemon1 = _battle_state(name1)
+    pokemon2 = _battle_state(name2)
+    key = pair_id(pokemon1.id, pokemon2.id)
+    hash1 = run_hash(_hashes[name1], seed, max_turns)
+    hash2 = run_hash(_hashes[name2], seed, max_turns)
+
+    # One Battle per pair; replicates only reset the state and swap streams
+    battle = Battle(pokemon1, pokemon2, headless=True, rng=battle_stream(seed, key, 0))
+    rows = []
+    for replicate in range(replicates):
+        if replicate:
+            battle.reset(battle_stream(seed, key, replicate))
+        winner, _ = battle.simulate(max_turns)
+        rows.append(
+            (
+                name1,
+                name2,
+                winner.name if winner else None,
+                battle.turn,
+                pokemon1.current_hp,
+                pokemon2.current_hp,
+                hash1,
+                hash2,
+            )
+        )
+    return rows
+
+
+def _run_chunk(
+    pairs: list[tuple[str, str]], seed: int, replicates: int, max_turns: int
+) -> list[ResultRow]:
+    rows = []
+    for name1, name2 in pairs:
+        rows.extend(run_pair(name1, name2, seed, replicates, max_turns))
+    return rows
+
+
+def run_tournament(
+    db_path: str = "data_prep/pkmn_battle_station.db",
+    tier: Union[str, Sequence[str], None] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 2000,
+    replicates: int = 1,
+    seed: int = 0,
+    max_turns: int = 100,
+    roster: Optional[list[str]] = None,
+    pairs: Optional[Sequence[tuple[str, str]]] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    on_results: Optional[Callable[[list[ResultRow]], None]] = None,
+) -> TournamentResult:
+    """
+    Run every pair of the roster and aggregate the results.
+
+    Args:
+        db_path: Path to SQLite database
+        tier: Only include Pokemon from this smogon_sets tier (or tiers)
+        workers: Worker processes; defaults to the CPU count, 1 runs in-process.
+                 Workers are not forked, so a calling script needs the usual
+                 `if __name__ == "__main__":` guard
+        chunk_size: Pairs handed to a worker at a time
+        replicates: Battles per pair
+        seed: Global seed; with the species IDs it fixes every battle's stream
+        max_turns: Maximum number of turns before declaring a draw
+        roster: Pokemon names to use instead of loading them from the database
+        pairs: Pairs to run instead of every pair of the roster
+        progress: Called with (pairs done, total pairs) after each chunk
+        on_results: Called with each chunk's battle_results rows, e.g. to persist them
+
+    Returns:
+        TournamentResult with standings for the roster
+    """
+    start = time.perf_counter()
+
+    if roster is None:
+        roster = load_roster(db_path, tier)
+    if pairs is None:
+        total = len(roster) * (len(roster) - 1) // 2
+        pair_iter = iter_pairs(roster)
+    else:
+        total = len(pairs)
+        pair_iter = iter(pairs)
+
+    result = TournamentResult(roster)
+    workers = workers or os.cpu_count() or 1
+    done = 0
+
+    def collect(chunk_len: int, rows: list[ResultRow]):
+        nonlocal done
+        result.add(rows)
+        if on_results is not None:
+            on_results(rows)
+        done += chunk_len
+        if progress is not None:
+            progress(done, total)
+
+    if workers == 1:
+        _init_worker(db_path)
+        for chunk in _chunks(pair_iter, chunk_size):
+            collect(len(chunk), _run_chunk(chunk, seed, replicates, max_turns))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_pool_context(),
+            initializer=_init_worker,
+            initargs=(db_path,),
+        ) as executor:
+            # Keep a bounded number of chunks in flight so huge rosters
+            # don't materialize every pair up front
+            in_flight = {}
+            chunks = _chunks(pair_iter, chunk_size)
+            for chunk in chunks:
+                future = executor.submit(_run_chunk, chunk, seed, replicates, max_turns)
+                in_flight[future] = len(chunk)
+                if len(in_flight) >= workers * 4:
+                    finished = next(as_completed(in_flight))
+                    collect(in_flight.pop(finished), finished.result())
+            for finished in as_completed(in_flight):
+                collect(in_flight[finished], finished.result())
+
+    result.pairs = total
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a round-robin tournament.")
+    parser.add_argument("--db", default="data_prep/pkmn_battle_station.db")
+    parser.add_argument("--tier", action="append", help="Restrict to a smogon_sets tier")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--replicates", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--save", action="store_true", help="Write every battle to battle_results"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-simulate pairs whose configuration changed (implies --save)",
+    )
+    parser.add_argument(
+        "--matrix",
+        metavar="DIR",
+        help="Also save win-rate, turn and HP matrices to DIR (see tournament.matrix)",
+    )
+    args = parser.parse_args()
+
+    def report(done: int, total: int):
+        print(f"\rProcessed {done}/{total} pairs...", end="", flush=True)
+
+    if args.incremental:
+        from tournament.incremental import run_incremental
+
+        result = run_incremental(
+            args.db,
+            tier=args.tier,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            replicates=args.replicates,
+            seed=args.seed,
+            progress=report,
+        )
+        print()
+        print(f"Re-simulated {result.pairs} pairs ({result.battles} battles)")
+        if args.matrix:
+            from tournament.matrix import MatrixBuilder
+
+            # Only the changed pairs ran, so aggregate everything stored
+            builder = MatrixBuilder.from_results(args.db, load_roster(args.db, args.tier))
+            builder.save(args.matrix)
+            print(f"Saved {builder} to {args.matrix}")
+        return
+
+    sinks = []
+    writer = None
+    if args.save:
+        from tournament.results_writer import ResultWriter
+
+        # A full tournament is a bulk load, so build the pair index once at the end
+        writer = ResultWriter(args.db, defer_index=True).start()
+        sinks.append(writer.write)
+
+    roster = load_roster(args.db, args.tier)
+    builder = None
+    if args.matrix:
+        from tournament.matrix import MatrixBuilder, roster_ids
+
+        builder = MatrixBuilder(roster, roster_ids(args.db, roster))
+        sinks.append(builder.add)
+
+    def on_results(rows: list[ResultRow]):
+        for sink in sinks:
+            sink(rows)
+
+    try:
+        result = run_tournament(
+            args.db,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            replicates=args.replicates,
+            seed=args.seed,
+            roster=roster,
+            progress=report,
+            on_results=on_results if sinks else None,
+        )
+    finally:
+        if writer is not None:
+            writer.close()
+    print()
+    if builder is not None:
+        builder.save(args.matrix)
+        print(f"Saved {builder} to {args.matrix}")
+    print(result)
+    for rank, (name, win_rate) in enumerate(result.ranking()[:10], 1):
+        wins, losses, draws = result.standings[name]
+        print(f"{rank:2d}. {name:<20} {win_rate:.3f}  ({wins}-{losses}-{draws})")
+
+
+if __name__ == "__main__":
+    main()